@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Guy Knights
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from ansible_collections.knightsg.dkron.plugins.modules import dkron_cluster_info
+from ansible_collections.knightsg.dkron.plugins.plugin_utils.controller import DkronActionBase
+
+
+class ActionModule(DkronActionBase):
+
+    MODULE = dkron_cluster_info
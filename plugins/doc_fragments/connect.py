@@ -11,8 +11,25 @@ class ModuleDocFragment(object):
     DOCUMENTATION = r'''options:
         endpoint:
             description:
-                - The IP or hostname of a node in the cluster
+                - The IP or hostname of a node in the cluster, or a list of cluster nodes.
+                - A node can be given as C(host:port) to use another port than I(port).
+                - With several nodes, a request to a node that refuses the connection or times out is sent to the next node,
+                  and the node is avoided for the rest of the module run. See I(endpoint_selection).
+                - Required unless the task runs over a persistent C(ansible.netcommon.httpapi) connection
+                  with C(ansible_network_os=knightsg.dkron.dkron), which then provides the cluster node, TLS and authentication.
+            type: list
+            elements: str
+        endpoint_selection:
+            description:
+                - How requests are spread over the nodes in I(endpoint).
+                - C(ordered) sends every request to the first node that responds, in the order given.
+                - C(latency) probes all nodes once, concurrently, and prefers the fastest healthy node.
+                - C(round_robin) probes all nodes once and rotates requests over the healthy nodes.
+                - Nodes that do not answer the probe within one second are treated as failed and tried last.
+                - Creates with I(run_on_create) and toggles are never repeated on another node, as they may have been applied already.
             type: str
+            choices: [ordered, latency, round_robin]
+            default: ordered
         port:
             description:
                 - The port used to connect to the cluster node.
@@ -30,4 +47,85 @@ class ModuleDocFragment(object):
             description:
                 - Use HTTPS to connect to the cluster node instead of HTTP.
             type: bool
+        keep_alive:
+            description:
+                - Reuse HTTP/1.1 keep-alive connections to the cluster for every request made during the module run.
+                - Without this, every API call opens a new TCP (and TLS) connection.
+                - The number of opened and reused connections is returned in C(connection_stats).
+                - Not needed over a persistent httpapi connection, which always reuses its connections.
+            type: bool
+            default: false
+        leader_writes:
+            description:
+                - Send job creates, updates, toggles and deletes straight to the cluster leader instead of the configured node,
+                  saving the hop a follower adds by forwarding them.
+                - The leader is looked up once per module run and reached on its address with the port and protocol used for the configured node.
+                - When a write to the leader fails with a connection or server error, the leader is looked up again and the write is retried
+                  on the new leader. Toggles and creates with I(run_on_create), which are not idempotent, are not retried.
+            type: bool
+            default: false
+        timings:
+            description:
+                - Return a C(timings) section in the result with the number of requests, errors, bytes sent and received,
+                  latency percentiles and the time spent per phase, in total, per API endpoint and per cluster node.
+                - The DNS, connect, time to first byte and transfer phases are only measured with I(keep_alive=true).
+                  Otherwise only the total latency and the decode phase (decompression and JSON parsing) are measured.
+            type: bool
+            default: false
+        request_retries:
+            description:
+                - Number of times a request is retried when the cluster answers with a server error or C(429),
+                  or no node accepts the connection, for example during a leader election.
+                - Client errors such as C(400) or C(404) are never retried. Toggles and creates with I(run_on_create) are not retried either.
+            type: int
+            default: 0
+        retry_backoff:
+            description:
+                - Base delay in seconds before a retry. It doubles with every retry, and the actual delay is picked at random
+                  up to that value so that concurrent requests do not retry in lockstep.
+                - A C(Retry-After) header sent by the cluster is used instead when present.
+            type: float
+            default: 0.5
+        retry_max_delay:
+            description:
+                - Maximum delay in seconds before a single retry.
+            type: float
+            default: 10
+        circuit_breaker_threshold:
+            description:
+                - Number of consecutive failed requests, retries included, that stop any further requests to the cluster
+                  for I(circuit_breaker_timeout) seconds. Requests made meanwhile fail immediately, so batch operations
+                  on an unhealthy cluster end quickly instead of waiting for every request to fail.
+                - C(0) disables the circuit breaker.
+            type: int
+            default: 0
+        circuit_breaker_timeout:
+            description:
+                - Seconds requests are refused once the circuit breaker opened. The next request then tests the cluster again.
+            type: float
+            default: 30
+        cache:
+            description:
+                - Cache GET responses on disk so repeated queries of the same cluster within I(cache_ttl) are not sent again.
+                - Expired entries are revalidated with C(If-None-Match)/C(If-Modified-Since) when the server returned an C(ETag) or C(Last-Modified) header.
+                - Creating, updating, toggling or deleting a job invalidates the cached responses for that job and for the job lists.
+                - The reads that decide whether a job is created, updated or deleted always go to the cluster.
+                - Responses are cached separately for each cluster and set of credentials.
+            type: bool
+            default: false
+        cache_dir:
+            description:
+                - Directory where cached responses are stored, on the host that runs the module.
+            type: path
+            default: ~/.ansible/tmp/dkron_cache
+        cache_ttl:
+            description:
+                - Number of seconds a cached response is used without asking the cluster.
+            type: int
+            default: 60
+        cache_max_entries:
+            description:
+                - Maximum number of cached responses per cluster endpoint. The least recently used entries are evicted first.
+            type: int
+            default: 1000
         '''
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Guy Knights
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''options:
+        metadata_selector:
+            description:
+                - Only return jobs whose metadata contains all of these key/value pairs.
+                - Sent to the cluster as C(metadata[key]=value) query parameters, so jobs that do not match are not transferred.
+            type: dict
+        tag_selector:
+            description:
+                - Only return jobs that have all of these tags.
+                - A value without a node count, for example C(server=true), also matches tags with one, such as C(true:1).
+                - The Dkron API cannot filter on tags, so this is applied to the jobs returned by the cluster.
+                  Combine with another selector to limit what crosses the wire.
+            type: dict
+        name_prefix:
+            description:
+                - Only return jobs whose name starts with this prefix.
+                - Sent to the cluster as the C(q) query parameter.
+            type: str
+        job_status:
+            description:
+                - Only return jobs with this status, as reported by the cluster, for example C(success) or C(failed).
+                - Sent to the cluster as the C(status) query parameter.
+            type: str
+'''
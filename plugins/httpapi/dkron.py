@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Guy Knights
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+author:
+- Guy Knights (contact@guyknights.com)
+name: dkron
+short_description: HttpApi plugin for the Dkron cluster API
+description:
+- Lets the knightsg.dkron modules talk to a Dkron cluster over a persistent C(ansible.netcommon.httpapi) connection.
+- The connection process keeps a pool of HTTP/1.1 keep-alive connections for the whole play, so TCP and TLS
+  connections (and the basic authentication header) are set up once instead of in every task.
+- The cluster node is taken from C(ansible_host), C(ansible_httpapi_port) and C(ansible_httpapi_use_ssl).
+  C(ansible_user) and C(ansible_httpapi_pass) are sent as basic authentication, for clusters behind a reverse proxy.
+'''
+
+EXAMPLES = r'''
+# inventory
+# [dkron]
+# dkron-server-1 ansible_host=192.168.1.1
+#
+# [dkron:vars]
+# ansible_connection=ansible.netcommon.httpapi
+# ansible_network_os=knightsg.dkron.dkron
+# ansible_httpapi_port=8080
+
+- hosts: dkron
+  gather_facts: false
+  tasks:
+    - name: Query all jobs over the persistent connection
+      knightsg.dkron.dkron_job_info:
+        include_history: false
+'''
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.connection import ConnectionError
+from ansible.module_utils.urls import basic_auth_header
+from ansible.plugins.httpapi import HttpApiBase
+from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronConnectionPool
+from ansible_collections.knightsg.dkron.plugins.module_utils.support import decompress_body
+
+
+class HttpApi(HttpApiBase):
+
+    def __init__(self, connection):
+        super(HttpApi, self).__init__(connection)
+        self._pool = None
+
+    def base_url(self):
+        use_ssl = self.connection.get_option('use_ssl')
+        port = self.connection.get_option('port') or (443 if use_ssl else 8080)
+
+        return "{proto}://{host}:{port}".format(
+            proto=('https' if use_ssl else 'http'),
+            host=self.connection.get_option('host'),
+            port=port
+        )
+
+    def send_request(self, data, method='GET', url=None, headers=None):
+        request_headers = dict(headers or {})
+        request_headers.pop('Authorization', None)
+
+        remote_user = self.connection.get_option('remote_user')
+        if remote_user:
+            request_headers['Authorization'] = basic_auth_header(remote_user, self.connection.get_option('password'))
+
+        try:
+            status, response_headers, body = self._get_pool().request(method, url, headers=request_headers, data=data)
+        except Exception as e:
+            raise ConnectionError("request to {url} failed ({err})".format(url=url, err=to_text(e)))
+
+        body = decompress_body(body, response_headers.get('content-encoding'))
+
+        # Responses go back to the module over JSON-RPC, so the body has to be text
+        return status, response_headers, to_text(body) if body is not None else None
+
+    def connection_stats(self):
+        if not self._pool:
+            return {}
+
+        return dict(self._pool.stats)
+
+    def logout(self):
+        if self._pool:
+            self._pool.close()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = DkronConnectionPool(
+                validate_certs=self.connection.get_option('validate_certs'),
+                use_proxy=self.connection.get_option('use_proxy'),
+                timeout=self.connection.get_option('persistent_command_timeout')
+            )
+
+        return self._pool
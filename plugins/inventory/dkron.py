@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Guy Knights
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+author:
+- Guy Knights (contact@guyknights.com)
+name: dkron
+short_description: Dkron cluster members inventory source
+description:
+- Builds an inventory of the members of a Dkron cluster from the C(/members) API.
+- Each member becomes a host named after its Serf node name, with C(ansible_host) set to its address.
+- Hosts are grouped by role (C(dkron_server) or C(dkron_agent)), by Serf status (for example C(dkron_status_alive))
+  and the current leader is put in C(dkron_leader). Use I(keyed_groups) to group hosts by their tags.
+- Uses a YAML configuration file that ends with C(dkron.yml) or C(dkron.yaml).
+- Enable the inventory cache to avoid querying the cluster on every run.
+options:
+  plugin:
+    description: Token that ensures this is a source file for the C(dkron) plugin.
+    type: str
+    required: true
+    choices: [knightsg.dkron.dkron]
+  endpoint:
+    description:
+    - Cluster node to query, or a list of cluster nodes tried in order when a node does not respond.
+    - A node can be given as C(host:port) to use another port than I(port).
+    type: list
+    elements: str
+    required: true
+  port:
+    description: Cluster API port.
+    type: int
+    default: 8080
+  use_ssl:
+    description: Query the cluster over HTTPS.
+    type: bool
+    default: false
+  validate_certs:
+    description: Validate the certificate of the cluster node when I(use_ssl=true).
+    type: bool
+    default: true
+  use_proxy:
+    description: Use proxy settings from the environment.
+    type: bool
+    default: true
+  username:
+    description: Username for basic authentication, for clusters behind a reverse proxy.
+    type: str
+  password:
+    description: Password for basic authentication.
+    type: str
+  prefix:
+    description: Prefix of the role, status and leader group names.
+    type: str
+    default: dkron
+extends_documentation_fragment:
+- constructed
+- inventory_cache
+'''
+
+EXAMPLES = r'''
+# dkron.yml
+plugin: knightsg.dkron.dkron
+endpoint: 192.168.1.1
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.ansible/tmp/dkron_inventory
+cache_timeout: 600
+keyed_groups:
+  # dkron_dc_dc1, dkron_region_global, ...
+  - key: dkron_tags.dc
+    prefix: dkron_dc
+  - key: dkron_tags.region
+    prefix: dkron_region
+'''
+
+from ansible.errors import AnsibleParserError
+from ansible.module_utils._text import to_text
+from ansible.plugins.inventory import BaseInventoryPlugin, Constructable, Cacheable
+from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronClusterInterface
+from ansible_collections.knightsg.dkron.plugins.module_utils.support import MEMBER_STATUS, dkron_argument_spec, dkron_required_together
+from ansible_collections.knightsg.dkron.plugins.plugin_utils.controller import DkronControllerModule, DkronModuleExit, HAS_ARG_SPEC_VALIDATOR
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+
+    NAME = 'knightsg.dkron.dkron'
+
+    def verify_file(self, path):
+        return super(InventoryModule, self).verify_file(path) and path.endswith(('dkron.yml', 'dkron.yaml'))
+
+    def parse(self, inventory, loader, path, cache=True):
+        super(InventoryModule, self).parse(inventory, loader, path)
+
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        attempt_to_read_cache = self.get_option('cache') and cache
+        cache_needs_update = self.get_option('cache') and not cache
+
+        if attempt_to_read_cache:
+            try:
+                members = self._cache[cache_key]
+            except KeyError:
+                cache_needs_update = True
+
+        if not attempt_to_read_cache or cache_needs_update:
+            members = self._query_members()
+
+        if cache_needs_update:
+            self._cache[cache_key] = members
+
+        self._populate(members)
+
+    def _query_members(self):
+        if not HAS_ARG_SPEC_VALIDATOR:
+            raise AnsibleParserError("the Dkron inventory requires ansible-core 2.11 or later")
+
+        args = dict(
+            endpoint=self.get_option('endpoint'),
+            port=self.get_option('port'),
+            use_ssl=self.get_option('use_ssl'),
+            validate_certs=self.get_option('validate_certs'),
+            use_proxy=self.get_option('use_proxy'),
+            username=self.get_option('username'),
+            password=self.get_option('password')
+        )
+
+        try:
+            module = DkronControllerModule(args, dkron_argument_spec(), required_together=dkron_required_together())
+            api = DkronClusterInterface(module)
+            members = api.member_details()
+            leader = api.leader_node()
+        except DkronModuleExit as e:
+            raise AnsibleParserError("unable to build Dkron inventory: {err}".format(err=to_text(e)))
+
+        for member in members:
+            member['leader'] = bool(leader) and member['Addr'] == leader
+
+        return members
+
+    def _populate(self, members):
+        prefix = self.get_option('prefix')
+        strict = self.get_option('strict')
+
+        for member in members:
+            host = member['Name']
+            tags = member.get('Tags') or {}
+            role = 'server' if tags.get('server') == 'true' else 'agent'
+            status = MEMBER_STATUS.get(member.get('Status'), 'unknown')
+
+            groups = [
+                "{prefix}_{role}".format(prefix=prefix, role=role),
+                "{prefix}_status_{status}".format(prefix=prefix, status=status)
+            ]
+            if member.get('leader'):
+                groups.append("{prefix}_leader".format(prefix=prefix))
+
+            self.inventory.add_host(host)
+            for group in groups:
+                self.inventory.add_group(group)
+                self.inventory.add_child(group, host)
+
+            hostvars = dict(
+                ansible_host=member['Addr'],
+                dkron_name=host,
+                dkron_addr=member['Addr'],
+                dkron_port=member.get('Port'),
+                dkron_tags=tags,
+                dkron_role=role,
+                dkron_status=status,
+                dkron_leader=member.get('leader', False)
+            )
+            for var, value in hostvars.items():
+                self.inventory.set_variable(host, var, value)
+
+            self._set_composite_vars(self.get_option('compose'), hostvars, host, strict=strict)
+            self._add_host_to_composed_groups(self.get_option('groups'), hostvars, host, strict=strict)
+            self._add_host_to_keyed_groups(self.get_option('keyed_groups'), hostvars, host, strict=strict)
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Guy Knights
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+author:
+- Guy Knights (contact@guyknights.com)
+name: dkron_job
+short_description: Look up the configuration and status of Dkron jobs
+description:
+- Returns the job returned by the cluster for each job name, including its status, last success and next run.
+- All names of a lookup are resolved together, with one C(/jobs) query for large batches or a few concurrent
+  per-job queries otherwise.
+- Jobs are memoized in the worker process, which only lasts for one task, as lookups are templated in a
+  worker forked for each task. Only with I(cache=true) are the job queries kept for the whole play, in a response
+  cache on disk shared by the tasks, so templates referencing the same jobs do not query the cluster again until
+  I(cache_ttl) expires. With the default I(cache=false), every task that uses the lookup queries the cluster.
+options:
+  _terms:
+    description: Job names.
+    required: true
+  endpoint:
+    description:
+    - Cluster node to query, or a list of cluster nodes tried in order when a node does not respond.
+    - A node can be given as C(host:port) to use another port than I(port).
+    type: list
+    elements: str
+    required: true
+    env:
+    - name: DKRON_ENDPOINT
+    vars:
+    - name: dkron_endpoint
+  port:
+    description: Cluster API port.
+    type: int
+    default: 8080
+    vars:
+    - name: dkron_port
+  use_ssl:
+    description: Query the cluster over HTTPS.
+    type: bool
+    default: false
+  validate_certs:
+    description: Validate the certificate of the cluster node when I(use_ssl=true).
+    type: bool
+    default: true
+  use_proxy:
+    description: Use proxy settings from the environment.
+    type: bool
+    default: true
+  username:
+    description: Username for basic authentication, for clusters behind a reverse proxy.
+    type: str
+  password:
+    description: Password for basic authentication.
+    type: str
+  max_workers:
+    description: Number of per-job queries sent to the cluster concurrently.
+    type: int
+    default: 4
+  cache:
+    description:
+    - Keep the job queries in an on-disk response cache shared by all tasks of the play.
+    - Enable it to reuse looked up jobs across tasks. Without it, jobs are only memoized within one task.
+    type: bool
+    default: false
+  cache_dir:
+    description: Response cache directory.
+    type: path
+    default: ~/.ansible/tmp/dkron_cache
+  cache_ttl:
+    description: Seconds a looked up job is reused before the cluster is queried again.
+    type: int
+    default: 60
+'''
+
+EXAMPLES = r'''
+- name: Template the schedules of the nightly jobs
+  ansible.builtin.template:
+    src: schedules.conf.j2
+    dest: /etc/myapp/schedules.conf
+  vars:
+    nightly_jobs: "{{ query('knightsg.dkron.dkron_job', 'backup', 'cleanup', 'report', endpoint='192.168.1.1') }}"
+
+- name: Check the status of one job
+  ansible.builtin.debug:
+    msg: "{{ lookup('knightsg.dkron.dkron_job', 'backup', endpoint='192.168.1.1').status }}"
+'''
+
+RETURN = r'''
+_list:
+  description: Job configuration and status, one per job name, as returned by the cluster.
+  type: list
+  elements: dict
+'''
+
+import threading
+import time
+
+from ansible.errors import AnsibleLookupError
+from ansible.module_utils._text import to_text
+from ansible.plugins.lookup import LookupBase
+from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronClusterInterface
+from ansible_collections.knightsg.dkron.plugins.module_utils.support import BULK_QUERY_THRESHOLD, dkron_argument_spec, dkron_required_together
+from ansible_collections.knightsg.dkron.plugins.plugin_utils.controller import DkronControllerModule, DkronModuleExit, HAS_ARG_SPEC_VALIDATOR
+
+
+# Jobs looked up by this process, keyed by cluster API root and job name,
+# stored with the time they were queried
+_job_memo = {}
+_job_memo_lock = threading.Lock()
+
+
+class LookupModule(LookupBase):
+
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+
+        if not HAS_ARG_SPEC_VALIDATOR:
+            raise AnsibleLookupError("the Dkron job lookup requires ansible-core 2.11 or later")
+
+        job_names = [to_text(term) for term in terms]
+
+        args = dict(
+            endpoint=self.get_option('endpoint'),
+            port=self.get_option('port'),
+            use_ssl=self.get_option('use_ssl'),
+            validate_certs=self.get_option('validate_certs'),
+            use_proxy=self.get_option('use_proxy'),
+            username=self.get_option('username'),
+            password=self.get_option('password'),
+            cache=self.get_option('cache'),
+            cache_dir=self.get_option('cache_dir'),
+            cache_ttl=self.get_option('cache_ttl')
+        )
+
+        try:
+            module = DkronControllerModule(args, dkron_argument_spec(), required_together=dkron_required_together())
+            api = DkronClusterInterface(module)
+            jobs = self._resolve_jobs(api, job_names)
+        except DkronModuleExit as e:
+            raise AnsibleLookupError("Dkron job lookup failed: {err}".format(err=to_text(e)))
+
+        return [jobs[job_name] for job_name in job_names]
+
+    def _resolve_jobs(self, api, job_names):
+        now = time.time()
+        expires = now - self.get_option('cache_ttl')
+        jobs = {}
+
+        with _job_memo_lock:
+            for job_name in job_names:
+                memo = _job_memo.get((api.uri_root, job_name))
+                if memo and memo[0] > expires:
+                    jobs[job_name] = memo[1]
+
+        missing = [job_name for job_name in dict.fromkeys(job_names) if job_name not in jobs]
+        if not missing:
+            return jobs
+
+        # Beyond a handful of names, one /jobs query returns them all, and memoizes
+        # the rest of the cluster's jobs for later lookups as well
+        if len(missing) > BULK_QUERY_THRESHOLD:
+            found = api.job_configs()
+            errors = ["{name}: job not found".format(name=job_name) for job_name in missing if job_name not in found]
+
+        else:
+            found = {}
+            errors = []
+            for job_name, job_data in zip(missing, api.gather_jobs(missing, max_workers=self.get_option('max_workers'), include_history=False)):
+                if job_data.get('failed'):
+                    errors.append("{name}: {msg}".format(name=job_name, msg=job_data['msg']))
+                else:
+                    found[job_name] = job_data['job_config']
+
+        with _job_memo_lock:
+            for job_name, job_config in found.items():
+                _job_memo[(api.uri_root, job_name)] = (now, job_config)
+
+        if errors:
+            raise AnsibleLookupError("Dkron job lookup failed: {errors}".format(errors='; '.join(sorted(errors))))
+
+        jobs.update((job_name, found[job_name]) for job_name in missing)
+
+        return jobs
@@ -1,15 +1,57 @@
 from __future__ import (absolute_import, division, print_function)
 
-from ansible.module_utils.urls import url_argument_spec, fetch_url
+from ansible.module_utils._text import to_text
+from ansible.module_utils.connection import Connection, ConnectionError
+from ansible.module_utils.urls import url_argument_spec, fetch_url, basic_auth_header
+from ansible_collections.knightsg.dkron.plugins.module_utils.support import (
+    concurrent_map,
+    decode_json_list,
+    decompress_body,
+    job_configs_differ,
+    job_filter_params,
+    job_matches_filters,
+    job_matches_metadata,
+    MEMBER_STATUS,
+    parse_timestamp,
+    percentile,
+    project_fields,
+    run_with_deadline
+)
 from operator import itemgetter
+from urllib.parse import quote, urlencode, urlsplit, urlunsplit, unquote
+from urllib.request import getproxies, proxy_bypass
+import hashlib
+import heapq
+import itertools
+import http.client
 import json
+import os
+import random
+import socket
+import ssl
+import tempfile
+import threading
+import time
 
 __metaclass__ = type
 
 
+DEFAULT_PAGE_SIZE = 100
+
+# History summaries keep no executions, so they can afford larger pages and fewer round trips
+SUMMARY_PAGE_SIZE = 1000
+
+# Seconds kept at the end of a cluster info deadline to assemble the health matrix
+HEALTH_MATRIX_MARGIN = 0.1
+
+# Seconds the first request waits for the nodes to answer the endpoint selection probe
+NODE_PROBE_TIMEOUT = 1.0
+
+
 class DkronRequestException(Exception):
 
     def __init__(self, error_code=None):
+        self.error_code = error_code
 
         if error_code:
             super().__init__("cluster API query failed with error {code}".format(code=error_code))
@@ -23,13 +65,581 @@ class DkronEmptyResponseException(Exception):
         super().__init__('cluster response is empty')
 
 
+class DkronJobConfigException(Exception):
+    pass
+
+
+class DkronCircuitOpenException(DkronRequestException):
+
+    def __init__(self, retry_in):
+        self.error_code = None
+        Exception.__init__(self, "cluster API requests suspended for {secs:.0f}s after repeated failures".format(secs=retry_in))
+
+
+class DkronCircuitBreaker(object):
+    """Stop sending requests to a cluster after repeated failures.
+
+    After threshold consecutive failed requests the circuit opens, and requests fail
+    at once for reset_timeout seconds. The next request is then let through: the
+    circuit closes if it succeeds and opens again if it fails.
+    """
+
+    def __init__(self, threshold=0, reset_timeout=30):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def before_request(self):
+        if not self.threshold:
+            return
+
+        with self.lock:
+            if self.opened_at is None:
+                return
+
+            retry_in = self.opened_at + self.reset_timeout - time.monotonic()
+            if retry_in > 0:
+                raise DkronCircuitOpenException(retry_in)
+
+            # Half open: one more failure opens the circuit again
+            self.opened_at = None
+            self.failures = self.threshold - 1
+
+    def record(self, success):
+        if not self.threshold:
+            return
+
+        with self.lock:
+            if success:
+                self.failures = 0
+                return
+
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+def _timed_create_connection(timing, address, *args):
+    # socket.create_connection() with the name resolution timed separately
+    started = time.monotonic()
+    addresses = socket.getaddrinfo(address[0], address[1], 0, socket.SOCK_STREAM)
+    timing['dns'] = time.monotonic() - started
+
+    error = OSError("no address found for {host}".format(host=address[0]))
+    for family, socktype, proto, canonname, sockaddr in addresses:
+        try:
+            return socket.create_connection(sockaddr[:2], *args)
+        except OSError as e:
+            error = e
+
+    raise error
+
+
+class DkronConnectionPool(object):
+    """Pool of HTTP/1.1 keep-alive connections, kept per endpoint for the whole module run."""
+
+    def __init__(self, validate_certs=True, client_cert=None, client_key=None, use_proxy=True, timeout=10):
+        self.validate_certs = validate_certs
+        self.client_cert = client_cert
+        self.client_key = client_key
+        self.use_proxy = use_proxy
+        self.timeout = timeout
+        self.stats = {
+            'requests': 0,
+            'opened': 0,
+            'reused': 0
+        }
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._ssl_context = None
+
+    def request(self, method, url, headers=None, data=None, timing=None):
+        """Send a request on a pooled connection and return its status, headers and raw body.
+
+        If a timing dict is given, it is filled with the seconds spent on DNS, connect
+        (TCP and TLS), time to first byte and transfer, and the bytes sent and received.
+        """
+        url_parts = urlsplit(url)
+        key = (url_parts.scheme, url_parts.hostname, url_parts.port)
+        path = url_parts.path or '/'
+
+        if url_parts.query:
+            path = "{path}?{query}".format(path=path, query=url_parts.query)
+
+        request_headers = dict(headers or {})
+        proxy = self._proxy_for(url_parts)
+
+        # Plain HTTP through a proxy has to use the absolute URL as request target
+        if proxy and url_parts.scheme == 'http':
+            path = url
+            if proxy.username:
+                request_headers['Proxy-Authorization'] = basic_auth_header(unquote(proxy.username), unquote(proxy.password or ''))
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        connection, reused = self._acquire(key, url_parts, proxy)
+
+        try:
+            response = self._send(connection, method, path, request_headers, data, timing)
+
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            connection.close()
+
+            # The server may close an idle keep-alive connection at any time, so a
+            # stale reused connection gets one retry on a freshly opened one
+            if not reused:
+                raise
+
+            connection, reused = self._acquire(key, url_parts, proxy, fresh=True)
+            try:
+                response = self._send(connection, method, path, request_headers, data, timing)
+            except Exception:
+                connection.close()
+                raise
+
+        except Exception:
+            connection.close()
+            raise
+
+        try:
+            started = time.monotonic()
+            body = response.read()
+        except Exception:
+            connection.close()
+            raise
+
+        if timing is not None:
+            timing['transfer'] = time.monotonic() - started
+            timing['bytes_sent'] = len(data or b'')
+            timing['bytes_received'] = len(body)
+
+        response_headers = dict((name.lower(), value) for name, value in response.getheaders())
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+
+        with self._lock:
+            self.stats['requests'] += 1
+            if reused:
+                self.stats['reused'] += 1
+
+        return response.status, response_headers, body
+
+    def close(self):
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle = {}
+
+    def _send(self, connection, method, path, headers, data, timing=None):
+        if timing is None:
+            connection.request(method, path, body=data, headers=headers)
+            return connection.getresponse()
+
+        timing.update(dns=0.0, connect=0.0)
+
+        # http.client would connect on the first request, but connecting here
+        # keeps connection setup out of the time to first byte
+        if connection.sock is None:
+            connection._create_connection = lambda address, *args: _timed_create_connection(timing, address, *args)
+            started = time.monotonic()
+            connection.connect()
+            timing['connect'] = time.monotonic() - started - timing['dns']
+
+        started = time.monotonic()
+        connection.request(method, path, body=data, headers=headers)
+        response = connection.getresponse()
+        timing['ttfb'] = time.monotonic() - started
+
+        return response
+
+    def _acquire(self, key, url_parts, proxy, fresh=False):
+        if not fresh:
+            with self._lock:
+                if self._idle.get(key):
+                    return self._idle[key].pop(), True
+
+        connection = self._open(url_parts, proxy)
+
+        with self._lock:
+            self.stats['opened'] += 1
+
+        return connection, False
+
+    def _release(self, key, connection):
+        with self._lock:
+            self._idle.setdefault(key, []).append(connection)
+
+    def _open(self, url_parts, proxy):
+        host = url_parts.hostname
+        port = url_parts.port
+
+        if url_parts.scheme == 'https':
+            if proxy:
+                connection = http.client.HTTPSConnection(proxy.hostname, proxy.port or 8080, timeout=self.timeout, context=self._get_ssl_context())
+                tunnel_headers = {}
+                if proxy.username:
+                    tunnel_headers['Proxy-Authorization'] = basic_auth_header(unquote(proxy.username), unquote(proxy.password or ''))
+                connection.set_tunnel(host, port, headers=tunnel_headers)
+            else:
+                connection = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._get_ssl_context())
+
+        elif proxy:
+            connection = http.client.HTTPConnection(proxy.hostname, proxy.port or 8080, timeout=self.timeout)
+
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+        return connection
+
+    def _proxy_for(self, url_parts):
+        if not self.use_proxy or proxy_bypass(url_parts.hostname):
+            return None
+
+        proxy_url = getproxies().get(url_parts.scheme)
+
+        if not proxy_url:
+            return None
+
+        if '://' not in proxy_url:
+            proxy_url = "http://{proxy}".format(proxy=proxy_url)
+
+        return urlsplit(proxy_url)
+
+    def _get_ssl_context(self):
+        if self._ssl_context is None:
+            context = ssl.create_default_context()
+
+            if not self.validate_certs:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+
+            if self.client_cert:
+                context.load_cert_chain(self.client_cert, keyfile=self.client_key)
+
+            self._ssl_context = context
+
+        return self._ssl_context
+
+
+class DkronResponseCache(object):
+    """On-disk cache of GET responses with TTL expiry and LRU eviction by entry count.
+
+    Entry file names start with the quoted API path, so entries are invalidated
+    by path without reading them.
+    """
+
+    # Longest quoted API path kept in entry file names, well inside the usual 255 byte limit
+    MAX_PATH_KEY = 160
+
+    def __init__(self, cache_dir, namespace, ttl=60, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir = os.path.join(cache_dir, hashlib.sha1(namespace.encode('utf-8')).hexdigest()[:16])
+
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, url, api_path):
+        entry_path = self._entry_path(url, api_path)
+
+        try:
+            with open(entry_path) as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+        # Entry mtime is the LRU access time
+        self._touch(entry_path)
+
+        return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def put(self, url, api_path, body, etag=None, last_modified=None):
+        if isinstance(body, bytes):
+            body = body.decode('utf-8')
+
+        self._write(self._entry_path(url, api_path), {
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time()
+        })
+        self._evict()
+
+    def refresh(self, url, api_path, entry):
+        entry['stored_at'] = time.time()
+        self._write(self._entry_path(url, api_path), entry)
+
+    def invalidate(self, api_paths, parent_paths=()):
+        """Drop the entries for api_paths (with any query string) and for every path below parent_paths."""
+        prefixes = tuple(parent_path.rstrip('/') + '/' for parent_path in parent_paths)
+
+        for entry_path in self._entry_paths():
+            path_key = os.path.basename(entry_path)[:-len('.json')].rpartition('.')[0]
+
+            if path_key.endswith('%'):
+                # Only the start of a long path is known, so the entry goes if it may match
+                cached_path = unquote(path_key[:-1])
+                if cached_path.startswith(prefixes) or any(path.startswith(cached_path) for path in itertools.chain(api_paths, prefixes)):
+                    self._remove(entry_path)
+                continue
+
+            cached_path = unquote(path_key)
+            if cached_path in api_paths or (prefixes and cached_path.startswith(prefixes)):
+                self._remove(entry_path)
+
+    def _evict(self):
+        entry_paths = self._entry_paths()
+
+        if len(entry_paths) <= self.max_entries:
+            return
+
+        entry_times = []
+        for entry_path in entry_paths:
+            try:
+                entry_times.append((os.path.getmtime(entry_path), entry_path))
+            except OSError:
+                pass
+
+        for mtime, entry_path in sorted(entry_times)[:len(entry_times) - self.max_entries]:
+            self._remove(entry_path)
+
+    def _entry_path(self, url, api_path):
+        path_key = quote(api_path, safe='')
+
+        # Long paths are cut, never inside a %XX escape, and marked with a trailing %
+        if len(path_key) > self.MAX_PATH_KEY:
+            path_key = path_key[:self.MAX_PATH_KEY]
+            if '%' in path_key[-2:]:
+                path_key = path_key[:path_key.rindex('%')]
+            path_key += '%'
+
+        return os.path.join(self.cache_dir, "{path}.{key}.json".format(path=path_key, key=hashlib.sha1(url.encode('utf-8')).hexdigest()))
+
+    def _entry_paths(self):
+        try:
+            return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith('.json')]
+        except OSError:
+            return []
+
+    def _write(self, entry_path, entry):
+        # Write and rename so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(entry, tmp_file)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            self._remove(tmp_path)
+
+    def _touch(self, entry_path):
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+
+    def _remove(self, entry_path):
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+
+class DkronRequestTimings(object):
+    """Request timings of a module run, summarized per API endpoint.
+
+    Endpoints are keyed by method and path, with job names replaced by {name}.
+    Safe to use from worker threads.
+    """
+
+    PHASES = ('dns', 'connect', 'ttfb', 'transfer', 'decode')
+
+    def __init__(self):
+        self.endpoints = {}
+        self.nodes = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def endpoint_key(method, api_path):
+        segments = api_path.split('?')[0].split('/')
+
+        if len(segments) > 2 and segments[1] == 'jobs' and segments[2]:
+            segments[2] = '{name}'
+
+        return "{method} {path}".format(method=method, path='/'.join(segments) or '/')
+
+    def record(self, method, query_url, status, elapsed, phases):
+        url_parts = urlsplit(query_url)
+        api_path = url_parts.path[3:] if url_parts.path.startswith('/v1') else url_parts.path
+        key = self.endpoint_key(method, api_path)
+
+        with self.lock:
+            stats = self._endpoint(key)
+            stats['latency'].append(elapsed)
+            stats['bytes_sent'] += phases.get('bytes_sent', 0)
+            stats['bytes_received'] += phases.get('bytes_received', 0)
+
+            if status == -1 or status >= 400:
+                stats['errors'] += 1
+
+            for phase in self.PHASES:
+                stats['phases'][phase] += phases.get(phase, 0.0)
+
+            self.nodes[url_parts.netloc] = self.nodes.get(url_parts.netloc, 0) + 1
+
+    def record_decode(self, method, api_path, elapsed):
+        with self.lock:
+            self._endpoint(self.endpoint_key(method, api_path))['phases']['decode'] += elapsed
+
+    def summary(self):
+        with self.lock:
+            endpoints = dict((key, self._summarize([stats])) for key, stats in self.endpoints.items())
+
+            return {
+                'total': self._summarize(list(self.endpoints.values())),
+                'endpoints': endpoints,
+                'nodes': dict(self.nodes)
+            }
+
+    def _endpoint(self, key):
+        if key not in self.endpoints:
+            self.endpoints[key] = {
+                'latency': [],
+                'errors': 0,
+                'bytes_sent': 0,
+                'bytes_received': 0,
+                'phases': dict.fromkeys(self.PHASES, 0.0)
+            }
+
+        return self.endpoints[key]
+
+    def _summarize(self, endpoint_stats):
+        latency = sorted(elapsed for stats in endpoint_stats for elapsed in stats['latency'])
+
+        def ms(seconds):
+            return round(seconds * 1000, 3) if seconds is not None else None
+
+        return {
+            'requests': len(latency),
+            'errors': sum(stats['errors'] for stats in endpoint_stats),
+            'bytes_sent': sum(stats['bytes_sent'] for stats in endpoint_stats),
+            'bytes_received': sum(stats['bytes_received'] for stats in endpoint_stats),
+            'latency_ms': {
+                'p50': ms(percentile(latency, 50)),
+                'p95': ms(percentile(latency, 95)),
+                'max': ms(latency[-1] if latency else None)
+            },
+            'phases_ms': dict((phase, ms(sum(stats['phases'][phase] for stats in endpoint_stats))) for phase in self.PHASES)
+        }
+
+
+class DkronExecutionStats(object):
+    """Aggregates of a job's executions, built in one pass without keeping the executions.
+
+    Only the durations are kept, as the percentiles need them sorted.
+    """
+
+    def __init__(self):
+        self.executions = 0
+        self.succeeded = 0
+        self.running = 0
+        self.retries = 0
+        self.durations = []
+        self.last_started_at = None
+
+    def add(self, execution):
+        self.executions += 1
+
+        started = parse_timestamp(execution.get('started_at'))
+        finished = parse_timestamp(execution.get('finished_at'))
+
+        success = execution.get('success')
+        if isinstance(success, str):
+            success = success.lower() == 'true'
+
+        if success:
+            self.succeeded += 1
+        elif finished is None:
+            self.running += 1
+
+        # Every retry of a failed run is an execution of its own, with a higher attempt number
+        if (execution.get('attempt') or 1) > 1:
+            self.retries += 1
+
+        if started is not None and finished is not None and finished >= started:
+            self.durations.append(finished - started)
+
+        if started is not None and (self.last_started_at is None or started > self.last_started_at[0]):
+            self.last_started_at = (started, execution['started_at'])
+
+    def summary(self):
+        durations = sorted(self.durations)
+        finished = self.executions - self.running
+
+        def ms(nanoseconds):
+            return round(nanoseconds / 1000000.0, 3) if nanoseconds is not None else None
+
+        return {
+            'executions': self.executions,
+            'succeeded': self.succeeded,
+            'failed': finished - self.succeeded,
+            'running': self.running,
+            'retries': self.retries,
+            'success_rate': round(self.succeeded / float(finished), 4) if finished else None,
+            'duration_ms': {
+                'p50': ms(percentile(durations, 50)),
+                'p95': ms(percentile(durations, 95)),
+                'max': ms(durations[-1] if durations else None)
+            },
+            'last_started_at': self.last_started_at[1] if self.last_started_at else None
+        }
+
+
 class DkronClusterInterface(object):
 
     def __init__(self, module):
         self.module = module
         self.headers = {
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip, deflate'
         }
+        self.pool = None
+        self.connection = None
+        self.leader_root = None
+        self.leader_lock = threading.Lock()
+        self.failed_nodes = set()
+        self.node_latency = None
+        self.node_counter = itertools.count()
+        self.node_lock = threading.Lock()
+        self.timings = DkronRequestTimings() if module.params['timings'] else None
+        self.fields = module.params.get('fields')
+        self.exclude_fields = module.params.get('exclude_fields')
+        self.circuit_breaker = DkronCircuitBreaker(
+            threshold=module.params['circuit_breaker_threshold'],
+            reset_timeout=module.params['circuit_breaker_timeout']
+        )
+
+        if module.params['keep_alive']:
+            # Modules run inside the controller by the action plugins bring a pool shared between tasks
+            self.pool = getattr(module, 'connection_pool', None)
+
+        if module.params['keep_alive'] and not self.pool:
+            self.pool = DkronConnectionPool(
+                validate_certs=module.params['validate_certs'],
+                client_cert=module.params['client_cert'],
+                client_key=module.params['client_key'],
+                use_proxy=module.params['use_proxy']
+            )
 
         if module.params['username']:
 
@@ -40,27 +650,150 @@ class DkronClusterInterface(object):
                 self.module.fail_json(failed=True, msg="Username without password is invalid")
 
         if module.params['endpoint']:
-            self.uri_root = "{proto}://{endpoint}:{port}/v1".format(
-                proto=('https' if self.module.params['use_ssl'] else 'http'),
-                endpoint=self.module.params['endpoint'],
-                port=self.module.params['port']
-            )
+            self.node_roots = [self._node_root(endpoint) for endpoint in module.params['endpoint']]
+            self.uri_root = self.node_roots[0]
+
+        elif getattr(module, '_socket_path', None):
+            # Persistent httpapi connection, which owns the sockets and authentication
+            try:
+                self.connection = Connection(module._socket_path)
+                self.uri_root = "{base}/v1".format(base=self.connection.base_url())
+                self.node_roots = [self.uri_root]
+            except ConnectionError as e:
+                self.module.fail_json(msg="unable to use persistent cluster connection ({err})".format(err=to_text(e)))
 
         else:
             self.module.fail_json(failed=True, msg="Cluster endpoint is required")
 
-    def cluster_status(self):
-        uri = "/"
-
-        try:
-            response = self.get(uri)
+        self.cache = None
 
-            if 'serf' in response:
-                status = response['serf']
+        if module.params['cache']:
+            try:
+                # Responses depend on who asks, so every identity gets its own cache
+                namespace = json.dumps([
+                    self.uri_root,
+                    module.params['username'] or module.params['url_username'],
+                    module.params['password'] or module.params['url_password'],
+                    module.params['client_cert']
+                ])
+                self.cache = DkronResponseCache(
+                    module.params['cache_dir'],
+                    namespace,
+                    ttl=module.params['cache_ttl'],
+                    max_entries=module.params['cache_max_entries']
+                )
+            except OSError as e:
+                self.module.fail_json(msg="unable to create response cache directory ({err})".format(err=str(e)))
+
+    def _node_root(self, endpoint):
+        host, sep, port = endpoint.rpartition(':')
+
+        # host:port, but not a bare IPv6 address
+        if not sep or not port.isdigit() or (':' in host and not host.endswith(']')):
+            host, port = endpoint, self.module.params['port']
+
+        return "{proto}://{host}:{port}/v1".format(
+            proto=('https' if self.module.params['use_ssl'] else 'http'),
+            host=host,
+            port=port
+        )
+
+    def probe_nodes(self):
+        """Time one status query against every cluster node, concurrently.
+
+        Nodes that do not respond within NODE_PROBE_TIMEOUT seconds, or respond with a
+        server error, are marked as failed, so one slow node does not hold up the
+        requests waiting for the probe. Returns the latency in seconds of each node
+        that responded, by API root.
+        """
+        def probe(root):
+            started = time.monotonic()
+            status, body, response_headers = self._request('GET', self._build_url("/", root=root))
+
+            return status, time.monotonic() - started
+
+        latency = {}
+        for root, (result, error) in zip(self.node_roots, concurrent_map(probe, self.node_roots, len(self.node_roots), timeout=NODE_PROBE_TIMEOUT)):
+            if error or not 0 < result[0] < 500:
+                self._mark_node(root, failed=True)
             else:
-                status = {}
+                latency[root] = result[1]
+
+        return latency
 
-            return status
+    def select_nodes(self):
+        """Return the API roots to try for a request, most preferred first, failed nodes last."""
+        if len(self.node_roots) == 1:
+            return self.node_roots
+
+        selection = self.module.params['endpoint_selection']
+
+        with self.node_lock:
+            if selection != 'ordered' and self.node_latency is None:
+                self.node_latency = self.probe_nodes()
+
+            healthy = [root for root in self.node_roots if root not in self.failed_nodes]
+            failed = [root for root in self.node_roots if root in self.failed_nodes]
+
+        if selection == 'latency':
+            healthy.sort(key=lambda root: self.node_latency.get(root, float('inf')))
+
+        elif selection == 'round_robin' and healthy:
+            offset = next(self.node_counter) % len(healthy)
+            healthy = healthy[offset:] + healthy[:offset]
+
+        return healthy + failed
+
+    def _mark_node(self, root, failed):
+        # Not locked, so probe_nodes() can mark nodes while select_nodes() holds node_lock
+        if failed:
+            self.failed_nodes.add(root)
+        else:
+            self.failed_nodes.discard(root)
+
+    def connection_stats(self):
+        if self.connection:
+            return self.connection.connection_stats()
+
+        if not self.pool:
+            return {}
+
+        return dict(self.pool.stats)
+
+    def cluster_info(self, sections, job_selectors=None, timeout=None):
+        """Query sections of the cluster info (status, leader, members, health, jobs) concurrently.
+
+        The queries share one deadline of timeout seconds. Returns the data of the sections
+        that completed in time and the names of those that did not. A failed query fails
+        the module, as it does when the sections are queried one by one.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        queries = {
+            'status': (self._query_cluster_status, "cluster status query"),
+            'leader': (self._query_leader_node, "cluster leader query"),
+            'members': (self._query_member_nodes, "cluster members query"),
+            'health': (lambda: self._query_member_health(deadline), "cluster members query"),
+            'jobs': (lambda: self._query_job_list(job_selectors), self._job_list_query(job_selectors))
+        }
+
+        outcomes = run_with_deadline(dict((section, queries[section][0]) for section in sections), timeout)
+
+        data = {}
+        for section in sections:
+            if section not in outcomes:
+                continue
+
+            response, error = outcomes[section]
+            if error:
+                self.module.fail_json(msg="{query} failed ({err})".format(query=queries[section][1], err=str(error)))
+
+            data[section] = response
+
+        return data, [section for section in sections if section not in outcomes]
+
+    def cluster_status(self):
+        try:
+            return self._query_cluster_status()
 
         except DkronRequestException as e:
             self.module.fail_json(msg="cluster status query failed ({err})".format(err=str(e)))
@@ -68,18 +801,20 @@ class DkronClusterInterface(object):
         except DkronEmptyResponseException as e:
             self.module.fail_json(msg="cluster status query failed ({err})".format(err=str(e)))
 
-    def leader_node(self):
-        uri = "/leader"
+    def _query_cluster_status(self):
+        uri = "/"
+        response = self.get(uri)
 
-        try:
-            response = self.get(uri)
+        if 'serf' in response:
+            status = response['serf']
+        else:
+            status = {}
 
-            if response:
-                leader = response['Addr']
-            else:
-                leader = ''
+        return project_fields(status, self.fields, self.exclude_fields)
 
-            return leader
+    def leader_node(self):
+        try:
+            return self._query_leader_node()
 
         except DkronRequestException as e:
             self.module.fail_json(msg="cluster leader query failed ({err})".format(err=str(e)))
@@ -87,34 +822,174 @@ class DkronClusterInterface(object):
         except DkronEmptyResponseException as e:
             self.module.fail_json(msg="cluster leader query failed ({err})".format(err=str(e)))
 
+    def _query_leader_node(self):
+        response = self._query_leader()
+
+        if response:
+            leader = response['Addr']
+        else:
+            leader = ''
+
+        return leader
+
+    def _query_leader(self):
+        uri = "/leader"
+
+        return self.get(uri)
+
+    def write_root(self, stale_root=None):
+        """Return the API root that job writes are sent to.
+
+        This is the preferred cluster node, or with leader_writes the leader, which is
+        looked up on first use. Passing the root a write just failed on looks the leader up
+        again, unless another thread already did.
+        """
+        if not self.module.params['leader_writes']:
+            return self.select_nodes()[0]
+
+        with self.leader_lock:
+            if self.leader_root is None or self.leader_root == stale_root:
+                self.leader_root = self._resolve_leader_root(refresh=stale_root is not None)
+
+            return self.leader_root
+
+    def _resolve_leader_root(self, refresh=False):
+        if refresh:
+            self.invalidate_cache(["/leader"])
+
+        try:
+            leader = self._query_leader()
+        except (DkronRequestException, DkronEmptyResponseException, ValueError):
+            # Without a known leader, writes still work through the configured nodes
+            return self.select_nodes()[0]
+
+        if not leader or not leader.get('Addr'):
+            return self.select_nodes()[0]
+
+        return self._member_root(leader['Addr'])
+
+    def _member_root(self, addr):
+        # API root of a cluster member, assumed to serve the API on the same scheme and port as the configured nodes
+        url_parts = urlsplit(self.uri_root)
+        host = addr if ':' not in addr else "[{addr}]".format(addr=addr)
+
+        if url_parts.port:
+            host = "{host}:{port}".format(host=host, port=url_parts.port)
+
+        return urlunsplit((url_parts.scheme, host, url_parts.path, '', ''))
+
     def member_nodes(self):
-        uri = "/members"
+        return [member['Addr'] for member in self.member_details()]
+
+    def _query_member_nodes(self):
+        return [member['Addr'] for member in self._query_member_details()]
+
+    def _query_member_health(self, deadline=None):
+        """Probe the API of every cluster member concurrently and return a health matrix.
+
+        Members are probed with their own short lived connections, limited to
+        probe_timeout seconds, and without retries or failover, so every member is
+        reported for itself. Probes still pending shortly before the deadline, a
+        time.monotonic() value, are abandoned and their members reported unreachable.
+        """
+        members = self._query_member_details()
+        pool = DkronConnectionPool(
+            validate_certs=self.module.params['validate_certs'],
+            client_cert=self.module.params['client_cert'],
+            client_key=self.module.params['client_key'],
+            use_proxy=self.module.params['use_proxy'],
+            timeout=self.module.params['probe_timeout']
+        )
+
+        def probe(member):
+            started = time.monotonic()
+            status, response_headers, body = pool.request('GET', self._build_url("/", root=self._member_root(member['Addr'])), headers=self.headers)
+
+            return status, time.monotonic() - started
 
         try:
-            response = self.get(uri)
-            node_list = [member['Addr'] for member in response]
+            timeout = None if deadline is None else max(0, deadline - HEALTH_MATRIX_MARGIN - time.monotonic())
+            probes = concurrent_map(probe, members, self.module.params['probe_workers'], timeout=timeout)
+        finally:
+            pool.close()
+
+        health = []
+        for member, (result, error) in zip(members, probes):
+            tags = member.get('Tags') or {}
+            entry = {
+                'name': member.get('Name'),
+                'addr': member.get('Addr'),
+                'role': 'server' if tags.get('server') == 'true' else 'agent',
+                'serf_status': MEMBER_STATUS.get(member.get('Status'), 'unknown'),
+                'version': tags.get('version'),
+                'tags': tags,
+                'reachable': bool(result) and 0 < result[0] < 500,
+                'http_status': result[0] if result else None,
+                'latency_ms': round(result[1] * 1000, 3) if result else None
+            }
+
+            if error:
+                entry['error'] = to_text(error) or type(error).__name__
+
+            health.append(entry)
+
+        health.sort(key=lambda entry: entry['name'] or '')
+
+        return {
+            'members': health,
+            'reachable': len([entry for entry in health if entry['reachable']]),
+            'unreachable': len([entry for entry in health if not entry['reachable']])
+        }
 
-            return node_list
+    def member_details(self):
+        try:
+            return self._query_member_details()
 
         except DkronRequestException as e:
             self.module.fail_json(msg="cluster members query failed ({err})".format(err=str(e)))
 
+    def _query_member_details(self):
+        uri = "/members"
+
+        try:
+            return self.get(uri)
+
         except DkronEmptyResponseException as e:
             return []
 
-    def job_list(self):
-        if not self.module.params['active_only']:
+    def job_list(self, job_selectors=None, use_cache=True):
+        try:
+            return self._query_job_list(job_selectors, use_cache=use_cache)
+
+        except DkronRequestException as e:
+            self.module.fail_json(msg="{query} failed ({err})".format(query=self._job_list_query(job_selectors), err=str(e)))
+
+    def _job_list_query(self, job_selectors=None):
+        if self.module.params.get('active_only') and not any((job_selectors or {}).values()):
+            return "cluster status query"
+
+        return "cluster job list query"
+
+    def _query_job_list(self, job_selectors=None, use_cache=True):
+        if any((job_selectors or {}).values()):
+            matching_jobs = list(self._query_job_configs(job_selectors, use_cache=use_cache))
+
+            if not self.module.params.get('active_only'):
+                return matching_jobs
+
+            # Executions do not carry the job's metadata, tags or status, so running jobs
+            # are matched against the selected jobs instead
+            return [job_name for job_name in self._query_job_list(use_cache=use_cache) if job_name in matching_jobs]
+
+        if not self.module.params.get('active_only'):
             uri = "/jobs"
 
             try:
-                response = self.get(uri)
+                response = self.get(uri, use_cache=use_cache)
                 job_list = [job['name'] for job in response]
 
                 return job_list
 
-            except DkronRequestException as e:
-                self.module.fail_json(msg="cluster job list query failed ({err})".format(err=str(e)))
-
             except DkronEmptyResponseException as e:
                 return []
 
@@ -122,30 +997,54 @@ class DkronClusterInterface(object):
             uri = "/busy"
 
             try:
-                response = self.get(uri)
+                response = self.get(uri, use_cache=use_cache)
                 job_list = [job['job_name'] for job in response]
 
                 return job_list
 
-            except DkronRequestException as e:
-                self.module.fail_json(msg="cluster status query failed ({err})".format(err=str(e)))
-
             except DkronEmptyResponseException as e:
                 return []
 
-    def get_job_config(self, job_name=None):
-        if job_name:
-            uri = "/jobs/{name}".format(name=job_name)
-        else:
-            return False
+    def job_configs(self, job_selectors=None, use_cache=True):
+        """Return the cluster's jobs by name, limited to those matching job_selectors if given.
 
+        job_selectors are the keyword arguments of job_matches_filters. The metadata, name
+        prefix and status selectors are sent as /jobs query parameters, so the cluster only
+        returns matching jobs. Every returned job is checked again, which applies the tag
+        selector and covers clusters that ignore some of the parameters.
+        Reads that decide on a write pass use_cache=False, so they see the cluster as it is.
+        """
         try:
-            response = self.get(uri)
+            return self._query_job_configs(job_selectors, use_cache=use_cache)
 
-            if not response:
-                return {}
+        except DkronRequestException as e:
+            self.module.fail_json(msg="cluster job list query failed ({err})".format(err=str(e)))
+
+    def _query_job_configs(self, job_selectors=None, use_cache=True):
+        uri = "/jobs"
+        job_selectors = dict((key, value) for key, value in (job_selectors or {}).items() if value)
 
-            return response
+        def select(job):
+            return self.project_job(job) if job_matches_filters(job, **job_selectors) else None
+
+        try:
+            # Each job is checked and projected as soon as it is decoded, so only the wanted jobs and fields are kept
+            if job_selectors or self.fields or self.exclude_fields:
+                response = self.get(uri, params=job_filter_params(**job_selectors), transform_item=select, use_cache=use_cache)
+            else:
+                response = self.get(uri, use_cache=use_cache)
+
+            return dict((job['name'], job) for job in response if job is not None)
+
+        except DkronEmptyResponseException as e:
+            return {}
+
+    def get_job_config(self, job_name=None):
+        if not job_name:
+            return False
+
+        try:
+            return self._query_job_config(job_name)
 
         except DkronRequestException as e:
             self.module.fail_json(msg="job config query failed ({err})".format(err=str(e)))
@@ -153,38 +1052,206 @@ class DkronClusterInterface(object):
         except DkronEmptyResponseException as e:
             self.module.fail_json(msg="job config query failed ({err})".format(err=str(e)))
 
-    def compare_job_configs(self):
-        # Use self.get_job_config to compare new config with one in cluster
-        pass
+    def _query_job_config(self, job_name, use_cache=True):
+        uri = "/jobs/{name}".format(name=job_name)
+        response = self.get(uri, use_cache=use_cache)
+
+        if not response:
+            return {}
+
+        return self.project_job(response)
+
+    def project_job(self, job):
+        """Restrict a job to the fields and exclude_fields module options, always keeping its name."""
+        return project_fields(job, self.fields, self.exclude_fields, keep=('name',))
+
+    def compare_job_configs(self, job_config=None, current_config=None):
+        """Compare a job config payload with the job as configured in the cluster.
+
+        Returns a tuple of whether the configs differ and the current config,
+        which is empty when the job does not exist yet. The current config is read
+        past the response cache, as a stale entry would skip a needed write.
+        """
+        if job_config is None:
+            try:
+                job_config = self.build_job_config()
+
+            except DkronJobConfigException as e:
+                self.module.fail_json(msg=str(e))
+
+        if current_config is None:
+            try:
+                current_config = self._query_job_config(job_config['name'], use_cache=False)
+
+            except DkronRequestException as e:
+                if e.error_code != 404:
+                    self.module.fail_json(msg="job config query failed ({err})".format(err=str(e)))
+
+                current_config = {}
+
+            except DkronEmptyResponseException as e:
+                current_config = {}
+
+        if not current_config:
+            return True, {}
+
+        return job_configs_differ(job_config, current_config), current_config
 
     def get_job_history(self, job_name=None):
-        if job_name:
-            uri = "/jobs/{name}/executions".format(name=job_name)
-        else:
+        if not job_name:
             return False
 
         try:
-            response = self.get(uri)
+            return self._query_job_history(job_name)
 
-            if not response:
-                return []
+        except DkronRequestException as e:
+            self.module.fail_json(msg="job execution history query failed ({err})".format(err=str(e)))
 
-            if self.module.params['limit_history'] != 0:
-                history = sorted(response, key=itemgetter('started_at'), reverse=True)[:self.module.params['limit_history']]
-            else:
-                history = sorted(response, key=itemgetter('started_at'), reverse=True)
+        except DkronEmptyResponseException as e:
+            self.module.fail_json(msg="job execution history query failed ({err})".format(err=str(e)))
+
+    def _query_job_history(self, job_name):
+        uri = "/jobs/{name}/executions".format(name=job_name)
+        limit = self.module.params['limit_history']
+
+        # The server sorts and cuts the history to the limit itself
+        params = {'_start': 0, '_end': limit, '_sort': 'started_at', '_order': 'DESC'} if limit > 0 else None
+        response = self.get(uri, params=params)
 
-            return history
+        if not response:
+            return []
+
+        if limit > 0:
+            # A server ignoring the range parameters sends all executions at once, in any order
+            history = heapq.nlargest(limit, response, key=itemgetter('started_at'))
+        else:
+            history = sorted(response, key=itemgetter('started_at'), reverse=True)
+
+        return history
+
+    def get_job_history_summary(self, job_name=None):
+        if not job_name:
+            return False
+
+        try:
+            return self._query_job_history_summary(job_name)
 
         except DkronRequestException as e:
             self.module.fail_json(msg="job execution history query failed ({err})".format(err=str(e)))
 
-        except DkronEmptyResponseException as e:
-            self.module.fail_json(msg="job execution history query failed ({err})".format(err=str(e)))
+    def _query_job_history_summary(self, job_name):
+        limit = self.module.params['limit_history']
+        page_size = min(limit, SUMMARY_PAGE_SIZE) if limit > 0 else SUMMARY_PAGE_SIZE
+        stats = DkronExecutionStats()
+
+        # Pages are folded into the aggregates as they arrive, newest executions first
+        for page in self.iter_executions(job_name, page_size=page_size):
+            if limit > 0 and len(page) > limit - stats.executions:
+                # A server ignoring the range parameters sends all executions at once, in any order
+                page = heapq.nlargest(limit - stats.executions, page, key=itemgetter('started_at'))
+
+            for execution in page:
+                stats.add(execution)
+
+            if limit > 0 and stats.executions >= limit:
+                break
+
+        return stats.summary()
+
+    def gather_jobs(self, job_names, max_workers=1, job_configs=None, include_history=True, history_summary=False):
+        # Config and history queries are independent, so they all share the worker pool.
+        # Configs already known from a bulk /jobs query are not fetched again.
+        query_history = self._query_job_history_summary if history_summary else self._query_job_history
+        history_key = 'history_summary' if history_summary else 'history'
+
+        queries = []
+        for job_name in job_names:
+            if job_configs is None:
+                queries.append((self._query_job_config, job_name))
+            if include_history:
+                queries.append((query_history, job_name))
+
+        results = iter(concurrent_map(lambda query: query[0](query[1]), queries, max_workers))
+
+        jobs = []
+        for job_name in job_names:
+            if job_configs is None:
+                job_config, error = next(results)
+            elif job_name in job_configs:
+                job_config, error = job_configs[job_name], None
+            else:
+                job_config, error = None, DkronRequestException(404)
 
-    def upsert_job(self):
+            job_data = {'job_config': job_config or {}}
 
-        uri = "/jobs"
+            if include_history:
+                history, history_error = next(results)
+                job_data[history_key] = history if history_summary else (history or [])
+                error = error or history_error
+
+            if error:
+                job_data['name'] = job_name
+                job_data['failed'] = True
+                job_data['msg'] = "job query failed ({err})".format(err=str(error))
+
+            jobs.append(job_data)
+
+        return jobs
+
+    def iter_jobs(self, page_size=DEFAULT_PAGE_SIZE, sort='name', order='ASC', params=None):
+        """Lazily yield the cluster's jobs one page (list) at a time.
+
+        Query errors are raised as DkronRequestException rather than failing the
+        module, so callers can stop early or handle them per page.
+        """
+        return self._iter_pages("/jobs", page_size, sort, order, params)
+
+    def iter_executions(self, job_name, page_size=DEFAULT_PAGE_SIZE, sort='started_at', order='DESC', params=None):
+        """Lazily yield the executions of a job one page (list) at a time, newest first by default."""
+        uri = "/jobs/{name}/executions".format(name=job_name)
+
+        return self._iter_pages(uri, page_size, sort, order, params)
+
+    def _iter_pages(self, api_path, page_size, sort, order, params):
+        start = 0
+        first_item = None
+
+        while True:
+            page_params = dict(params or {})
+            page_params.update({
+                '_start': start,
+                '_end': start + page_size,
+                '_sort': sort,
+                '_order': order
+            })
+
+            try:
+                page = self.get(api_path, params=page_params)
+            except DkronEmptyResponseException:
+                return
+
+            if not page:
+                return
+
+            # A server ignoring the range parameters sends the same items again,
+            # which is the only sign of it when it has exactly page_size of them
+            if start and page[0] == first_item:
+                return
+
+            first_item = page[0]
+
+            yield page
+
+            # A short page is the last one, and a page larger than requested means
+            # the server ignored the range parameters and already sent everything
+            if len(page) != page_size:
+                return
+
+            start += page_size
+
+    def build_job_config(self, job_params=None):
+        if job_params is None:
+            job_params = self.module.params
 
         simple_options = [
             'name',
@@ -205,50 +1272,56 @@ class DkronClusterInterface(object):
             'toggle',
             'state'
         ]
-        params = None
 
         job_config = {
-            'name': self.module.params['name']
+            'name': job_params['name']
         }
 
         # Add basic parameters directly to job config
-        for param in self.module.params:
-            if self.module.params[param] and param in simple_options:
-                job_config[param] = self.module.params[param]
+        for param in job_params:
+            if job_params[param] and param in simple_options:
+                job_config[param] = job_params[param]
 
         # Construct complex parameters and add to job config
-        if self.module.params['concurrency']:
+        if job_params['concurrency']:
             job_config['concurrency'] = 'allow'
         else:
             job_config['concurrency'] = 'forbid'
 
-        if self.module.params['file_processor'] or self.module.params['log_processor'] or self.module.params['syslog_processor']:
+        if job_params['file_processor'] or job_params['log_processor'] or job_params['syslog_processor']:
             job_config['processors'] = {}
 
-            if self.module.params['file_processor']:
-                job_config['processors']['files'] = self.module.params['file_processor']
+            if job_params['file_processor']:
+                job_config['processors']['files'] = job_params['file_processor']
 
-            if self.module.params['log_processor']:
-                job_config['processors']['log'] = self.module.params['log_processor']
+            if job_params['log_processor']:
+                job_config['processors']['log'] = job_params['log_processor']
 
-            if self.module.params['syslog_processor']:
-                job_config['processors']['syslog'] = self.module.params['syslog_processor']
+            if job_params['syslog_processor']:
+                job_config['processors']['syslog'] = job_params['syslog_processor']
 
-        if self.module.params['shell_executor']:
+        if job_params['shell_executor']:
             job_config['executor'] = 'shell'
-            job_config['executor_config'] = self.module.params['shell_executor']
-        elif self.module.params['http_executor']:
+            job_config['executor_config'] = job_params['shell_executor']
+        elif job_params['http_executor']:
             job_config['executor'] = 'http'
-            job_config['executor_config'] = self.module.params['http_executor']
+            job_config['executor_config'] = job_params['http_executor']
         else:
-            self.module.fail_json(msg="Module requires shell_executor or http_executor parameter specified.")
+            raise DkronJobConfigException("Module requires shell_executor or http_executor parameter specified.")
 
-        if self.module.params['run_on_create']:
-            params = {'run_on_create': 'true'}
+        return job_config
+
+    def upsert_job(self):
+
+        try:
+            job_config = self.build_job_config()
+
+        except DkronJobConfigException as e:
+            self.module.fail_json(msg=str(e))
 
         if not self.module.check_mode:
             try:
-                response = self.post(uri, success_response=201, params=params, data=job_config)
+                response = self._post_job(job_config, run_on_create=self.module.params['run_on_create'])
 
                 return response, True
 
@@ -261,15 +1334,27 @@ class DkronClusterInterface(object):
         else:
             return {}, True
 
+    def _post_job(self, job_config, run_on_create=False):
+        uri = "/jobs"
+        params = None
+
+        if run_on_create:
+            params = {'run_on_create': 'true'}
+
+        try:
+            # Repeating a create that runs the job could run it twice
+            return self.post(uri, success_response=201, params=params, data=job_config, idempotent=not run_on_create)
+
+        finally:
+            self.invalidate_job_cache(job_config['name'])
+
     def delete_job(self, job_name=None):
-        if job_name:
-            uri = "/jobs/{name}".format(name=job_name)
-        else:
+        if not job_name:
             self.module.fail_json(msg="unable to delete job, job name not provided")
 
         if not self.module.check_mode:
             try:
-                response = self.delete(uri)
+                response = self._delete_job(job_name)
 
                 return response, True
 
@@ -282,6 +1367,117 @@ class DkronClusterInterface(object):
         else:
             return {}, True
 
+    def _delete_job(self, job_name):
+        uri = "/jobs/{name}".format(name=job_name)
+
+        try:
+            return self.delete(uri)
+
+        finally:
+            self.invalidate_job_cache(job_name)
+
+    def plan_jobs(self, job_params_list, current_configs=None, exclusive=False, metadata_selector=None):
+        """Work out the action needed to bring each job definition in line with the cluster.
+
+        Current job configs are read with a single bulk query unless they are passed in.
+        In exclusive mode the definitions are the complete desired state, so every other
+        job in the cluster (or only those matching metadata_selector) is planned for deletion.
+        """
+        if current_configs is None:
+            current_configs = self.job_configs(use_cache=False)
+
+        plan = []
+        for job_params in job_params_list:
+            job_name = job_params['name']
+            current_config = current_configs.get(job_name, {})
+            entry = {
+                'name': job_name,
+                'action': 'none',
+                'job_config': None,
+                'current_config': current_config,
+                'run_on_create': job_params.get('run_on_create', False)
+            }
+
+            if job_params['state'] == 'absent':
+                if current_config:
+                    entry['action'] = 'delete'
+
+            else:
+                try:
+                    entry['job_config'] = self.build_job_config(job_params)
+                except DkronJobConfigException as e:
+                    entry['action'] = 'error'
+                    entry['msg'] = str(e)
+                    plan.append(entry)
+                    continue
+
+                if not current_config:
+                    entry['action'] = 'create'
+                elif job_params['overwrite'] and self.compare_job_configs(entry['job_config'], current_config)[0]:
+                    entry['action'] = 'update'
+
+            plan.append(entry)
+
+        if exclusive:
+            desired_names = set(job_params['name'] for job_params in job_params_list)
+
+            for job_name, current_config in current_configs.items():
+                if job_name in desired_names or not job_matches_metadata(current_config, metadata_selector):
+                    continue
+
+                plan.append({
+                    'name': job_name,
+                    'action': 'delete',
+                    'job_config': None,
+                    'current_config': current_config,
+                    'run_on_create': False
+                })
+
+        return plan
+
+    def apply_job_plan(self, plan, max_workers=1):
+        """Apply the creates, updates and deletes of a job plan and return a result per job."""
+        def apply(entry):
+            if entry['action'] in ('create', 'update'):
+                return self._post_job(entry['job_config'], run_on_create=entry['run_on_create'])
+            return self._delete_job(entry['name']) or {}
+
+        pending = [entry for entry in plan if entry['action'] in ('create', 'update', 'delete')]
+
+        if self.module.check_mode:
+            outcomes = dict((entry['name'], ({}, None)) for entry in pending)
+        else:
+            outcomes = dict(zip([entry['name'] for entry in pending], concurrent_map(apply, pending, max_workers)))
+
+        results = []
+        for entry in plan:
+            result = {
+                'name': entry['name'],
+                'action': entry['action'],
+                'changed': entry['name'] in outcomes
+            }
+
+            if entry['action'] == 'error':
+                result['failed'] = True
+                result['msg'] = entry['msg']
+                result['changed'] = False
+
+            elif entry['name'] in outcomes:
+                response, error = outcomes[entry['name']]
+                result['job_config'] = response or {}
+
+                if error:
+                    result['changed'] = False
+                    result['failed'] = True
+                    result['msg'] = "job {action} failed ({err})".format(action=entry['action'], err=str(error))
+
+            else:
+                result['job_config'] = entry['current_config']
+
+            results.append(result)
+
+        return results
+
     def toggle_job(self, job_name=None):
         if job_name:
             uri = "/jobs/{name}/toggle".format(name=job_name)
@@ -290,7 +1486,7 @@ class DkronClusterInterface(object):
 
         if not self.module.check_mode:
             try:
-                response = self.post(uri)
+                response = self.post(uri, idempotent=False)
 
                 return {'disabled': response['disabled']}, True
 
@@ -300,50 +1496,48 @@ class DkronClusterInterface(object):
             except Exception as e:
                 self.module.fail_json(msg="unknown error ({err})".format(err=str(e)))
 
+            finally:
+                self.invalidate_job_cache(job_name)
+
         else:
             return {}, True
 
-    def get(self, api_path, success_response=200, params=None):
-        query_url = "{endpoint}{path}".format(endpoint=self.uri_root, path=api_path)
+    def invalidate_job_cache(self, job_name):
+        job_path = "/jobs/{name}".format(name=job_name)
+        self.invalidate_cache(["/jobs", "/busy", job_path], parent_paths=[job_path])
 
-        if params:
-            for param in params:
-                if '?' not in query_url:
-                    query_url = "{url}?{param_name}={param_value}".format(url=query_url, param_name=param['name'], param_value=param['value'])
-                else:
-                    query_url = "{url}&{param_name}={param_value}".format(url=query_url, param_name=param['name'], param_value=param['value'])
+    def invalidate_cache(self, api_paths, parent_paths=()):
+        if self.cache:
+            self.cache.invalidate(api_paths, parent_paths=parent_paths)
+
+    def get(self, api_path, success_response=200, params=None, transform_item=None, use_cache=True):
+        query_url = self._build_url(api_path, params)
 
-        response, info = fetch_url(self.module, query_url, headers=dict(self.headers), method='GET')
+        if self.cache and use_cache:
+            status, body = self._cached_get(api_path, query_url, params)
+        else:
+            status, body, response_headers = self._send_with_retry(lambda: self._node_request('GET', api_path, params))
 
-        if info['status'] != success_response:
-            raise DkronRequestException(info['status'])
+        if status != success_response:
+            raise DkronRequestException(status)
 
-        json_response = json.loads(response.read())
+        json_response = self._decode_json('GET', api_path, body, transform_item)
 
         if json_response == "":
             raise DkronEmptyResponseException
 
         return json_response
 
-    def post(self, api_path, success_response=200, params=None, data=None):
-        query_url = "{endpoint}{path}".format(endpoint=self.uri_root, path=api_path)
-
-        if params:
-            for param in params:
-                if '?' not in query_url:
-                    query_url = "{url}?{param_name}={param_value}".format(url=query_url, param_name=param['name'], param_value=param['value'])
-                else:
-                    query_url = "{url}&{param_name}={param_value}".format(url=query_url, param_name=param['name'], param_value=param['value'])
-
+    def post(self, api_path, success_response=200, params=None, data=None, idempotent=True):
         if data:
-            response, info = fetch_url(self.module, query_url, headers=dict(self.headers), method='POST', data=json.dumps(data))
+            status, body, response_headers = self._write_request('POST', api_path, params, data=json.dumps(data), idempotent=idempotent)
         else:
-            response, info = fetch_url(self.module, query_url, headers=dict(self.headers), method='POST')
+            status, body, response_headers = self._write_request('POST', api_path, params, idempotent=idempotent)
 
-        if info['status'] != success_response:
-            raise DkronRequestException(info['status'])
+        if status != success_response:
+            raise DkronRequestException(status)
 
-        json_response = json.loads(response.read())
+        json_response = self._decode_json('POST', api_path, body)
 
         if json_response == "":
             raise DkronEmptyResponseException
@@ -351,17 +1545,207 @@ class DkronClusterInterface(object):
         return json_response
 
     def delete(self, api_path, success_response=200, params=None, data=None):
-        query_url = "{endpoint}{path}".format(endpoint=self.uri_root, path=api_path)
-        response, info = fetch_url(self.module, query_url, headers=dict(self.headers), method='DELETE')
+        status, body, response_headers = self._write_request('DELETE', api_path)
 
-        if info['status'] == 404:
+        if status == 404:
             return {}
 
-        if info['status'] != success_response:
-            raise DkronRequestException(info['status'])
+        if status != success_response:
+            raise DkronRequestException(status)
 
-        if response:
-            json_response = json.loads(response.read())
+        if body:
+            json_response = self._decode_json('DELETE', api_path, body)
             return json_response
         else:
             return None
+
+    def _decode_json(self, method, api_path, body, transform_item=None):
+        if not self.timings:
+            return decode_json_list(body, transform_item) if transform_item and body else json.loads(body)
+
+        started = time.monotonic()
+        try:
+            return decode_json_list(body, transform_item) if transform_item and body else json.loads(body)
+        finally:
+            self.timings.record_decode(method, api_path, time.monotonic() - started)
+
+    def _build_url(self, api_path, params=None, root=None):
+        query_url = "{endpoint}{path}".format(endpoint=(root or self.uri_root), path=api_path)
+
+        if params:
+            if isinstance(params, dict):
+                params = list(params.items())
+            else:
+                params = [(param['name'], param['value']) for param in params]
+
+            query_url = "{url}?{query}".format(url=query_url, query=urlencode(params))
+
+        return query_url
+
+    def _write_request(self, method, api_path, params=None, data=None, idempotent=True):
+        return self._send_with_retry(lambda: self._send_write(method, api_path, params, data, idempotent), idempotent=idempotent)
+
+    def _send_write(self, method, api_path, params=None, data=None, idempotent=True):
+        if not self.module.params['leader_writes']:
+            nodes = self.select_nodes()
+
+            # Writes that may already have been applied are not repeated on another node
+            return self._node_request(method, api_path, params, data=data, nodes=(nodes if idempotent else nodes[:1]))
+
+        root = self.write_root()
+        status, body, response_headers = self._request(method, self._build_url(api_path, params, root=root), data=data)
+
+        # A write the leader could not take may mean leadership moved, so look it up again
+        # and retry once if it did. Writes that must not be repeated are left to the caller.
+        if self.module.params['leader_writes'] and idempotent and (status == -1 or status >= 500):
+            new_root = self.write_root(stale_root=root)
+
+            if new_root != root:
+                status, body, response_headers = self._request(method, self._build_url(api_path, params, root=new_root), data=data)
+
+        return status, body, response_headers
+
+    def _send_with_retry(self, send, idempotent=True):
+        """Call send() and retry it while the cluster answers with an error worth retrying.
+
+        Only idempotent requests are retried, on connection errors (-1), 429 and 5xx,
+        with exponential backoff and full jitter. Any other status is returned at once.
+        """
+        retries = self.module.params['request_retries'] if idempotent else 0
+
+        for attempt in range(retries + 1):
+            self.circuit_breaker.before_request()
+
+            status, body, response_headers = send()
+            retryable = status == -1 or status == 429 or status >= 500
+            self.circuit_breaker.record(not retryable)
+
+            if not retryable or attempt == retries:
+                break
+
+            time.sleep(self._retry_delay(attempt, response_headers))
+
+        return status, body, response_headers
+
+    def _retry_delay(self, attempt, response_headers):
+        max_delay = self.module.params['retry_max_delay']
+
+        try:
+            return min(max_delay, float(response_headers.get('retry-after')))
+        except (AttributeError, TypeError, ValueError):
+            return random.uniform(0, min(max_delay, self.module.params['retry_backoff'] * 2 ** attempt))
+
+    def _node_request(self, method, api_path, params=None, data=None, headers=None, nodes=None):
+        """Send a request to the first of the cluster nodes that responds.
+
+        Nodes refusing the connection or timing out (status -1) are marked as failed,
+        so later requests try them last.
+        """
+        for root in (nodes or self.select_nodes()):
+            status, body, response_headers = self._request(method, self._build_url(api_path, params, root=root), data=data, headers=headers)
+            self._mark_node(root, failed=(status == -1))
+
+            if status != -1:
+                break
+
+        return status, body, response_headers
+
+    def _cached_get(self, api_path, query_url, params=None):
+        entry = self.cache.get(query_url, api_path)
+        headers = {}
+
+        if entry:
+            if self.cache.is_fresh(entry):
+                return 200, entry['body']
+
+            # Expired entries are revalidated instead of refetched when the server supports it
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        # Entries are stored under the URL on the first node, whichever node answers
+        status, body, response_headers = self._send_with_retry(lambda: self._node_request('GET', api_path, params, headers=headers))
+
+        if status == 304 and entry:
+            self.cache.refresh(query_url, api_path, entry)
+            return 200, entry['body']
+
+        if status == 200:
+            self.cache.put(
+                query_url,
+                api_path,
+                body,
+                etag=response_headers.get('etag'),
+                last_modified=response_headers.get('last-modified')
+            )
+
+        return status, body
+
+    def _request(self, method, query_url, data=None, headers=None):
+        if not self.timings:
+            return self._send_request(method, query_url, data, headers)
+
+        timing = {}
+        started = time.monotonic()
+        status, body, response_headers = self._send_request(method, query_url, data, headers, timing)
+        elapsed = time.monotonic() - started
+
+        # Only the connection pool can time the phases and count the bytes on the wire
+        timing.setdefault('bytes_sent', len(data or ''))
+        timing.setdefault('bytes_received', len(body or ''))
+
+        self.timings.record(method, query_url, status, elapsed, timing)
+
+        return status, body, response_headers
+
+    def _send_request(self, method, query_url, data=None, headers=None, timing=None):
+        request_headers = dict(self.headers)
+
+        if headers:
+            request_headers.update(headers)
+
+        if self.connection:
+            # Authentication is added by the httpapi plugin, and header values must be JSON serializable
+            request_headers.pop('Authorization', None)
+
+            try:
+                status, response_headers, body = self.connection.send_request(data, method=method, url=query_url, headers=request_headers)
+            except ConnectionError:
+                return -1, None, {}
+
+            return status, body, response_headers
+
+        if self.pool:
+            if 'Authorization' not in request_headers and self.module.params['url_username']:
+                request_headers['Authorization'] = basic_auth_header(self.module.params['url_username'], self.module.params['url_password'])
+
+            try:
+                status, response_headers, body = self.pool.request(method, query_url, headers=request_headers, data=data, timing=timing)
+            except (OSError, http.client.HTTPException):
+                # Same convention as fetch_url, which reports connection failures as status -1
+                return -1, None, {}
+
+            started = time.monotonic()
+            body = decompress_body(body, response_headers.get('content-encoding'))
+
+            if timing is not None:
+                timing['decode'] = time.monotonic() - started
+
+            return status, body, response_headers
+
+        if data:
+            response, info = fetch_url(self.module, query_url, headers=request_headers, method=method, data=data)
+        else:
+            response, info = fetch_url(self.module, query_url, headers=request_headers, method=method)
+
+        if response:
+            try:
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                # The connection dropped mid-body, a connection failure like any other
+                return -1, None, {}
+        else:
+            body = info.get('body')
+
+        return info['status'], decompress_body(body, info.get('content-encoding')), info
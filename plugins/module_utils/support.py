@@ -1,11 +1,31 @@
 from __future__ import (absolute_import, division, print_function)
 
 from ansible.module_utils.urls import url_argument_spec, fetch_url
+import calendar
 import json
+import math
+import re
+import threading
+import time
+import zlib
 
 __metaclass__ = type
 
 
+# Serf member status codes
+MEMBER_STATUS = {
+    0: 'none',
+    1: 'alive',
+    2: 'leaving',
+    3: 'left',
+    4: 'failed'
+}
+
+JSON_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+
+TIMESTAMP_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})[Tt ](\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?([Zz]|[+-]\d{2}:\d{2})$')
+
+
 def dkron_argument_spec():
     argument_spec = url_argument_spec()
 
@@ -15,15 +35,438 @@ def dkron_argument_spec():
 
     # These params are common to all modules
     argument_spec.update(
-        endpoint=dict(type='str', required=True),
+        endpoint=dict(type='list', elements='str', required=False),
+        endpoint_selection=dict(type='str', required=False, default='ordered', choices=['ordered', 'latency', 'round_robin']),
         port=dict(type='int', required=False, default=8080),
         username=dict(type='str', required=False),
         password=dict(type='str', required=False, no_log=True),
-        use_ssl=dict(type='bool', required=False, default=False)
+        use_ssl=dict(type='bool', required=False, default=False),
+        keep_alive=dict(type='bool', required=False, default=False),
+        leader_writes=dict(type='bool', required=False, default=False),
+        timings=dict(type='bool', required=False, default=False),
+        request_retries=dict(type='int', required=False, default=0),
+        retry_backoff=dict(type='float', required=False, default=0.5),
+        retry_max_delay=dict(type='float', required=False, default=10),
+        circuit_breaker_threshold=dict(type='int', required=False, default=0),
+        circuit_breaker_timeout=dict(type='float', required=False, default=30),
+        cache=dict(type='bool', required=False, default=False),
+        cache_dir=dict(type='path', required=False, default='~/.ansible/tmp/dkron_cache'),
+        cache_ttl=dict(type='int', required=False, default=60),
+        cache_max_entries=dict(type='int', required=False, default=1000)
     )
 
     return argument_spec
 
 
+def dkron_job_selector_argument_spec():
+    # Options selecting jobs in the cluster, shared by dkron_job_info and dkron_cluster_info
+    return dict(
+        metadata_selector=dict(type='dict', required=False),
+        tag_selector=dict(type='dict', required=False),
+        name_prefix=dict(type='str', required=False),
+        job_status=dict(type='str', required=False)
+    )
+
+
+def job_selectors(params):
+    """Job selectors of a module, as keyword arguments of job_matches_filters."""
+    return dict(
+        metadata_selector=params['metadata_selector'],
+        tag_selector=params['tag_selector'],
+        name_prefix=params['name_prefix'],
+        status=params['job_status']
+    )
+
+
+def dkron_job_argument_spec():
+    # Options describing a single job, shared by dkron_job and the job list of dkron_jobs
+    return dict(
+        name=dict(type='str', required=True),
+        displayname=dict(type='str', required=False),
+        schedule=dict(type='str', required=False, default='@every 1m'),
+        timezone=dict(type='str', required=False, default='UTC'),
+        owner=dict(type='str', required=False),
+        owner_email=dict(type='str', required=False),
+        disabled=dict(type='bool', required=False, default=False),
+        tags=dict(type='dict', required=False),
+        metadata=dict(type='dict', required=False),
+        retries=dict(type='int', required=False, default=0),
+        parent_job=dict(type='str', required=False),
+        run_on_create=dict(type='bool', required=False, default=False),
+        file_processor=dict(type='dict', required=False),
+        log_processor=dict(type='dict', required=False),
+        syslog_processor=dict(type='dict', required=False),
+        concurrency=dict(type='bool', required=False, default=True),
+        shell_executor=dict(type='dict', required=False),
+        http_executor=dict(type='dict', required=False),
+        overwrite=dict(type='bool', required=False, default=True),
+        state=dict(type='str', required=False, default='present', choices=['present', 'absent'])
+    )
+
+
+# Above this many requested job names, one bulk /jobs query is cheaper than a GET per job
+BULK_QUERY_THRESHOLD = 5
+
+
+# Job fields set from module parameters. Everything else in a job returned by the
+# cluster (next, success_count, last_success, ...) is managed by the server.
+JOB_CONFIG_FIELDS = [
+    'name',
+    'displayname',
+    'schedule',
+    'timezone',
+    'owner',
+    'owner_email',
+    'disabled',
+    'tags',
+    'metadata',
+    'retries',
+    'parent_job',
+    'concurrency',
+    'processors',
+    'executor',
+    'executor_config'
+]
+
+
 def dkron_required_together():
     return [['username', 'password']]
+
+
+def concurrent_map(func, items, max_workers=1, timeout=None):
+    """Apply func to every item using up to max_workers threads.
+
+    Returns a list of (result, error) tuples in the same order as items, so
+    one failing item does not prevent the others from being collected.
+    With a timeout, the items without a result after timeout seconds are
+    abandoned and get a TimeoutError.
+
+    The worker threads are daemons, unlike those of a ThreadPoolExecutor, which
+    are joined at interpreter exit. Work abandoned by run_with_deadline() thus
+    cannot hold up the end of the module run.
+    """
+    def run(item):
+        try:
+            return func(item), None
+        except Exception as e:
+            return None, e
+
+    if timeout is None and (max_workers <= 1 or len(items) <= 1):
+        return [run(item) for item in items]
+
+    results = [None] * len(items)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    indexes = iter(range(len(items)))
+    lock = threading.Lock()
+
+    def work():
+        while True:
+            with lock:
+                index = next(indexes, None)
+
+            if index is None or (deadline is not None and time.monotonic() >= deadline):
+                return
+
+            results[index] = run(items[index])
+
+    threads = [threading.Thread(target=work) for i in range(max(1, min(max_workers, len(items))))]
+
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    for thread in threads:
+        thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+
+    # Copied, as abandoned workers may still fill in results
+    results = list(results)
+    error = "no result within {secs}s".format(secs=timeout)
+
+    return [result if result is not None else (None, TimeoutError(error)) for result in results]
+
+
+def run_with_deadline(funcs, timeout=None):
+    """Call every function of the funcs dict concurrently, each in its own daemon thread.
+
+    Waits until all have returned or timeout seconds have passed, and returns a dict of
+    (result, error) tuples, like concurrent_map, for the functions that returned in time.
+    Functions still running at the deadline are left out. Their threads are daemons, as
+    are the workers of concurrent_map() they may use, so they do not keep the module
+    from exiting.
+    """
+    outcomes = {}
+    lock = threading.Lock()
+    deadline = time.monotonic() + timeout if timeout else None
+
+    def run(name, func):
+        try:
+            outcome = func(), None
+        except Exception as e:
+            outcome = None, e
+
+        with lock:
+            outcomes[name] = outcome
+
+    threads = [threading.Thread(target=run, args=item) for item in funcs.items()]
+
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    for thread in threads:
+        thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+
+    with lock:
+        return dict(outcomes)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list, or None if it is empty."""
+    if not sorted_values:
+        return None
+
+    rank = max(1, int(math.ceil(pct / 100.0 * len(sorted_values))))
+
+    return sorted_values[rank - 1]
+
+
+def decode_json_list(body, transform):
+    """Decode a JSON array one element at a time, passing each element through transform.
+
+    Every element is transformed before the next one is decoded, so data transform drops
+    is freed right away instead of the whole decoded array being held at once. Anything
+    other than an array is decoded as usual and returned untransformed.
+    """
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+
+    position = JSON_WHITESPACE_RE.match(body, 0).end()
+
+    if body[position:position + 1] != '[':
+        return json.loads(body)
+
+    decoder = json.JSONDecoder()
+    items = []
+    position = JSON_WHITESPACE_RE.match(body, position + 1).end()
+
+    if body[position:position + 1] == ']':
+        return items
+
+    while True:
+        item, position = decoder.raw_decode(body, position)
+        items.append(transform(item))
+
+        position = JSON_WHITESPACE_RE.match(body, position).end()
+        delimiter = body[position:position + 1]
+        position = JSON_WHITESPACE_RE.match(body, position + 1).end()
+
+        if delimiter == ']':
+            return items
+
+        if delimiter != ',':
+            raise ValueError("malformed JSON array at position {position}".format(position=position))
+
+
+def parse_timestamp(value):
+    """Parse an RFC 3339 timestamp, as returned by Dkron, into nanoseconds since the epoch.
+
+    datetime only keeps microseconds, and strptime is slow enough to dominate a pass over
+    thousands of executions, so the fields are converted directly. Returns None
+    for empty or unparsable values and for Go's zero time, which Dkron sets on
+    executions that have not finished yet.
+    """
+    match = TIMESTAMP_RE.match(value or '')
+
+    if not match:
+        return None
+
+    fields = match.groups()
+    date_time = tuple(int(field) for field in fields[:6])
+    fraction, zone = fields[6:]
+
+    if date_time[0] <= 1:
+        return None
+
+    seconds = calendar.timegm(date_time)
+
+    if zone not in ('Z', 'z'):
+        offset = int(zone[1:3]) * 3600 + int(zone[4:6]) * 60
+        seconds -= offset if zone[0] == '+' else -offset
+
+    return seconds * 1000000000 + int((fraction or '0')[:9].ljust(9, '0'))
+
+
+def decompress_body(body, content_encoding=None):
+    """Decode a gzip or deflate encoded response body.
+
+    Bodies that are not actually compressed are returned untouched, since newer
+    versions of fetch_url already decode gzip but keep the Content-Encoding header.
+    """
+    if not body or not content_encoding or isinstance(body, str):
+        return body
+
+    content_encoding = content_encoding.lower()
+
+    if content_encoding in ('gzip', 'x-gzip') and body[:2] == b'\x1f\x8b':
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+
+    if content_encoding == 'deflate':
+        # Some servers send raw deflate data instead of the zlib wrapped format
+        for wbits in (zlib.MAX_WBITS, -zlib.MAX_WBITS):
+            try:
+                return zlib.decompress(body, wbits)
+            except zlib.error:
+                pass
+
+    return body
+
+
+def normalize_job_value(value):
+    """Normalize a job field value so equivalent payload and cluster values compare equal.
+
+    Empty and false values (which upsert_job leaves out of the payload) all become None,
+    and scalars are compared as text since the cluster stores executor config as strings.
+    """
+    if isinstance(value, dict):
+        normalized = dict((key, normalize_job_value(item)) for key, item in value.items())
+        return dict((key, item) for key, item in normalized.items() if item is not None) or None
+
+    if isinstance(value, (list, tuple)):
+        return [normalize_job_value(item) for item in value] or None
+
+    if not value:
+        return None
+
+    if isinstance(value, bool):
+        return 'true'
+
+    return str(value)
+
+
+def job_configs_differ(job_config, current_config):
+    """Return True if any job field in the job_config payload differs from current_config."""
+    for field in JOB_CONFIG_FIELDS:
+        if normalize_job_value(job_config.get(field)) != normalize_job_value(current_config.get(field)):
+            return True
+
+    return False
+
+
+def job_matches_metadata(job, metadata_selector=None):
+    """Return True if the job metadata contains every key/value pair of metadata_selector."""
+    if not metadata_selector:
+        return True
+
+    metadata = job.get('metadata') or {}
+
+    if not isinstance(metadata, dict):
+        return False
+
+    for key, value in metadata_selector.items():
+        if key not in metadata or str(metadata[key]) != str(value):
+            return False
+
+    return True
+
+
+def job_matches_tags(job, tag_selector=None):
+    """Return True if the job has every tag of tag_selector.
+
+    Job tag values carry a node count suffix (eg. true:1), which a selector value without
+    one ignores.
+    """
+    if not tag_selector:
+        return True
+
+    tags = job.get('tags') or {}
+
+    for key, value in tag_selector.items():
+        if key not in tags:
+            return False
+
+        tag_value, value = str(tags[key]), str(value)
+
+        if tag_value != value and (':' in value or tag_value.split(':')[0] != value):
+            return False
+
+    return True
+
+
+def job_filter_params(metadata_selector=None, tag_selector=None, name_prefix=None, status=None):
+    """Query parameters of the /jobs API that filter jobs on the server.
+
+    The API has no tag filter, so tag_selector is accepted but left to job_matches_tags.
+    """
+    params = dict(("metadata[{key}]".format(key=key), str(value)) for key, value in (metadata_selector or {}).items())
+
+    # q matches anywhere in the job name, the prefix is checked on the returned jobs
+    if name_prefix:
+        params['q'] = name_prefix
+
+    if status:
+        params['status'] = status
+
+    return params
+
+
+def job_matches_filters(job, metadata_selector=None, tag_selector=None, name_prefix=None, status=None):
+    """Return True if the job matches all of the given job selectors."""
+    return (
+        job_matches_metadata(job, metadata_selector)
+        and job_matches_tags(job, tag_selector)
+        and (not name_prefix or (job.get('name') or '').startswith(name_prefix))
+        and (not status or job.get('status') == status)
+    )
+
+
+def project_fields(value, fields=None, exclude_fields=None, keep=()):
+    """Return a copy of a dict restricted to fields and without exclude_fields.
+
+    Fields are dotted paths into nested dicts (eg. executor_config.command). Keys in keep
+    are never left out. The dict passed in is not modified.
+    """
+    if not isinstance(value, dict) or not (fields or exclude_fields):
+        return value
+
+    if fields:
+        projected = {}
+        for path in list(keep) + list(fields):
+            _copy_field(value, projected, path.split('.'))
+    else:
+        projected = dict(value)
+
+    for path in exclude_fields or ():
+        if path not in keep:
+            _drop_field(projected, path.split('.'))
+
+    return projected
+
+
+def _copy_field(source, target, keys):
+    if keys[0] not in source:
+        return
+
+    if len(keys) == 1:
+        target[keys[0]] = source[keys[0]]
+
+    elif isinstance(source[keys[0]], dict):
+        child = target.get(keys[0])
+
+        # A parent copied in full already holds the nested field
+        if child is source[keys[0]]:
+            return
+
+        _copy_field(source[keys[0]], target.setdefault(keys[0], {}), keys[1:])
+
+
+def _drop_field(target, keys):
+    if len(keys) == 1:
+        target.pop(keys[0], None)
+        return
+
+    child = target.get(keys[0])
+
+    # Nested dicts may be shared with the original value, so they are copied before changing them
+    if isinstance(child, dict):
+        target[keys[0]] = child = dict(child)
+        _drop_field(child, keys[1:])
@@ -17,6 +17,7 @@ options:
     description:
       - Which information to return.
       - 'nodes' and 'members' are aliases.
+      - 'health' probes the API of every cluster member and is not part of 'all'.
     type: str
     choices:
       - all
@@ -24,6 +25,7 @@ options:
       - leader
       - members
       - nodes
+      - health
       - jobs
     default: all
   active_only:
@@ -32,8 +34,40 @@ options:
       - Has an effect only if type = 'jobs' (or 'all').
     type: bool
     default: False
+  probe_workers:
+    description:
+      - Number of cluster members probed concurrently when type = 'health'.
+    type: int
+    default: 32
+  probe_timeout:
+    description:
+      - Seconds to wait for each member to accept the connection and respond when type = 'health'.
+      - Members that do not respond in time are reported unreachable.
+    type: float
+    default: 2
+  gather_timeout:
+    description:
+      - Seconds to wait for the cluster info. The sections selected by I(type) are queried concurrently and share this deadline.
+      - Sections without a response by then are left out of C(cluster_info) and listed in C(timed_out), with a warning,
+        instead of failing or delaying the task.
+      - With type = 'health', members whose probe has not finished by then are reported unreachable.
+      - Waits for all sections if omitted.
+    type: float
+  fields:
+    description:
+      - Return only these fields of the cluster status, for example C(members) and C(health_score).
+      - Has an effect only if type = 'status' (or 'all').
+    type: list
+    elements: str
+  exclude_fields:
+    description:
+      - Leave these fields out of the cluster status.
+      - Has an effect only if type = 'status' (or 'all').
+    type: list
+    elements: str
 extends_documentation_fragment:
 - knightsg.dkron.connect
+- knightsg.dkron.job_selectors
 
 seealso:
 - module: knightsg.dkron.dkron_job_info
@@ -56,6 +90,49 @@ EXAMPLES = r'''
     password: mypassword
     type: members
 
+- name: Get cluster info from the fastest responding server
+  knightsg.dkron.dkron_cluster_info:
+    endpoint:
+      - 192.168.1.1
+      - 192.168.1.2
+      - 192.168.1.3
+    endpoint_selection: latency
+
+- name: Check which cluster members respond, 64 at a time
+  knightsg.dkron.dkron_cluster_info:
+    endpoint: 192.168.1.1
+    type: health
+    probe_workers: 64
+    probe_timeout: 1
+  register: cluster_health
+
+- name: List the unreachable members
+  ansible.builtin.debug:
+    msg: "{{ cluster_health.cluster_info.health.members | rejectattr('reachable') | map(attribute='name') | list }}"
+
+- name: Get whatever cluster info responds within 5 seconds
+  knightsg.dkron.dkron_cluster_info:
+    endpoint: 192.168.1.1
+    keep_alive: true
+    gather_timeout: 5
+
+- name: Get the failed jobs of team A
+  knightsg.dkron.dkron_cluster_info:
+    endpoint: 192.168.1.1
+    type: jobs
+    metadata_selector:
+      team: team-a
+    job_status: failed
+
+- name: Get only the member count and health of the cluster
+  knightsg.dkron.dkron_cluster_info:
+    endpoint: 192.168.1.1
+    type: status
+    fields:
+      - members
+      - failed
+      - health_score
+
 '''
 
 RETURN = r'''
@@ -77,11 +154,113 @@ cluster_info:
     returned: success, if 'all' or 'members' (or 'nodes') are specified for 'type'
     type: list
     sample: ['172.16.1.1', '172.16.1.2', '172.16.1.3']
+  health:
+    description:
+      - Health matrix of the cluster members, from one concurrent probe of the API of every member.
+      - Each member has its name, address, role, Serf status, version and tags, whether its API responded
+        without a server error, the HTTP status and the latency in milliseconds, and the error if the probe failed.
+    returned: success, if 'health' is specified for 'type'
+    type: dict
+    sample: {
+      "members": [
+        {
+          "name": "dkron-agent-1",
+          "addr": "172.16.1.4",
+          "role": "agent",
+          "serf_status": "alive",
+          "version": "3.1.3",
+          "tags": {"dc": "dc1", "region": "global", "role": "dkron", "version": "3.1.3"},
+          "reachable": false,
+          "http_status": null,
+          "latency_ms": null,
+          "error": "timed out"
+        },
+        {
+          "name": "dkron-server-1",
+          "addr": "172.16.1.1",
+          "role": "server",
+          "serf_status": "alive",
+          "version": "3.1.3",
+          "tags": {"dc": "dc1", "region": "global", "role": "dkron", "server": "true", "version": "3.1.3"},
+          "reachable": true,
+          "http_status": 200,
+          "latency_ms": 3.482
+        }
+      ],
+      "reachable": 1,
+      "unreachable": 1
+    }
   jobs:
-    description: Jobs configured in cluster.
+    description: Jobs configured in cluster, limited to the jobs matching the job selectors if any are set.
     returned: success, if 'all' or 'jobs'are specified for 'type'
     type: list (of dicts)
     sample: [{}, {}, {}]
+timed_out:
+  description: Sections of the cluster info that did not respond within I(gather_timeout), and are missing from C(cluster_info).
+  returned: when I(gather_timeout) is set and some sections did not respond in time
+  type: list
+  elements: str
+  sample: ['jobs']
+connection_stats:
+  description: Request and connection counters of the keep-alive connection pool.
+  returned: when I(keep_alive=true) or over a persistent httpapi connection
+  type: dict
+  sample: {
+    "requests": 4,
+    "opened": 1,
+    "reused": 3
+  }
+timings:
+  description:
+    - Request timings, in total, per API endpoint and per cluster node. Durations are in milliseconds.
+    - The dns, connect, ttfb and transfer phases are only measured with I(keep_alive=true).
+  returned: when I(timings=true)
+  type: dict
+  sample: {
+    "total": {
+      "requests": 4,
+      "errors": 0,
+      "bytes_sent": 0,
+      "bytes_received": 8041,
+      "latency_ms": {"p50": 1.207, "p95": 3.452, "max": 3.452},
+      "phases_ms": {"dns": 0.412, "connect": 0.605, "ttfb": 5.807, "transfer": 0.363, "decode": 0.456}
+    },
+    "endpoints": {
+      "GET /": {
+        "requests": 1,
+        "errors": 0,
+        "bytes_sent": 0,
+        "bytes_received": 412,
+        "latency_ms": {"p50": 1.874, "p95": 1.874, "max": 1.874},
+        "phases_ms": {"dns": 0.412, "connect": 0.605, "ttfb": 1.12, "transfer": 0.041, "decode": 0.032}
+      },
+      "GET /leader": {
+        "requests": 1,
+        "errors": 0,
+        "bytes_sent": 0,
+        "bytes_received": 198,
+        "latency_ms": {"p50": 0.913, "p95": 0.913, "max": 0.913},
+        "phases_ms": {"dns": 0.0, "connect": 0.0, "ttfb": 0.802, "transfer": 0.022, "decode": 0.018}
+      },
+      "GET /members": {
+        "requests": 1,
+        "errors": 0,
+        "bytes_sent": 0,
+        "bytes_received": 1604,
+        "latency_ms": {"p50": 1.207, "p95": 1.207, "max": 1.207},
+        "phases_ms": {"dns": 0.0, "connect": 0.0, "ttfb": 1.011, "transfer": 0.064, "decode": 0.095}
+      },
+      "GET /jobs": {
+        "requests": 1,
+        "errors": 0,
+        "bytes_sent": 0,
+        "bytes_received": 5827,
+        "latency_ms": {"p50": 3.452, "p95": 3.452, "max": 3.452},
+        "phases_ms": {"dns": 0.0, "connect": 0.0, "ttfb": 2.874, "transfer": 0.236, "decode": 0.311}
+      }
+    },
+    "nodes": {"192.168.1.1:8080": 4}
+  }
 '''
 
 ANSIBLE_METADATA = {
@@ -98,19 +277,41 @@ from ansible_collections.knightsg.dkron.plugins.module_utils.classes import (
 )
 from ansible_collections.knightsg.dkron.plugins.module_utils.support import (
     dkron_argument_spec,
-    dkron_required_together
+    dkron_job_selector_argument_spec,
+    dkron_required_together,
+    job_selectors
 )
 
 
-def init_module():
+# Cluster info sections, and the values of the type option that include them
+SECTIONS = [
+    ('status', ['all', 'status']),
+    ('leader', ['all', 'leader']),
+    ('members', ['all', 'members', 'nodes']),
+    ('health', ['health']),
+    ('jobs', ['all', 'jobs'])
+]
+
+
+def argument_spec():
     module_args = dkron_argument_spec()
+    module_args.update(dkron_job_selector_argument_spec())
     module_args.update(
-        type=dict(type='str', choices=['all', 'status', 'leader', 'members', 'nodes', 'jobs'], default='all'),
-        active_only=dict(type='bool', required=False, default=False)
+        type=dict(type='str', choices=['all', 'status', 'leader', 'members', 'nodes', 'health', 'jobs'], default='all'),
+        active_only=dict(type='bool', required=False, default=False),
+        fields=dict(type='list', elements='str', required=False),
+        exclude_fields=dict(type='list', elements='str', required=False),
+        probe_workers=dict(type='int', required=False, default=32),
+        probe_timeout=dict(type='float', required=False, default=2),
+        gather_timeout=dict(type='float', required=False)
     )
 
+    return module_args
+
+
+def init_module():
     module = AnsibleModule(
-        argument_spec=module_args,
+        argument_spec=argument_spec(),
         supports_check_mode=True,
         required_together=dkron_required_together()
     )
@@ -118,38 +319,42 @@ def init_module():
     return module
 
 
-def main():
-    module = init_module()
+def run_module(module):
     result = dict(
         changed=False,
         failed=False,
         cluster_info={}
     )
 
-    data = {}
     api = DkronClusterInterface(module)
+    sections = [section for section, types in SECTIONS if module.params['type'] in types]
 
-    if module.params['type'] in ['all', 'status']:
-        data['status'] = api.cluster_status()
-        result['changed'] = True
+    # The sections are independent, so they are queried concurrently
+    data, timed_out = api.cluster_info(sections, job_selectors(module.params), timeout=module.params['gather_timeout'])
 
-    if module.params['type'] in ['all', 'leader']:
-        data['leader'] = api.leader_node()
+    if data:
         result['changed'] = True
+        result['cluster_info'] = data
 
-    if module.params['type'] in ['all', 'members', 'nodes']:
-        data['members'] = api.member_nodes()
-        result['changed'] = True
+    if timed_out:
+        result['timed_out'] = timed_out
+        module.warn("cluster info incomplete, no response within {secs}s for: {sections}".format(
+            secs=module.params['gather_timeout'],
+            sections=', '.join(timed_out)
+        ))
 
-    if module.params['type'] in ['all', 'jobs']:
-        data['jobs'] = api.job_list()
-        result['changed'] = True
+    if module.params['keep_alive'] or api.connection:
+        result['connection_stats'] = api.connection_stats()
 
-    if result['changed']:
-        result['cluster_info'] = data
+    if module.params['timings']:
+        result['timings'] = api.timings.summary()
 
     module.exit_json(**result)
 
 
+def main():
+    run_module(init_module())
+
+
 if __name__ == '__main__':
     main()
@@ -189,7 +189,8 @@ options:
   overwrite:
     description:
       - Overwrite the job configuration if it already exists.
-      - Will still report the job status as changed even if existing config matches new config.
+      - The existing job is only updated (and reported as changed) if its configuration differs from the new config.
+        Fields managed by the cluster, such as C(next), C(success_count) or C(last_success), are ignored.
       - If set to false, existing job config will be returned.
     type: bool
     default: true
@@ -250,6 +251,50 @@ configuration:
     "timezone"": "UTC",
     "owner": "John Smith"
   }
+connection_stats:
+  description: Request and connection counters of the keep-alive connection pool.
+  returned: when I(keep_alive=true) or over a persistent httpapi connection
+  type: dict
+  sample: {
+    "requests": 2,
+    "opened": 1,
+    "reused": 1
+  }
+timings:
+  description:
+    - Request timings, in total, per API endpoint and per cluster node. Durations are in milliseconds.
+    - The dns, connect, ttfb and transfer phases are only measured with I(keep_alive=true).
+  returned: when I(timings=true)
+  type: dict
+  sample: {
+    "total": {
+      "requests": 2,
+      "errors": 0,
+      "bytes_sent": 588,
+      "bytes_received": 2072,
+      "latency_ms": {"p50": 2.113, "p95": 4.208, "max": 4.208},
+      "phases_ms": {"dns": 0.412, "connect": 0.605, "ttfb": 4.894, "transfer": 0.101, "decode": 0.118}
+    },
+    "endpoints": {
+      "GET /jobs/{name}": {
+        "requests": 1,
+        "errors": 0,
+        "bytes_sent": 0,
+        "bytes_received": 1036,
+        "latency_ms": {"p50": 2.113, "p95": 2.113, "max": 2.113},
+        "phases_ms": {"dns": 0.412, "connect": 0.605, "ttfb": 0.98, "transfer": 0.052, "decode": 0.061}
+      },
+      "POST /jobs": {
+        "requests": 1,
+        "errors": 0,
+        "bytes_sent": 588,
+        "bytes_received": 1036,
+        "latency_ms": {"p50": 4.208, "p95": 4.208, "max": 4.208},
+        "phases_ms": {"dns": 0.0, "connect": 0.0, "ttfb": 3.914, "transfer": 0.049, "decode": 0.057}
+      }
+    },
+    "nodes": {"192.168.1.1:8080": 2}
+  }
 '''
 
 ANSIBLE_METADATA = {
@@ -266,38 +311,24 @@ from ansible_collections.knightsg.dkron.plugins.module_utils.classes import (
 )
 from ansible_collections.knightsg.dkron.plugins.module_utils.support import (
     dkron_argument_spec,
+    dkron_job_argument_spec,
     dkron_required_together
 )
 
 
-def init_module():
+def argument_spec():
     module_args = dkron_argument_spec()
+    module_args.update(dkron_job_argument_spec())
     module_args.update(
-        name=dict(type='str', required=True),
-        displayname=dict(type='str', required=False),
-        schedule=dict(type='str', required=False, default='@every 1m'),
-        timezone=dict(type='str', required=False, default='UTC'),
-        owner=dict(type='str', required=False),
-        owner_email=dict(type='str', required=False),
-        disabled=dict(type='bool', required=False, default=False),
-        tags=dict(type='dict', required=False),
-        metadata=dict(type='dict', required=False),
-        retries=dict(type='int', required=False, default=0),
-        parent_job=dict(type='str', required=False),
-        run_on_create=dict(type='bool', required=False, default=False),
-        file_processor=dict(type='dict', required=False),
-        log_processor=dict(type='dict', required=False),
-        syslog_processor=dict(type='dict', required=False),
-        concurrency=dict(type='bool', required=False, default=True),
-        shell_executor=dict(type='dict', required=False),
-        http_executor=dict(type='dict', required=False),
-        overwrite=dict(type='bool', required=False, default=True),
-        toggle=dict(type='bool', required=False, default=False),
-        state=dict(type='str', required=False, default='present', choices=['present', 'absent'])
+        toggle=dict(type='bool', required=False, default=False)
     )
 
+    return module_args
+
+
+def init_module():
     module = AnsibleModule(
-        argument_spec=module_args,
+        argument_spec=argument_spec(),
         supports_check_mode=True,
         required_together=dkron_required_together()
     )
@@ -305,8 +336,7 @@ def init_module():
     return module
 
 
-def main():
-    module = init_module()
+def run_module(module):
     result = dict(
         changed=False,
         failed=False,
@@ -318,11 +348,16 @@ def main():
     if module.params['state'] == 'present':
         if not module.params['toggle']:
             if module.params['overwrite']:
-                data, changed = api.upsert_job()
-                result['job_config'] = data
-                result['changed'] = changed
+                differs, current_config = api.compare_job_configs()
+                if differs:
+                    data, changed = api.upsert_job()
+                    result['job_config'] = data
+                    result['changed'] = changed
+                else:
+                    result['job_config'] = current_config
+                    result['changed'] = False
             else:
-                existing_jobs = api.job_list()
+                existing_jobs = api.job_list(use_cache=False)
                 if module.params['name'] not in existing_jobs:
                     data, changed = api.upsert_job()
                     result['job_config'] = data
@@ -336,12 +371,22 @@ def main():
             result['changed'] = changed
 
     else:
-        data, changed = api.delete_job()
+        data, changed = api.delete_job(job_name=module.params['name'])
         result['ansible_module_results'] = data
         result['changed'] = changed
 
+    if module.params['keep_alive'] or api.connection:
+        result['connection_stats'] = api.connection_stats()
+
+    if module.params['timings']:
+        result['timings'] = api.timings.summary()
+
     module.exit_json(**result)
 
 
+def main():
+    run_module(init_module())
+
+
 if __name__ == '__main__':
     main()
@@ -18,6 +18,7 @@ options:
     description:
       - Name (or list of names) of job to query.
       - Will query all jobs if omitted.
+      - With job selectors, named jobs that do not match them are left out.
     type: list
     default: all (query all jobs)
     aliases:
@@ -28,8 +29,52 @@ options:
       - Will return full history for each job if omitted.
     type: int
     default: 0 (do not limit)
+  include_history:
+    description:
+      - Return the execution history of each job, or its summary with I(history_summary).
+      - Set to false to return the job configs only, which for all jobs takes a single API request.
+    type: bool
+    default: true
+  bulk_query_threshold:
+    description:
+      - Above this many names in I(names), all job configs are read with one C(/jobs) query instead of one query per job.
+      - The bulk query downloads and decodes every job of the cluster, so on clusters with thousands of jobs
+        a higher threshold keeps the module from fetching far more than the requested jobs.
+      - Combine a high threshold with I(max_workers) and I(keep_alive) to query many names one by one quickly.
+    type: int
+    default: 5
+  max_workers:
+    description:
+      - Number of job config and history queries to run concurrently.
+      - With the default of 1 jobs are queried one after another and the first failed query fails the module.
+      - With more than one worker a failed job is reported in its own entry (with C(failed) and C(msg)) and the other jobs are still returned.
+      - Best combined with I(keep_alive) so the workers share pooled connections.
+    type: int
+    default: 1
+  fields:
+    description:
+      - Return only these fields of each job config, to keep the result small when querying many jobs.
+      - Nested fields are given as dotted paths, for example C(executor_config.command).
+      - The job C(name) is always returned.
+      - Fields are dropped as soon as each response is decoded, so the full job configs are not kept in memory.
+    type: list
+    elements: str
+  exclude_fields:
+    description:
+      - Leave these fields out of each job config, for example C(processors) or C(executor_config).
+      - Nested fields are given as dotted paths. Applied after I(fields).
+    type: list
+    elements: str
+  history_summary:
+    description:
+      - Return aggregates of each job's executions in C(history_summary) instead of the executions themselves in C(history).
+      - The executions are read page by page and folded into the aggregates as they arrive, so the history of a job is never held in memory.
+      - Combine with I(limit_history) to summarize only the latest executions.
+    type: bool
+    default: false
 extends_documentation_fragment:
 - knightsg.dkron.connect
+- knightsg.dkron.job_selectors
 
 seealso:
 - module: knightsg.dkron.dkron_job
@@ -66,12 +111,58 @@ EXAMPLES = r'''
     endpoint: 192.168.1.1
     limit_history: 1
 
+- name: Get config only for all defined jobs (single API request)
+  knightsg.dkron.dkron_job_info:
+    endpoint: 192.168.1.1
+    include_history: false
+
+- name: Get success rate, retries and duration percentiles of the last 500 executions of every job
+  knightsg.dkron.dkron_job_info:
+    endpoint: 192.168.1.1
+    keep_alive: true
+    max_workers: 8
+    history_summary: true
+    limit_history: 500
+
+- name: Get the configs of team A's backup jobs, filtered by the cluster
+  knightsg.dkron.dkron_job_info:
+    endpoint: 192.168.1.1
+    include_history: false
+    metadata_selector:
+      team: team-a
+    name_prefix: backup-
+
+- name: Get only the status and next run of all jobs
+  knightsg.dkron.dkron_job_info:
+    endpoint: 192.168.1.1
+    include_history: false
+    fields:
+      - status
+      - next
+
+- name: Get job configs without their executor and processor settings
+  knightsg.dkron.dkron_job_info:
+    endpoint: 192.168.1.1
+    include_history: false
+    exclude_fields:
+      - executor_config
+      - processors
+      - dependent_jobs
+
+- name: Query all jobs using 16 concurrent workers over pooled connections
+  knightsg.dkron.dkron_job_info:
+    endpoint: 192.168.1.1
+    keep_alive: true
+    max_workers: 16
+
 '''
 
 RETURN = r'''
 ---
 configuration:
-  description: Job configuration as returned by the Dkron cluster API (https://dkron.io/api/).
+  description:
+    - Job configuration as returned by the Dkron cluster API (https://dkron.io/api/).
+    - Restricted to I(fields) and without I(exclude_fields) when these are set.
   returned: always
   type: dict
   sample: {
@@ -103,7 +194,7 @@ configuration:
   contains: see Dkron usage documentation for complete breakdown of returned values (https://dkron.io/usage/)
 history:
   description: List of job executions with result status.
-  returned: always
+  returned: when I(include_history=true)
   type: list of dicts
   sample: [
     {
@@ -125,6 +216,59 @@ history:
       success: True
     }
   ]
+history_summary:
+  description:
+    - Aggregates of the job executions. Retries count the executions that were a retry of a failed run.
+    - The success rate leaves out executions that are still running. Durations are in milliseconds,
+      measured from C(started_at) to C(finished_at) with nanosecond precision.
+  returned: when I(history_summary=true)
+  type: dict
+  sample: {
+    "executions": 500,
+    "succeeded": 447,
+    "failed": 52,
+    "running": 1,
+    "retries": 38,
+    "success_rate": 0.8958,
+    "duration_ms": {"p50": 184.07, "p95": 2311.502, "max": 6003.118},
+    "last_started_at": "2020-11-14T17:31:15.007570195Z"
+  }
+connection_stats:
+  description: Request and connection counters of the keep-alive connection pool.
+  returned: when I(keep_alive=true) or over a persistent httpapi connection
+  type: dict
+  sample: {
+    "requests": 6001,
+    "opened": 1,
+    "reused": 6000
+  }
+timings:
+  description:
+    - Request timings, in total, per API endpoint and per cluster node. Durations are in milliseconds.
+    - The dns, connect, ttfb and transfer phases are only measured with I(keep_alive=true).
+  returned: when I(timings=true)
+  type: dict
+  sample: {
+    "total": {
+      "requests": 3,
+      "errors": 0,
+      "bytes_sent": 0,
+      "bytes_received": 2817,
+      "latency_ms": {"p50": 2.113, "p95": 9.87, "max": 9.87},
+      "phases_ms": {"dns": 0.412, "connect": 0.605, "ttfb": 11.02, "transfer": 0.311, "decode": 0.207}
+    },
+    "endpoints": {
+      "GET /jobs/{name}": {
+        "requests": 3,
+        "errors": 0,
+        "bytes_sent": 0,
+        "bytes_received": 2817,
+        "latency_ms": {"p50": 2.113, "p95": 9.87, "max": 9.87},
+        "phases_ms": {"dns": 0.412, "connect": 0.605, "ttfb": 11.02, "transfer": 0.311, "decode": 0.207}
+      }
+    },
+    "nodes": {"192.168.1.1:8080": 3}
+  }
 '''
 
 ANSIBLE_METADATA = {
@@ -140,20 +284,34 @@ from ansible_collections.knightsg.dkron.plugins.module_utils.classes import (
     DkronEmptyResponseException
 )
 from ansible_collections.knightsg.dkron.plugins.module_utils.support import (
+    BULK_QUERY_THRESHOLD,
     dkron_argument_spec,
-    dkron_required_together
+    dkron_job_selector_argument_spec,
+    dkron_required_together,
+    job_selectors
 )
 
 
-def init_module():
+def argument_spec():
     module_args = dkron_argument_spec()
+    module_args.update(dkron_job_selector_argument_spec())
     module_args.update(
         names=dict(type='list', required=False, aliases=['name']),
-        limit_history=dict(type='int', required=False, default=0)
+        limit_history=dict(type='int', required=False, default=0),
+        include_history=dict(type='bool', required=False, default=True),
+        bulk_query_threshold=dict(type='int', required=False, default=BULK_QUERY_THRESHOLD),
+        max_workers=dict(type='int', required=False, default=1),
+        history_summary=dict(type='bool', required=False, default=False),
+        fields=dict(type='list', elements='str', required=False),
+        exclude_fields=dict(type='list', elements='str', required=False)
     )
 
+    return module_args
+
+
+def init_module():
     module = AnsibleModule(
-        argument_spec=module_args,
+        argument_spec=argument_spec(),
         supports_check_mode=False,
         required_together=dkron_required_together()
     )
@@ -161,8 +319,7 @@ def init_module():
     return module
 
 
-def main():
-    module = init_module()
+def run_module(module):
     result = dict(
         changed=False,
         failed=False,
@@ -172,25 +329,61 @@ def main():
     jobs = []
     api = DkronClusterInterface(module)
 
-    if module.params['names']:
-        for name in module.params['names']:
-            job_data = {}
-            job_data['job_config'] = api.get_job_config(name)
-            job_data['history'] = api.get_job_history(name)
-            jobs.append(job_data)
+    job_names = module.params['names']
+    job_configs = None
+    selectors = job_selectors(module.params)
+
+    # Selected jobs come from one filtered /jobs query, and named jobs that do not match are left out
+    if not job_names or len(job_names) > module.params['bulk_query_threshold'] or any(selectors.values()):
+        job_configs = api.job_configs(selectors)
+
+        if not job_names:
+            job_names = list(job_configs)
+        elif any(selectors.values()):
+            job_names = [job_name for job_name in job_names if job_name in job_configs]
+
+    if module.params['max_workers'] > 1:
+        jobs = api.gather_jobs(
+            job_names,
+            max_workers=module.params['max_workers'],
+            job_configs=job_configs,
+            include_history=module.params['include_history'],
+            history_summary=module.params['history_summary']
+        )
 
     else:
-        job_list = api.job_list()
-        for job_name in job_list:
+        for job_name in job_names:
             job_data = {}
-            job_data['job_config'] = api.get_job_config(job_name)
-            job_data['history'] = api.get_job_history(job_name)
+
+            if job_configs is None:
+                job_data['job_config'] = api.get_job_config(job_name)
+            elif job_name in job_configs:
+                job_data['job_config'] = job_configs[job_name]
+            else:
+                module.fail_json(msg="job config query failed ({err})".format(err=str(DkronRequestException(404))))
+
+            if module.params['include_history'] and module.params['history_summary']:
+                job_data['history_summary'] = api.get_job_history_summary(job_name)
+            elif module.params['include_history']:
+                job_data['history'] = api.get_job_history(job_name)
+
             jobs.append(job_data)
 
     result['jobs'] = jobs
     result['changed'] = True
+
+    if module.params['keep_alive'] or api.connection:
+        result['connection_stats'] = api.connection_stats()
+
+    if module.params['timings']:
+        result['timings'] = api.timings.summary()
+
     module.exit_json(**result)
 
 
+def main():
+    run_module(init_module())
+
+
 if __name__ == '__main__':
     main()
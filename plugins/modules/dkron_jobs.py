@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+# Copyright: (c) 2020, Guy Knights <contact@guyknights.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+DOCUMENTATION = r'''
+---
+module: dkron_jobs
+short_description: Manage many Dkron jobs at once
+description:
+- Create, update or delete a list of Dkron jobs in a single task.
+- The current jobs are read from the cluster with one query and compared with the job definitions.
+  Only jobs that are missing, differ or have to be removed are written, several at a time.
+options:
+  jobs:
+    description:
+      - List of job definitions.
+      - Each definition accepts the same options as M(knightsg.dkron.dkron_job), except I(toggle).
+    type: list
+    elements: dict
+    required: true
+  max_workers:
+    description:
+      - Number of job creates, updates and deletes sent to the cluster concurrently.
+    type: int
+    default: 4
+  exclusive:
+    description:
+      - Treat I(jobs) as the complete desired state of the cluster.
+      - Jobs in the cluster that are not in I(jobs) are deleted, limited to the jobs matching I(metadata_selector) if it is set.
+      - Use check mode to review the resulting C(plan) before applying it.
+    type: bool
+    default: false
+  metadata_selector:
+    description:
+      - Metadata key/value pairs a job in the cluster must have to be deleted in I(exclusive) mode.
+      - Lets several playbooks each own a part of the cluster, for example by team.
+    type: dict
+extends_documentation_fragment:
+- knightsg.dkron.connect
+
+seealso:
+- module: knightsg.dkron.dkron_job
+- module: knightsg.dkron.dkron_job_info
+
+author:
+- Guy Knights (contact@guyknights.com)
+'''
+
+EXAMPLES = r'''
+- name: Reconcile a list of jobs
+  knightsg.dkron.dkron_jobs:
+    endpoint: 192.168.1.1
+    keep_alive: true
+    max_workers: 8
+    jobs:
+      - name: mytestjob1
+        schedule: '@every 10m'
+        shell_executor:
+          command: '/usr/local/bin/cleanup'
+      - name: mytestjob2
+        schedule: '0 0 3 * * *'
+        http_executor:
+          method: GET
+          url: 'http://localhost:8000/nightly'
+      - name: oldjob
+        state: absent
+
+- name: Show which jobs owned by team-a would be created, updated or removed
+  knightsg.dkron.dkron_jobs:
+    endpoint: 192.168.1.1
+    exclusive: true
+    metadata_selector:
+      team: team-a
+    jobs: "{{ team_a_jobs }}"
+  check_mode: true
+  register: team_a_plan
+
+'''
+
+RETURN = r'''
+---
+plan:
+  description: Names of the jobs to create, update, delete or leave unchanged. In check mode nothing is applied.
+  returned: always
+  type: dict
+  sample: {
+    "create": ["mytestjob2"],
+    "update": ["mytestjob1"],
+    "delete": ["oldjob"],
+    "unchanged": []
+  }
+jobs:
+  description: Result for each job definition, in the order they were given, followed by the jobs deleted in I(exclusive) mode.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    name:
+      description: Job name.
+      type: str
+    action:
+      description: What was (or in check mode, would be) done to the job.
+      type: str
+      choices: [create, update, delete, none, error]
+    changed:
+      description: Whether the job was changed.
+      type: bool
+    job_config:
+      description: Job configuration returned by the cluster after the write, or the current configuration if nothing was written.
+      type: dict
+    failed:
+      description: Set if the job definition is invalid or the write failed.
+      type: bool
+    msg:
+      description: Error message, if the job failed.
+      type: str
+  sample: [
+    {
+      "name": "mytestjob1",
+      "action": "update",
+      "changed": true,
+      "job_config": {}
+    },
+    {
+      "name": "oldjob",
+      "action": "none",
+      "changed": false,
+      "job_config": {}
+    }
+  ]
+connection_stats:
+  description: Request and connection counters of the keep-alive connection pool.
+  returned: when I(keep_alive=true) or over a persistent httpapi connection
+  type: dict
+  sample: {
+    "requests": 41,
+    "opened": 8,
+    "reused": 33
+  }
+timings:
+  description:
+    - Request timings, in total, per API endpoint and per cluster node. Durations are in milliseconds.
+    - The dns, connect, ttfb and transfer phases are only measured with I(keep_alive=true).
+  returned: when I(timings=true)
+  type: dict
+  sample: {
+    "total": {
+      "requests": 4,
+      "errors": 0,
+      "bytes_sent": 1176,
+      "bytes_received": 8935,
+      "latency_ms": {"p50": 3.452, "p95": 4.96, "max": 4.96},
+      "phases_ms": {"dns": 0.412, "connect": 0.605, "ttfb": 12.987, "transfer": 0.371, "decode": 0.47}
+    },
+    "endpoints": {
+      "GET /jobs": {
+        "requests": 1,
+        "errors": 0,
+        "bytes_sent": 0,
+        "bytes_received": 5827,
+        "latency_ms": {"p50": 3.452, "p95": 3.452, "max": 3.452},
+        "phases_ms": {"dns": 0.412, "connect": 0.605, "ttfb": 2.874, "transfer": 0.236, "decode": 0.311}
+      },
+      "POST /jobs": {
+        "requests": 2,
+        "errors": 0,
+        "bytes_sent": 1176,
+        "bytes_received": 2072,
+        "latency_ms": {"p50": 4.208, "p95": 4.96, "max": 4.96},
+        "phases_ms": {"dns": 0.0, "connect": 0.0, "ttfb": 7.615, "transfer": 0.088, "decode": 0.104}
+      },
+      "DELETE /jobs/{name}": {
+        "requests": 1,
+        "errors": 0,
+        "bytes_sent": 0,
+        "bytes_received": 1036,
+        "latency_ms": {"p50": 2.731, "p95": 2.731, "max": 2.731},
+        "phases_ms": {"dns": 0.0, "connect": 0.0, "ttfb": 2.498, "transfer": 0.047, "decode": 0.055}
+      }
+    },
+    "nodes": {"192.168.1.1:8080": 4}
+  }
+'''
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronClusterInterface
+from ansible_collections.knightsg.dkron.plugins.module_utils.support import (
+    dkron_argument_spec,
+    dkron_job_argument_spec,
+    dkron_required_together
+)
+
+
+def argument_spec():
+    module_args = dkron_argument_spec()
+    module_args.update(
+        jobs=dict(type='list', elements='dict', required=True, options=dkron_job_argument_spec()),
+        max_workers=dict(type='int', required=False, default=4),
+        exclusive=dict(type='bool', required=False, default=False),
+        metadata_selector=dict(type='dict', required=False)
+    )
+
+    return module_args
+
+
+def init_module():
+    module = AnsibleModule(
+        argument_spec=argument_spec(),
+        supports_check_mode=True,
+        required_together=dkron_required_together()
+    )
+
+    return module
+
+
+def run_module(module):
+    result = dict(
+        changed=False,
+        failed=False,
+        plan={},
+        jobs=[]
+    )
+
+    job_names = set()
+    duplicates = set()
+    for job in module.params['jobs']:
+        if job['name'] in job_names:
+            duplicates.add(job['name'])
+        job_names.add(job['name'])
+
+    if duplicates:
+        module.fail_json(msg="job names must be unique, found duplicates: {names}".format(names=', '.join(sorted(duplicates))))
+
+    api = DkronClusterInterface(module)
+
+    plan = api.plan_jobs(
+        module.params['jobs'],
+        exclusive=module.params['exclusive'],
+        metadata_selector=module.params['metadata_selector']
+    )
+    result['plan'] = {
+        'create': [entry['name'] for entry in plan if entry['action'] == 'create'],
+        'update': [entry['name'] for entry in plan if entry['action'] == 'update'],
+        'delete': [entry['name'] for entry in plan if entry['action'] == 'delete'],
+        'unchanged': [entry['name'] for entry in plan if entry['action'] == 'none']
+    }
+    result['jobs'] = api.apply_job_plan(plan, max_workers=module.params['max_workers'])
+    result['changed'] = any(job['changed'] for job in result['jobs'])
+
+    if module.params['keep_alive'] or api.connection:
+        result['connection_stats'] = api.connection_stats()
+
+    if module.params['timings']:
+        result['timings'] = api.timings.summary()
+
+    failed_jobs = [job['name'] for job in result['jobs'] if job.get('failed')]
+
+    if failed_jobs:
+        result['msg'] = "{count} job(s) failed: {names}".format(count=len(failed_jobs), names=', '.join(failed_jobs))
+        module.fail_json(**result)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module(init_module())
+
+
+if __name__ == '__main__':
+    main()
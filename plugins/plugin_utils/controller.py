@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2021, Guy Knights
+# GNU General Public License v3.0+ (see LICENSE or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import threading
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.basic import remove_values
+from ansible.plugins.action import ActionBase
+from ansible.utils.vars import merge_hash
+from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronConnectionPool
+from ansible_collections.knightsg.dkron.plugins.module_utils.support import dkron_required_together
+
+try:
+    from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+    HAS_ARG_SPEC_VALIDATOR = True
+except ImportError:
+    HAS_ARG_SPEC_VALIDATOR = False
+
+
+# Keep-alive pools shared by every controller-side task run in this process,
+# keyed by the TLS and proxy settings they were created with
+_connection_pools = {}
+_connection_pools_lock = threading.Lock()
+
+
+def shared_connection_pool(params):
+    key = (params['validate_certs'], params['client_cert'], params['client_key'], params['use_proxy'])
+
+    with _connection_pools_lock:
+        if key not in _connection_pools:
+            _connection_pools[key] = DkronConnectionPool(
+                validate_certs=params['validate_certs'],
+                client_cert=params['client_cert'],
+                client_key=params['client_key'],
+                use_proxy=params['use_proxy']
+            )
+
+        return _connection_pools[key]
+
+
+class DkronModuleExit(Exception):
+
+    def __init__(self, result):
+        super(DkronModuleExit, self).__init__(result.get('msg', ''))
+        self.result = result
+
+
+class DkronControllerModule(object):
+    """Minimal stand-in for AnsibleModule, used to run module code inside the controller process.
+
+    exit_json() and fail_json() raise DkronModuleExit with the module result
+    instead of printing it and exiting. As with AnsibleModule, the values of
+    no_log parameters are masked in the result.
+    """
+
+    def __init__(self, args, argument_spec, check_mode=False, required_together=None):
+        self.check_mode = check_mode
+        self.warnings = []
+        self.no_log_values = set()
+        self._socket_path = None
+
+        validator = ArgumentSpecValidator(argument_spec, required_together=required_together)
+        validated = validator.validate(args)
+
+        if validated.error_messages:
+            self.fail_json(msg="Unsupported parameters or values: {errors}".format(errors='; '.join(validated.error_messages)))
+
+        self.params = validated.validated_parameters
+        self.no_log_values = validated._no_log_values
+
+        # Controller-side runs always use pooled connections, shared with the other tasks of this process
+        self.params['keep_alive'] = True
+        self.connection_pool = shared_connection_pool(self.params)
+
+    def warn(self, warning):
+        self.warnings.append(warning)
+
+    def exit_json(self, **kwargs):
+        if self.warnings:
+            kwargs['warnings'] = self.warnings
+        raise DkronModuleExit(remove_values(kwargs, self.no_log_values))
+
+    def fail_json(self, msg, **kwargs):
+        kwargs['failed'] = True
+        kwargs['msg'] = msg
+        self.exit_json(**kwargs)
+
+
+class DkronActionBase(ActionBase):
+    """Run a knightsg.dkron module inside the controller when the task is executed locally.
+
+    Subclasses set MODULE to the module python module, which provides argument_spec()
+    and run_module(). Tasks on any other connection run the module normally, and so
+    do tasks with an environment, which the controller process could not apply to
+    its own proxy settings.
+    """
+
+    MODULE = None
+
+    _supports_check_mode = True
+    _supports_async = True
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(DkronActionBase, self).run(tmp, task_vars)
+        del tmp
+
+        if not self._runs_on_controller():
+            wrap_async = self._task.async_val and not self._connection.has_native_async
+            result = merge_hash(result, self._execute_module(task_vars=task_vars, wrap_async=wrap_async))
+
+            if not wrap_async:
+                self._remove_tmp_path(self._connection._shell.tmpdir)
+
+            return result
+
+        try:
+            module = DkronControllerModule(
+                self._task.args,
+                self.MODULE.argument_spec(),
+                check_mode=self._task.check_mode,
+                required_together=dkron_required_together()
+            )
+            self.MODULE.run_module(module)
+
+        except DkronModuleExit as e:
+            result.update(e.result)
+            return result
+
+        except Exception as e:
+            result.update(failed=True, msg="unexpected error in controller-side module run ({err})".format(err=to_text(e)))
+            return result
+
+        result.update(failed=True, msg="module finished without returning a result")
+        return result
+
+    def _runs_on_controller(self):
+        return (
+            HAS_ARG_SPEC_VALIDATOR
+            and not self._task.async_val
+            and not self._task.environment
+            and self._connection.transport.split('.')[-1] == 'local'
+        )
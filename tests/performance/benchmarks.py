@@ -0,0 +1,272 @@
+"""End to end benchmarks of the dkron modules against a local fake Dkron server.
+
+Every scenario runs a module in-process against a fresh FakeDkronServer and
+records the wall time (median of the repeats), the number of API requests and
+the peak Python memory allocated during one run (tracemalloc). The server runs
+in a child process, so only the module is measured. Results are
+compared with baselines.json, per dataset profile.
+
+    PYTHONPATH=<dir containing ansible_collections> python tests/performance/benchmarks.py --profile medium
+    ... --update-baseline   to record the current results as the new baseline
+
+Wall time and memory depend on the machine, so refresh the baselines on the
+machine the comparison runs on. Request counts do not, and must never grow.
+"""
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from unittest.mock import patch
+from ansible.module_utils import basic
+from ansible.module_utils._text import to_bytes
+from ansible_collections.knightsg.dkron.plugins.modules import (
+    dkron_cluster_info,
+    dkron_job,
+    dkron_job_info
+)
+from ansible_collections.knightsg.dkron.tests.unit.module_utils.fake_dkron_server import FakeDkronServer, job_name
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+# Dataset sizes and per-request latency (seconds) of the fake server
+PROFILES = {
+    'smoke': {'jobs': 50, 'executions': 20, 'latency': 0.0},
+    'medium': {'jobs': 1000, 'executions': 200, 'latency': 0.002},
+    'large': {'jobs': 10000, 'executions': 1000, 'latency': 0.005}
+}
+
+# Slower or larger than the baseline by more than this fraction is a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def existing_job_args(index):
+    # Job options matching make_job(index) of the fake server
+    return {
+        'name': job_name(index),
+        'schedule': '@every {minutes}m'.format(minutes=1 + index % 60),
+        'owner': 'team-{team}'.format(team=index % 10),
+        'tags': {'server': 'true:1'} if index % 2 else None,
+        'metadata': {'team': 'team-{team}'.format(team=index % 10)},
+        'shell_executor': {'command': '/bin/true'}
+    }
+
+
+SCENARIOS = {
+    'cluster_info_all': (dkron_cluster_info, lambda profile: {'type': 'all'}),
+    'job_info_all_configs': (dkron_job_info, lambda profile: {'include_history': False}),
+    'job_info_all_configs_projected': (dkron_job_info, lambda profile: {
+        'include_history': False,
+        'fields': ['status', 'next']
+    }),
+    'job_info_selected_configs': (dkron_job_info, lambda profile: {
+        'include_history': False,
+        'metadata_selector': {'team': 'team-3'},
+        'name_prefix': 'job-00'
+    }),
+    'job_info_history': (dkron_job_info, lambda profile: {
+        'names': [job_name(index) for index in range(min(20, profile['jobs']))],
+        'limit_history': 10,
+        'max_workers': 8
+    }),
+    'job_info_history_summary': (dkron_job_info, lambda profile: {
+        'names': [job_name(index) for index in range(min(20, profile['jobs']))],
+        'history_summary': True,
+        'max_workers': 8
+    }),
+    'job_upsert_unchanged': (dkron_job, lambda profile: existing_job_args(1)),
+    'job_upsert_changed': (dkron_job, lambda profile: dict(existing_job_args(1), schedule='@every 90m'))
+}
+
+
+class ServerProcess(object):
+    """FakeDkronServer running in a child process.
+
+    Keeps the server's CPU time and allocations out of the measured process,
+    where it would compete with the module for the GIL and count towards its memory.
+    """
+
+    def __init__(self, **server_options):
+        self.server_options = server_options
+        self.pipe, child_pipe = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=self.serve, args=(child_pipe, server_options))
+        self.process.daemon = True
+
+    @staticmethod
+    def serve(pipe, server_options):
+        with FakeDkronServer(**server_options) as server:
+            pipe.send(server.port)
+
+            # Answer request count queries until told to stop
+            while pipe.recv() == 'count':
+                pipe.send(server.request_count())
+
+    def __enter__(self):
+        self.process.start()
+        self.port = self.pipe.recv()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        self.pipe.send('stop')
+        self.process.join()
+
+    def request_count(self):
+        self.pipe.send('count')
+
+        return self.pipe.recv()
+
+
+class ModuleExit(Exception):
+
+    def __init__(self, result):
+        super().__init__()
+        self.result = result
+
+
+def exit_json(module, **kwargs):
+    raise ModuleExit(kwargs)
+
+
+def fail_json(module, **kwargs):
+    kwargs['failed'] = True
+    raise ModuleExit(kwargs)
+
+
+def run_module(module, args):
+    """Run a module's main() in this process and return its result."""
+    basic._ANSIBLE_ARGS = to_bytes(json.dumps({'ANSIBLE_MODULE_ARGS': args}))
+
+    with patch.multiple(basic.AnsibleModule, exit_json=exit_json, fail_json=fail_json):
+        try:
+            module.main()
+        except ModuleExit as e:
+            return e.result
+
+    raise AssertionError("{module} returned no result".format(module=module.__name__))
+
+
+def run_scenario(name, profile, repeat=3):
+    module, scenario_args = SCENARIOS[name]
+    wall_times = []
+    requests = None
+    peak_memory = None
+
+    # The last run is traced for memory, which slows it down, so it is not timed
+    for run in range(repeat + 1):
+        with ServerProcess(jobs=profile['jobs'], executions=profile['executions'], latency=profile['latency']) as server:
+            args = dict(scenario_args(profile), endpoint='127.0.0.1', port=server.port, keep_alive=True)
+
+            if run == repeat:
+                tracemalloc.start()
+
+            started = time.perf_counter()
+            result = run_module(module, args)
+            elapsed = time.perf_counter() - started
+
+            if run == repeat:
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            else:
+                wall_times.append(elapsed)
+
+            if result.get('failed'):
+                raise AssertionError("scenario {name} failed: {msg}".format(name=name, msg=result.get('msg')))
+
+            requests = server.request_count()
+
+    return {
+        'wall_time': round(statistics.median(wall_times), 4),
+        'requests': requests,
+        'peak_memory': peak_memory
+    }
+
+
+def run_benchmarks(profile_name, scenarios=None, repeat=3):
+    profile = PROFILES[profile_name]
+
+    return dict((name, run_scenario(name, profile, repeat)) for name in (scenarios or sorted(SCENARIOS)))
+
+
+def load_baselines(path=BASELINE_FILE):
+    try:
+        with open(path) as baseline_file:
+            return json.load(baseline_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baselines(profile_name, results, path=BASELINE_FILE):
+    baselines = load_baselines(path)
+    baselines[profile_name] = results
+
+    with open(path, 'w') as baseline_file:
+        json.dump(baselines, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write('\n')
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, metrics=('requests', 'wall_time', 'peak_memory')):
+    """Return a list of regressions of results against a baseline, as readable strings."""
+    regressions = []
+
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+
+        for metric in metrics:
+            # Request counts are deterministic, so any increase counts
+            allowed = baseline[name][metric] * (1 + (tolerance if metric != 'requests' else 0))
+
+            if result[metric] > allowed:
+                regressions.append("{name}: {metric} {value} exceeds baseline {baseline}".format(
+                    name=name,
+                    metric=metric,
+                    value=result[metric],
+                    baseline=baseline[name][metric]
+                ))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='smoke')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='run only this scenario, can be repeated')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per scenario')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--update-baseline', action='store_true')
+    options = parser.parse_args(argv)
+
+    results = run_benchmarks(options.profile, options.scenario, options.repeat)
+    baseline = load_baselines().get(options.profile, {})
+
+    print("{name:<24} {wall:>10} {requests:>9} {memory:>12}".format(name='scenario', wall='wall (s)', requests='requests', memory='peak (KiB)'))
+    for name, result in sorted(results.items()):
+        print("{name:<24} {wall:>10.4f} {requests:>9} {memory:>12.1f}".format(
+            name=name,
+            wall=result['wall_time'],
+            requests=result['requests'],
+            memory=result['peak_memory'] / 1024.0
+        ))
+
+    if options.update_baseline:
+        save_baselines(options.profile, dict(baseline, **results))
+        return 0
+
+    regressions = compare(results, baseline, options.tolerance)
+    for regression in regressions:
+        print("REGRESSION {regression}".format(regression=regression))
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
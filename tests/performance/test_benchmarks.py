@@ -0,0 +1,12 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from ansible_collections.knightsg.dkron.tests.performance.benchmarks import compare, load_baselines, run_benchmarks
+
+
+def test_smoke_profile_request_counts():
+    # Timings vary between machines, request counts must match the baseline exactly
+    results = run_benchmarks('smoke', repeat=1)
+
+    assert compare(results, load_baselines()['smoke'], metrics=('requests',)) == []
@@ -0,0 +1,14 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.knightsg.dkron.tests.unit.module_utils.fake_dkron_server import FakeDkronServer
+
+
+@pytest.fixture
+def fake_dkron_server():
+    """A running FakeDkronServer with 10 jobs of 10 executions, stopped after the test."""
+    with FakeDkronServer() as server:
+        yield server
@@ -0,0 +1,461 @@
+"""Local stand-in for the Dkron HTTP API, for end to end tests and benchmarks.
+
+The server keeps a job store that creates, updates, toggles and deletes act on,
+generates the executions of each job on request, so large datasets cost no memory
+up front, and can add a fixed latency to every request.
+
+Faults are injected per route: error statuses (with headers such as Retry-After),
+slow responses, truncated bodies and connection resets. Extra cluster nodes listen
+on other loopback addresses, 127.0.0.2 and up, on the same port and share the job
+store, so failover and leader changes can be exercised as well.
+
+    with FakeDkronServer(jobs=1000, executions=100, latency=0.005) as server:
+        ... point the modules at endpoint 127.0.0.1, port server.port ...
+        server.request_count()
+
+    server.inject_fault(path='/v1/jobs/*', status=503, times=3, headers={'Retry-After': '0'})
+    server.add_node('127.0.0.2')
+    server.set_leader(1)
+"""
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, unquote
+import fnmatch
+import gzip
+import json
+import socket
+import struct
+import threading
+import time
+
+
+EPOCH = datetime(2021, 5, 27, 0, 0, 0)
+
+MEMBER_TAGS = {
+    'dc': 'dc1',
+    'expect': '3',
+    'port': '6868',
+    'region': 'global',
+    'role': 'dkron',
+    'version': '3.1.3'
+}
+
+
+# Fields the server manages, as set on a job that has never run
+NEW_JOB = {
+    'success_count': 0,
+    'error_count': 0,
+    'last_success': None,
+    'last_error': None,
+    'dependent_jobs': None,
+    'status': '',
+    'next': ''
+}
+
+
+def job_name(index):
+    return "job-{index:05d}".format(index=index)
+
+
+def timestamp(moment, nanoseconds=0):
+    # Dkron returns RFC 3339 timestamps with nanosecond precision
+    nanos = moment.microsecond * 1000 + nanoseconds
+
+    return "{base}.{nanos:09d}Z".format(base=moment.strftime('%Y-%m-%dT%H:%M:%S'), nanos=nanos)
+
+
+def make_job(index):
+    return {
+        'id': job_name(index),
+        'name': job_name(index),
+        'displayname': '',
+        'timezone': 'UTC',
+        'schedule': '@every {minutes}m'.format(minutes=1 + index % 60),
+        'owner': 'team-{team}'.format(team=index % 10),
+        'owner_email': '',
+        'success_count': 1000 + index,
+        'error_count': index % 7,
+        'last_success': timestamp(EPOCH),
+        'last_error': None,
+        'disabled': False,
+        'tags': {'server': 'true:1'} if index % 2 else {},
+        'metadata': {'team': 'team-{team}'.format(team=index % 10)},
+        'retries': 0,
+        'dependent_jobs': None,
+        'parent_job': '',
+        'processors': {},
+        'concurrency': 'allow',
+        'executor': 'shell',
+        'executor_config': {'command': '/bin/true'},
+        'status': 'success' if index % 7 else 'failed',
+        'next': timestamp(EPOCH + timedelta(minutes=1))
+    }
+
+
+def make_execution(name, number, total):
+    # Newest first, one run a minute, every tenth run failing after a retry
+    started = EPOCH - timedelta(minutes=number)
+    nanoseconds = (number * 7919) % 1000
+    duration = timedelta(milliseconds=20 + (number * 37) % 500)
+
+    return {
+        'id': "{group}-node-{node}".format(group=total - number, node=number % 3),
+        'job_name': name,
+        'started_at': timestamp(started, nanoseconds),
+        'finished_at': timestamp(started + duration, nanoseconds),
+        'success': number % 10 != 0,
+        'output': '',
+        'node_name': "node-{node}".format(node=number % 3),
+        'group': total - number,
+        'attempt': 2 if number % 10 == 0 else 1
+    }
+
+
+def member_addr(index):
+    return "127.0.0.{host}".format(host=index + 1)
+
+
+class FakeFault(object):
+    """A fault served instead of, or on top of, the normal response of matching requests.
+
+    path is a shell-style pattern matched against the request path without the
+    query string, method and node (the address the request was sent to) must match
+    exactly when set. A fault applies to the next `times` matching requests, or to
+    all of them when times is None.
+    """
+
+    def __init__(self, path='*', method=None, node=None, status=None, body=None, headers=None,
+                 delay=0.0, truncate=False, reset=False, times=1):
+        self.path = path
+        self.method = method
+        self.node = node
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.delay = delay
+        self.truncate = truncate
+        self.reset = reset
+        self.remaining = times
+        self.served = 0
+
+    def matches(self, method, path, node):
+        return (
+            self.remaining != 0
+            and (self.method is None or self.method == method)
+            and (self.node is None or self.node == node)
+            and fnmatch.fnmatchcase(path, self.path)
+        )
+
+
+class FakeDkronServer(object):
+
+    def __init__(self, jobs=10, executions=10, members=3, latency=0.0, gzip_responses=False, page_size_limit=None, leader=0):
+        self.executions = executions
+        self.latency = latency
+        self.gzip_responses = gzip_responses
+        self.page_size_limit = page_size_limit
+        self.members = members
+        self.leader = leader
+        self.jobs = dict((job_name(index), make_job(index)) for index in range(jobs))
+        self.requests = []
+        self.faults = []
+        self.lock = threading.Lock()
+        self.nodes = {}
+        self.port = None
+
+    def start(self):
+        return self.add_node(member_addr(0), port=0)
+
+    def add_node(self, addr, port=None):
+        """Start another cluster node on a loopback address, on the same port as the first one."""
+        fake = self
+
+        class Handler(FakeDkronRequestHandler):
+            server_state = fake
+
+        server = ThreadingHTTPServer((addr, self.port if port is None else port), Handler)
+        server.daemon_threads = True
+
+        if self.port is None:
+            self.port = server.server_address[1]
+
+        thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05})
+        thread.daemon = True
+        thread.start()
+
+        self.nodes[addr] = server
+
+        return self
+
+    def stop_node(self, addr):
+        """Take a node down, so connections to it are refused."""
+        server = self.nodes.pop(addr)
+        server.shutdown()
+        server.server_close()
+
+    def stop(self):
+        for addr in list(self.nodes):
+            self.stop_node(addr)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def set_leader(self, index):
+        with self.lock:
+            self.leader = index
+
+    def inject_fault(self, **fault_options):
+        """Add a FakeFault, see its options. Faults added first take precedence."""
+        fault = FakeFault(**fault_options)
+
+        with self.lock:
+            self.faults.append(fault)
+
+        return fault
+
+    def clear_faults(self):
+        with self.lock:
+            self.faults = []
+
+    def take_fault(self, method, path, node):
+        with self.lock:
+            for fault in self.faults:
+                if fault.matches(method, path, node):
+                    if fault.remaining is not None:
+                        fault.remaining -= 1
+                    fault.served += 1
+                    return fault
+
+        return None
+
+    def request_count(self, method=None, path='*', node=None):
+        with self.lock:
+            return len([
+                request for request in self.requests
+                if (method is None or request[0] == method)
+                and (node is None or request[2] == node)
+                and fnmatch.fnmatchcase(request[1], path)
+            ])
+
+    def request_headers(self, name, method=None, path='*', node=None):
+        """Values of the name header sent with the matching requests, in order, None where missing."""
+        with self.lock:
+            return [
+                request[3].get(name) for request in self.requests
+                if (method is None or request[0] == method)
+                and (node is None or request[2] == node)
+                and fnmatch.fnmatchcase(request[1], path)
+            ]
+
+    def reset_requests(self):
+        with self.lock:
+            self.requests = []
+
+    def record(self, method, path, node=None, headers=None):
+        with self.lock:
+            self.requests.append((method, path, node, dict(headers or {})))
+
+    # API routes, each returning (status, body)
+
+    def route(self, method, path, query, body):
+        segments = [unquote(segment) for segment in path.split('/')[2:]]
+
+        if segments == [''] or not segments:
+            return 200, self.agent_status()
+        if segments == ['leader']:
+            return 200, self.member(self.leader)
+        if segments == ['members']:
+            return 200, [self.member(index) for index in range(self.members)]
+        if segments == ['busy']:
+            return 200, self.busy()
+        if segments == ['jobs'] and method == 'GET':
+            return 200, self.list_jobs(query)
+        if segments == ['jobs'] and method == 'POST':
+            return self.upsert_job(body)
+        if len(segments) == 2 and segments[0] == 'jobs':
+            return self.job(method, segments[1])
+        if len(segments) == 3 and segments[0] == 'jobs' and segments[2] == 'executions':
+            return self.list_executions(segments[1], query)
+        if len(segments) == 3 and segments[0] == 'jobs' and segments[2] == 'toggle' and method == 'POST':
+            return self.toggle_job(segments[1])
+
+        return 404, {'error': 'not found'}
+
+    def agent_status(self):
+        return {
+            'agent': {'name': 'node-0', 'version': '3.1.3'},
+            'serf': {'members': str(self.members), 'failed': '0', 'health_score': '0'},
+            'tags': dict(MEMBER_TAGS, server='true')
+        }
+
+    def member(self, index):
+        return {
+            'Name': "node-{index}".format(index=index),
+            'Addr': member_addr(index),
+            'Port': 8946,
+            'Tags': dict(MEMBER_TAGS, server='true' if index < 3 else 'false'),
+            'Status': 1
+        }
+
+    def busy(self):
+        with self.lock:
+            names = sorted(self.jobs)[:3]
+
+        return [make_execution(name, 0, self.executions) for name in names]
+
+    def list_jobs(self, query):
+        with self.lock:
+            jobs = list(self.jobs.values())
+
+        for key, value in query.items():
+            if key.startswith('metadata[') and key.endswith(']'):
+                jobs = [job for job in jobs if (job.get('metadata') or {}).get(key[9:-1]) == value]
+
+        # Like Dkron, q matches anywhere in the name
+        if query.get('q'):
+            jobs = [job for job in jobs if query['q'] in job['name']]
+
+        if query.get('status'):
+            jobs = [job for job in jobs if job.get('status') == query['status']]
+
+        jobs.sort(key=lambda job: job.get(query.get('_sort', 'name')) or '', reverse=query.get('_order') == 'DESC')
+
+        return self.page(jobs, query)
+
+    def list_executions(self, name, query):
+        with self.lock:
+            if name not in self.jobs:
+                return 404, {'error': 'job not found'}
+
+        start, end = self.page_bounds(query, self.executions)
+        numbers = range(start, end)
+
+        # Execution numbers count back from the newest
+        if query.get('_order') == 'ASC':
+            numbers = [self.executions - 1 - position for position in numbers]
+
+        return 200, [make_execution(name, number, self.executions) for number in numbers]
+
+    def job(self, method, name):
+        with self.lock:
+            if name not in self.jobs:
+                return 404, {'error': 'job not found'}
+
+            if method == 'DELETE':
+                return 200, self.jobs.pop(name)
+
+            return 200, self.jobs[name]
+
+    def upsert_job(self, body):
+        job = json.loads(body)
+
+        with self.lock:
+            stored = dict(self.jobs.get(job['name'], NEW_JOB), **job)
+            stored['id'] = job['name']
+            self.jobs[job['name']] = stored
+
+        return 201, stored
+
+    def toggle_job(self, name):
+        with self.lock:
+            if name not in self.jobs:
+                return 404, {'error': 'job not found'}
+
+            self.jobs[name]['disabled'] = not self.jobs[name]['disabled']
+
+            return 200, self.jobs[name]
+
+    def page_bounds(self, query, total):
+        start = int(query.get('_start', 0))
+        end = int(query.get('_end', total))
+
+        if self.page_size_limit:
+            end = min(end, start + self.page_size_limit)
+
+        return start, min(end, total)
+
+    def page(self, items, query):
+        start, end = self.page_bounds(query, len(items))
+
+        return items[start:end]
+
+
+class FakeDkronRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_state = None
+
+    # Headers and body are written separately, which Nagle's algorithm would
+    # hold back for a delayed ACK on every keep-alive response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+    def do_DELETE(self):
+        self.handle_request('DELETE')
+
+    def handle_request(self, method):
+        state = self.server_state
+        node = self.server.server_address[0]
+        url_parts = urlsplit(self.path)
+        query = dict(parse_qsl(url_parts.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        state.record(method, url_parts.path, node, self.headers)
+        fault = state.take_fault(method, url_parts.path, node)
+
+        if state.latency:
+            time.sleep(state.latency)
+
+        if fault and fault.delay:
+            time.sleep(fault.delay)
+
+        if fault and fault.reset:
+            # Closing with a zero linger time sends a TCP reset instead of a clean FIN
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+            self.close_connection = True
+            return
+
+        if fault and fault.status:
+            self.respond(fault.status, fault.body if fault.body is not None else {'error': 'injected fault'}, fault.headers)
+            return
+
+        status, payload = state.route(method, url_parts.path, query, body)
+        self.respond(status, payload, truncate=bool(fault and fault.truncate))
+
+    def respond(self, status, payload, extra_headers=None, truncate=False):
+        body = json.dumps(payload).encode('utf-8')
+        headers = dict(extra_headers or {}, **{'Content-Type': 'application/json'})
+
+        if self.server_state.gzip_responses and 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+
+        headers['Content-Length'] = str(len(body))
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        if truncate:
+            # Announce the whole body, send half of it and hang up
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,191 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from unittest.mock import patch
+from ansible.module_utils import basic
+from ansible.module_utils._text import to_bytes
+from ansible_collections.knightsg.dkron.plugins.modules import dkron_job_info
+from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronClusterInterface
+from ansible_collections.knightsg.dkron.tests.unit.module_utils.fake_dkron_server import job_name, member_addr
+import json
+import os
+import pytest
+import subprocess
+import sys
+import time
+
+
+class AnsibleExitJson(Exception):
+    """Exception class to be raised by module.exit_json and caught by the test case"""
+    pass
+
+
+class AnsibleFailJson(Exception):
+    """Exception class to be raised by module.fail_json and caught by the test case"""
+    pass
+
+
+def exit_json(*args, **kwargs):
+    raise AnsibleExitJson(kwargs)
+
+
+def fail_json(*args, **kwargs):
+    kwargs['failed'] = True
+    raise AnsibleFailJson(kwargs)
+
+
+@pytest.fixture(autouse=True)
+def module_helper():
+    with patch.multiple(basic.AnsibleModule, exit_json=exit_json, fail_json=fail_json):
+        yield
+
+
+def cluster_interface(server, nodes=1, **args):
+    """DkronClusterInterface for the first `nodes` nodes of the fake cluster"""
+    endpoints = ["{addr}:{port}".format(addr=member_addr(index), port=server.port) for index in range(nodes)]
+    module_args = dict({'endpoint': endpoints}, **args)
+    basic._ANSIBLE_ARGS = to_bytes(json.dumps({'ANSIBLE_MODULE_ARGS': module_args}))
+
+    return DkronClusterInterface(dkron_job_info.init_module())
+
+
+# Test a burst of 503 responses is retried through, honouring Retry-After
+def test_retry_through_service_unavailable_storm(fake_dkron_server):
+    fake_dkron_server.inject_fault(path='/v1/jobs/job-00001', status=503, headers={'Retry-After': '0'}, times=3)
+    api = cluster_interface(fake_dkron_server, request_retries=3)
+
+    assert api.get_job_config(job_name(1))['name'] == job_name(1)
+    assert fake_dkron_server.request_count(path='/v1/jobs/job-00001') == 4
+
+
+# Test responses cut off mid-body count as connection failures and are retried
+@pytest.mark.parametrize('keep_alive', [False, True])
+def test_truncated_response_retried(fake_dkron_server, keep_alive):
+    fake_dkron_server.inject_fault(path='/v1/jobs/job-00002', truncate=True)
+    api = cluster_interface(fake_dkron_server, keep_alive=keep_alive, request_retries=1, retry_backoff=0)
+
+    assert api.get_job_config(job_name(2))['name'] == job_name(2)
+    assert fake_dkron_server.request_count(path='/v1/jobs/job-00002') == 2
+
+
+# Test a node resetting connections is failed over to the next node
+def test_connection_reset_fails_over(fake_dkron_server):
+    fake_dkron_server.add_node(member_addr(1))
+    fake_dkron_server.inject_fault(node=member_addr(0), reset=True, times=None)
+    api = cluster_interface(fake_dkron_server, nodes=2)
+
+    assert api.get_job_config(job_name(3))['name'] == job_name(3)
+    assert fake_dkron_server.request_count(path='/v1/jobs/job-00003', node=member_addr(1)) == 1
+
+    # The failed node is tried last from then on
+    api.get_job_config(job_name(4))
+    assert fake_dkron_server.request_count(path='/v1/jobs/job-00004', node=member_addr(0)) == 0
+
+
+# Test latency based selection prefers the node that answers faster
+def test_slow_node_avoided(fake_dkron_server):
+    fake_dkron_server.add_node(member_addr(1))
+    fake_dkron_server.inject_fault(path='/v1/', node=member_addr(0), delay=0.2, times=None)
+    api = cluster_interface(fake_dkron_server, nodes=2, endpoint_selection='latency')
+
+    api.get_job_config(job_name(5))
+
+    assert fake_dkron_server.request_count(path='/v1/jobs/job-00005', node=member_addr(1)) == 1
+
+
+# Test a node too slow to answer the selection probe does not stall the first request
+def test_slow_probe_does_not_stall_requests(fake_dkron_server):
+    fake_dkron_server.add_node(member_addr(1))
+    fake_dkron_server.inject_fault(path='/v1/', node=member_addr(0), delay=3, times=None)
+    api = cluster_interface(fake_dkron_server, nodes=2, endpoint_selection='latency')
+
+    started = time.monotonic()
+    api.get_job_config(job_name(5))
+
+    assert time.monotonic() - started < 2
+    assert fake_dkron_server.request_count(path='/v1/jobs/job-00005', node=member_addr(1)) == 1
+
+
+# Test leader writes follow the leader when leadership moves to another node
+def test_leader_change_followed(fake_dkron_server):
+    fake_dkron_server.add_node(member_addr(1))
+    api = cluster_interface(fake_dkron_server, nodes=2, leader_writes=True)
+    job = dict(name='moving', schedule='@every 1m', executor='shell', executor_config={'command': '/bin/true'})
+
+    api.post('/jobs', success_response=201, data=job)
+    assert fake_dkron_server.request_count('POST', node=member_addr(0)) == 1
+
+    # The old leader refuses writes once it has stepped down
+    fake_dkron_server.set_leader(1)
+    fake_dkron_server.inject_fault(method='POST', node=member_addr(0), status=500, times=None)
+
+    api.post('/jobs', success_response=201, data=dict(job, schedule='@every 2m'))
+
+    assert fake_dkron_server.request_count('POST', node=member_addr(1)) == 1
+    assert fake_dkron_server.jobs['moving']['schedule'] == '@every 2m'
+
+
+# Test a page failing in the middle of a paginated query is retried
+def test_pagination_retries_failed_page(fake_dkron_server):
+    api = cluster_interface(fake_dkron_server, request_retries=1, retry_backoff=0)
+    pages = api.iter_executions(job_name(6), page_size=4)
+
+    first_page = next(pages)
+    fake_dkron_server.inject_fault(path='/v1/jobs/job-00006/executions', status=502)
+    executions = first_page + [execution for page in pages for execution in page]
+
+    assert len(executions) == 10
+    assert len(set(execution['id'] for execution in executions)) == 10
+    assert fake_dkron_server.request_count(path='/v1/jobs/job-00006/executions') == 4
+
+
+# Test cached responses are still served while the cluster is unreachable
+def test_cache_served_while_node_down(fake_dkron_server, tmp_path):
+    api = cluster_interface(fake_dkron_server, cache=True, cache_dir=str(tmp_path), cache_ttl=60)
+
+    job_config = api.get_job_config(job_name(7))
+    fake_dkron_server.stop_node(member_addr(0))
+
+    assert api.get_job_config(job_name(7)) == job_config
+    assert fake_dkron_server.request_count(path='/v1/jobs/job-00007') == 1
+
+
+# Test gather_timeout bounds the module process, not only the returned result
+def test_gather_timeout_bounds_module_exit(fake_dkron_server, tmp_path):
+    fake_dkron_server.add_node(member_addr(1))
+    fake_dkron_server.inject_fault(path='/v1/', node=member_addr(0), delay=6, times=None)
+    args_path = tmp_path / 'args.json'
+    args_path.write_text(json.dumps({'ANSIBLE_MODULE_ARGS': {
+        'endpoint': ["{addr}:{port}".format(addr=member_addr(index), port=fake_dkron_server.port) for index in range(2)],
+        'endpoint_selection': 'latency',
+        'type': 'all',
+        'gather_timeout': 1
+    }}))
+
+    started = time.monotonic()
+    process = subprocess.run(
+        [sys.executable, '-m', 'ansible_collections.knightsg.dkron.plugins.modules.dkron_cluster_info', str(args_path)],
+        stdout=subprocess.PIPE,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+        timeout=30
+    )
+    elapsed = time.monotonic() - started
+
+    assert json.loads(process.stdout)['timed_out']
+    assert elapsed < 4
+
+
+# Test the reads that decide on job writes are not answered from the response cache
+def test_write_decisions_bypass_cache(fake_dkron_server, tmp_path):
+    api = cluster_interface(fake_dkron_server, cache=True, cache_dir=str(tmp_path), cache_ttl=60)
+    job_config = api.get_job_config(job_name(8))
+    api.job_configs()
+
+    # Deleted outside Ansible, while the cached responses are still fresh
+    del fake_dkron_server.jobs[job_name(8)]
+
+    assert api.compare_job_configs(job_config=job_config) == (True, {})
+    assert job_name(8) not in api.job_configs(use_cache=False)
+    assert job_name(8) not in api.job_list(use_cache=False)
+    assert job_name(8) in api.job_configs()
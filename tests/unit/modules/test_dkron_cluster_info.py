@@ -8,7 +8,7 @@ from unittest.mock import call, patch, MagicMock
 from ansible.module_utils import basic
 from ansible.module_utils._text import to_bytes
 from ansible_collections.knightsg.dkron.plugins.modules import dkron_cluster_info
-from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronClusterInterface
+from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronClusterInterface, DkronRequestTimings
 from ansible_collections.knightsg.dkron.tests.unit.module_utils.dkron_cluster_responses import (
     cluster_query_status_response_success,
     cluster_query_leader_response_success,
@@ -17,9 +17,14 @@ from ansible_collections.knightsg.dkron.tests.unit.module_utils.dkron_cluster_re
     cluster_query_active_job_list_response_success,
     cluster_query_response_http_not_found,
     cluster_query_empty_dict_response,
-    cluster_query_empty_list_response
+    cluster_query_empty_list_response,
+    MockedReponse
 )
+from ansible_collections.knightsg.dkron.tests.unit.module_utils.fake_dkron_server import FakeDkronServer, job_name
+import gzip
 import json
+import time
+import zlib
 
 
 def exit_json(*args, **kwargs):
@@ -350,3 +355,310 @@ class DkronClusterInfoTest(TestCase):
             method='GET'
         )
         self.assertEqual(result, [])
+
+    # Test keep-alive connections are reused across queries
+    def test_query_cluster_info_keep_alive_reuses_connection(self):
+        server = FakeDkronServer(members=2).start()
+        self.addCleanup(server.stop)
+
+        set_module_args({
+            'endpoint': '127.0.0.1',
+            'port': server.port,
+            'keep_alive': True
+        })
+        module = dkron_cluster_info.init_module()
+
+        dkron_iface = DkronClusterInterface(module)
+        self.assertEqual(dkron_iface.leader_node(), '127.0.0.1')
+        self.assertEqual(dkron_iface.member_nodes(), ['127.0.0.1', '127.0.0.2'])
+        self.assertEqual(dkron_iface.cluster_status()['members'], '2')
+        self.assertEqual(dkron_iface.connection_stats(), {
+            'requests': 3,
+            'opened': 1,
+            'reused': 2
+        })
+
+    # Test paginated job iterator encodes filter parameters
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_iter_jobs_params(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'type': 'jobs'
+        })
+        module = dkron_cluster_info.init_module()
+        mock_fetch_url.return_value = cluster_query_job_list_response_success()
+
+        dkron_iface = DkronClusterInterface(module)
+        pages = list(dkron_iface.iter_jobs(page_size=10, params={'metadata[team]': 'a&b'}))
+
+        mock_fetch_url.assert_called_once_with(
+            module,
+            'http://172.16.0.1:8080/v1/jobs?metadata%5Bteam%5D=a%26b&_start=0&_end=10&_sort=name&_order=ASC',
+            headers=dkron_iface.headers,
+            method='GET'
+        )
+        self.assertEqual([job['name'] for job in pages[0]], ['job', 'job2', 'job3'])
+
+    # Test gzip encoded responses are decompressed
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_gzip_response(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'type': 'members'
+        })
+        module = dkron_cluster_info.init_module()
+        response, info = cluster_query_members_response_success()
+        mock_fetch_url.return_value = (
+            MockedReponse(gzip.compress(response.read().encode('utf-8'))),
+            dict(info, **{'content-encoding': 'gzip'})
+        )
+
+        dkron_iface = DkronClusterInterface(module)
+        result = dkron_iface.member_nodes()
+
+        self.assertEqual(dkron_iface.headers['Accept-Encoding'], 'gzip, deflate')
+        self.assertEqual(result, ['172.16.0.1', '172.16.0.2'])
+
+    # Test deflate encoded responses are decompressed
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_deflate_response(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'type': 'leader'
+        })
+        module = dkron_cluster_info.init_module()
+        response, info = cluster_query_leader_response_success()
+        mock_fetch_url.return_value = (
+            MockedReponse(zlib.compress(response.read().encode('utf-8'))),
+            dict(info, **{'content-encoding': 'deflate'})
+        )
+
+        dkron_iface = DkronClusterInterface(module)
+
+        self.assertEqual(dkron_iface.leader_node(), '172.16.0.1')
+
+    # Test requests fail over to the next node when a node refuses connections
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_endpoint_failover(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': ['172.16.0.1', '172.16.0.2:8081'],
+            'type': 'leader'
+        })
+        module = dkron_cluster_info.init_module()
+        mock_fetch_url.side_effect = [
+            (MockedReponse(None), {'status': -1, 'msg': 'Connection refused'}),
+            cluster_query_leader_response_success(),
+            cluster_query_leader_response_success()
+        ]
+
+        dkron_iface = DkronClusterInterface(module)
+
+        self.assertEqual(dkron_iface.leader_node(), '172.16.0.1')
+        self.assertEqual(dkron_iface.leader_node(), '172.16.0.1')
+        self.assertEqual(
+            [args[1] for args, kwargs in mock_fetch_url.call_args_list],
+            [
+                'http://172.16.0.1:8080/v1/leader',
+                'http://172.16.0.2:8081/v1/leader',
+                'http://172.16.0.2:8081/v1/leader'
+            ]
+        )
+
+    # Test latency selection probes every node and prefers the fastest healthy one
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_endpoint_latency_selection(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': ['172.16.0.1', '172.16.0.2', '172.16.0.3'],
+            'endpoint_selection': 'latency',
+            'type': 'leader'
+        })
+        module = dkron_cluster_info.init_module()
+
+        def respond(module, url, **kwargs):
+            if url.startswith('http://172.16.0.1:'):
+                time.sleep(0.2)
+            if url.startswith('http://172.16.0.3:'):
+                return (MockedReponse(None), {'status': 503})
+            if url.endswith('/v1/'):
+                return cluster_query_status_response_success()
+            return cluster_query_leader_response_success()
+
+        mock_fetch_url.side_effect = respond
+
+        dkron_iface = DkronClusterInterface(module)
+
+        self.assertEqual(dkron_iface.leader_node(), '172.16.0.1')
+        self.assertEqual(dkron_iface.select_nodes(), [
+            'http://172.16.0.2:8080/v1',
+            'http://172.16.0.1:8080/v1',
+            'http://172.16.0.3:8080/v1'
+        ])
+        self.assertEqual(mock_fetch_url.call_args[0][1], 'http://172.16.0.2:8080/v1/leader')
+
+    # Test timings are reported per endpoint with the connection phases
+    def test_query_cluster_info_timings(self):
+        server = FakeDkronServer().start()
+        self.addCleanup(server.stop)
+
+        set_module_args({
+            'endpoint': '127.0.0.1',
+            'port': server.port,
+            'keep_alive': True,
+            'timings': True
+        })
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_cluster_info.main()
+
+        timings = result.exception.args[0]['timings']
+        self.assertEqual(sorted(timings['endpoints']), ['GET /', 'GET /jobs', 'GET /leader', 'GET /members'])
+        self.assertEqual(timings['nodes'], {"127.0.0.1:{port}".format(port=server.port): 4})
+        self.assertEqual(timings['total']['requests'], 4)
+        self.assertEqual(timings['total']['errors'], 0)
+        self.assertGreater(timings['total']['bytes_received'], 0)
+        self.assertGreater(timings['total']['phases_ms']['ttfb'], 0)
+        self.assertGreater(timings['total']['phases_ms']['connect'], 0)
+        self.assertLessEqual(timings['total']['latency_ms']['p50'], timings['total']['latency_ms']['max'])
+
+    # Test job names are folded into one timings endpoint
+    def test_request_timings_endpoint_key(self):
+        self.assertEqual(DkronRequestTimings.endpoint_key('GET', '/jobs/job1/executions'), 'GET /jobs/{name}/executions')
+        self.assertEqual(DkronRequestTimings.endpoint_key('POST', '/jobs?runoncreate=true'), 'POST /jobs')
+        self.assertEqual(DkronRequestTimings.endpoint_key('GET', '/'), 'GET /')
+
+    # Test cluster status is projected to the requested fields
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_cluster_status_fields(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'type': 'status',
+            'fields': ['members', 'failed', 'health_score']
+        })
+        mock_fetch_url.return_value = cluster_query_status_response_success()
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_cluster_info.main()
+
+        self.assertEqual(result.exception.args[0]['cluster_info']['status'], {
+            'members': '2',
+            'failed': '0',
+            'health_score': '0'
+        })
+
+    # Test running jobs are limited to the jobs matching the selectors
+    def test_query_cluster_info_active_jobs_selectors(self):
+        server = FakeDkronServer(jobs=10).start()
+        self.addCleanup(server.stop)
+        set_module_args({
+            'endpoint': '127.0.0.1',
+            'port': server.port,
+            'type': 'jobs',
+            'active_only': True,
+            'tag_selector': {'server': 'true'}
+        })
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_cluster_info.main()
+
+        self.assertEqual(result.exception.args[0]['cluster_info']['jobs'], [job_name(1)])
+        self.assertEqual(server.request_count(path='/v1/jobs'), 1)
+        self.assertEqual(server.request_count(path='/v1/busy'), 1)
+
+    # Test all sections are queried concurrently
+    def test_query_cluster_info_sections_concurrent(self):
+        server = FakeDkronServer().start()
+        self.addCleanup(server.stop)
+        for path in ['/v1/', '/v1/leader', '/v1/members', '/v1/jobs']:
+            server.inject_fault(path=path, delay=0.4)
+        set_module_args({
+            'endpoint': '127.0.0.1',
+            'port': server.port
+        })
+
+        started = time.monotonic()
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_cluster_info.main()
+
+        # Four serial round trips would take at least 1.6s
+        self.assertLess(time.monotonic() - started, 1.2)
+        self.assertEqual(sorted(result.exception.args[0]['cluster_info']), ['jobs', 'leader', 'members', 'status'])
+        self.assertNotIn('timed_out', result.exception.args[0])
+
+    # Test sections missing the deadline are left out of a partial result
+    def test_query_cluster_info_sections_deadline(self):
+        server = FakeDkronServer().start()
+        self.addCleanup(server.stop)
+        server.inject_fault(path='/v1/jobs', delay=2)
+        set_module_args({
+            'endpoint': '127.0.0.1',
+            'port': server.port,
+            'gather_timeout': 0.5
+        })
+
+        started = time.monotonic()
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_cluster_info.main()
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual(sorted(result.exception.args[0]['cluster_info']), ['leader', 'members', 'status'])
+        self.assertEqual(result.exception.args[0]['timed_out'], ['jobs'])
+
+    # Test every member is probed concurrently and reported in the health matrix
+    def test_query_cluster_info_member_health(self):
+        server = FakeDkronServer(members=4).start()
+        self.addCleanup(server.stop)
+        server.add_node('127.0.0.2')
+        server.add_node('127.0.0.3')
+        server.inject_fault(path='/v1/', node='127.0.0.2', delay=2, times=None)
+        set_module_args({
+            'endpoint': '127.0.0.1',
+            'port': server.port,
+            'type': 'health',
+            'probe_timeout': 0.5
+        })
+
+        started = time.monotonic()
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_cluster_info.main()
+
+        # The slow member times out while the others are probed
+        self.assertLess(time.monotonic() - started, 1.5)
+
+        health = result.exception.args[0]['cluster_info']['health']
+        members = dict((entry['name'], entry) for entry in health['members'])
+        self.assertEqual((health['reachable'], health['unreachable']), (2, 2))
+        self.assertEqual([members[name]['reachable'] for name in sorted(members)], [True, False, True, False])
+        self.assertEqual(members['node-0']['http_status'], 200)
+        self.assertEqual(members['node-0']['serf_status'], 'alive')
+        self.assertEqual(members['node-0']['version'], '3.1.3')
+        self.assertEqual(members['node-3']['role'], 'agent')
+        self.assertIn('timed out', members['node-1']['error'])
+        self.assertIsNone(members['node-3']['latency_ms'])
+        self.assertIn('error', members['node-3'])
+
+    # Test pending member probes are abandoned at the gather deadline
+    def test_query_cluster_info_member_health_deadline(self):
+        server = FakeDkronServer(members=2).start()
+        self.addCleanup(server.stop)
+        server.add_node('127.0.0.2')
+        server.inject_fault(path='/v1/', node='127.0.0.2', delay=3, times=None)
+        set_module_args({
+            'endpoint': '127.0.0.1',
+            'port': server.port,
+            'type': 'health',
+            'probe_timeout': 10,
+            'gather_timeout': 0.5
+        })
+
+        started = time.monotonic()
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_cluster_info.main()
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertNotIn('timed_out', result.exception.args[0])
+
+        health = result.exception.args[0]['cluster_info']['health']
+        members = dict((entry['name'], entry) for entry in health['members'])
+        self.assertTrue(members['node-0']['reachable'])
+        self.assertFalse(members['node-1']['reachable'])
+        self.assertIn('no result within', members['node-1']['error'])
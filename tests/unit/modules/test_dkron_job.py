@@ -4,14 +4,16 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 from unittest import TestCase
-from unittest.mock import call, patch, MagicMock
+from unittest.mock import ANY, call, patch, MagicMock
 from ansible.module_utils import basic
 from ansible.module_utils._text import to_bytes
 from ansible_collections.knightsg.dkron.plugins.modules import dkron_job
 from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronClusterInterface
 from ansible_collections.knightsg.dkron.tests.unit.module_utils.dkron_cluster_responses import (
     cluster_query_create_job_with_overwrite_response_success,
-    cluster_query_response_http_not_found
+    cluster_query_leader_response_success,
+    cluster_query_response_http_not_found,
+    MockedReponse
 )
 import json
 
@@ -150,3 +152,178 @@ class DkronJobInfoTest(TestCase):
                 headers=dkron_iface.headers,
                 method='GET'
             )
+
+    # Test job with unchanged config is not written again
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_upsert_unchanged_job_skipped(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'name': 'job1',
+            'schedule': '0 */15 * * * *',
+            'shell_executor': {
+                'command': '/bin/echo "hello world"',
+                'cwd': '/tmp'
+            }
+        })
+        current_config = {
+            'id': 'job1',
+            'name': 'job1',
+            'displayname': '',
+            'timezone': 'UTC',
+            'schedule': '0 */15 * * * *',
+            'owner': '',
+            'owner_email': '',
+            'success_count': 145693,
+            'error_count': 0,
+            'last_success': '2021-05-29T22:16:07.018850696Z',
+            'last_error': None,
+            'disabled': False,
+            'tags': {},
+            'metadata': None,
+            'retries': 0,
+            'dependent_jobs': None,
+            'parent_job': '',
+            'processors': {},
+            'concurrency': 'allow',
+            'executor': 'shell',
+            'executor_config': {
+                'command': '/bin/echo "hello world"',
+                'cwd': '/tmp'
+            },
+            'status': 'success',
+            'next': '2021-05-29T22:17:07Z'
+        }
+        mock_fetch_url.return_value = (MockedReponse(json.dumps(current_config)), {'status': 200})
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_job.main()
+
+        mock_fetch_url.assert_called_once_with(
+            ANY,
+            'http://172.16.0.1:8080/v1/jobs/job1',
+            headers=ANY,
+            method='GET'
+        )
+        self.assertFalse(result.exception.args[0]['changed'])
+        self.assertEqual(result.exception.args[0]['job_config'], current_config)
+
+    # Test job with a changed config is written
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_upsert_changed_job_written(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'name': 'job1',
+            'schedule': '0 */15 * * * *',
+            'shell_executor': {
+                'command': '/bin/echo "hello world"',
+                'cwd': '/tmp'
+            }
+        })
+        current_config = {
+            'name': 'job1',
+            'timezone': 'UTC',
+            'schedule': '@every 1m',
+            'disabled': True,
+            'concurrency': 'allow',
+            'executor': 'shell',
+            'executor_config': {
+                'command': '/bin/echo "hello world"',
+                'cwd': '/tmp'
+            }
+        }
+        mock_fetch_url.side_effect = [
+            (MockedReponse(json.dumps(current_config)), {'status': 200}),
+            cluster_query_create_job_with_overwrite_response_success()
+        ]
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_job.main()
+
+        self.assertEqual(mock_fetch_url.call_count, 2)
+        self.assertEqual(mock_fetch_url.call_args[1]['method'], 'POST')
+        self.assertTrue(result.exception.args[0]['changed'])
+
+    # Test missing job is created
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_upsert_missing_job_created(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'name': 'job1',
+            'shell_executor': {
+                'command': '/bin/true'
+            }
+        })
+        mock_fetch_url.side_effect = [
+            cluster_query_response_http_not_found(),
+            cluster_query_create_job_with_overwrite_response_success()
+        ]
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_job.main()
+
+        self.assertEqual(mock_fetch_url.call_count, 2)
+        self.assertTrue(result.exception.args[0]['changed'])
+
+    # Test writes go to the leader when leader_writes is set
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_upsert_job_sent_to_leader(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.2',
+            'leader_writes': True,
+            'name': 'job1',
+            'shell_executor': {
+                'command': '/bin/true'
+            }
+        })
+        module = dkron_job.init_module()
+        mock_fetch_url.side_effect = [
+            cluster_query_leader_response_success(),
+            cluster_query_create_job_with_overwrite_response_success(),
+            cluster_query_create_job_with_overwrite_response_success()
+        ]
+
+        dkron_iface = DkronClusterInterface(module)
+        dkron_iface.upsert_job()
+        dkron_iface.upsert_job()
+
+        self.assertEqual(
+            [(args[1], kwargs['method']) for args, kwargs in mock_fetch_url.call_args_list],
+            [
+                ('http://172.16.0.2:8080/v1/leader', 'GET'),
+                ('http://172.16.0.1:8080/v1/jobs', 'POST'),
+                ('http://172.16.0.1:8080/v1/jobs', 'POST')
+            ]
+        )
+
+    # Test a failed write to the leader looks the leader up again and is retried on the new one
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_upsert_job_follows_new_leader(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.2',
+            'leader_writes': True,
+            'name': 'job1',
+            'shell_executor': {
+                'command': '/bin/true'
+            }
+        })
+        module = dkron_job.init_module()
+        mock_fetch_url.side_effect = [
+            cluster_query_leader_response_success(),
+            (MockedReponse(None), {'status': -1, 'msg': 'Connection refused'}),
+            (MockedReponse(json.dumps({'Name': 'ip-172-16-0-3', 'Addr': '172.16.0.3'})), {'status': 200}),
+            cluster_query_create_job_with_overwrite_response_success()
+        ]
+
+        dkron_iface = DkronClusterInterface(module)
+        result, changed = dkron_iface.upsert_job()
+
+        self.assertTrue(changed)
+        self.assertEqual(
+            [args[1] for args, kwargs in mock_fetch_url.call_args_list],
+            [
+                'http://172.16.0.2:8080/v1/leader',
+                'http://172.16.0.1:8080/v1/jobs',
+                'http://172.16.0.2:8080/v1/leader',
+                'http://172.16.0.3:8080/v1/jobs'
+            ]
+        )
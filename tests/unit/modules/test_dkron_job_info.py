@@ -4,20 +4,27 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 from unittest import TestCase
-from unittest.mock import call, patch, MagicMock
+from unittest.mock import ANY, call, patch, MagicMock
 from ansible.module_utils import basic
 from ansible.module_utils._text import to_bytes
 from ansible_collections.knightsg.dkron.plugins.modules import dkron_job_info
-from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronClusterInterface
+from ansible_collections.knightsg.dkron.plugins.module_utils.classes import DkronClusterInterface, DkronResponseCache
+from ansible_collections.knightsg.dkron.plugins.module_utils.support import decode_json_list, parse_timestamp, project_fields
 from ansible_collections.knightsg.dkron.tests.unit.module_utils.dkron_cluster_responses import (
+    cluster_query_job_list_response_success,
     cluster_query_job_config_response_success,
     cluster_query_full_job_history_response_success,
     cluster_query_limited_job_history_response_success,
     cluster_query_response_http_not_found,
+    cluster_query_response_http_server_error,
     cluster_query_empty_dict_response,
-    cluster_query_empty_list_response
+    cluster_query_empty_list_response,
+    MockedReponse
 )
+from ansible_collections.knightsg.dkron.tests.unit.module_utils.fake_dkron_server import FakeDkronServer, job_name
 import json
+import os
+import tempfile
 
 
 def exit_json(*args, **kwargs):
@@ -162,7 +169,7 @@ class DkronJobInfoTest(TestCase):
         result = dkron_iface.get_job_history(job_name='job')
         mock_fetch_url.assert_called_once_with(
             module,
-            'http://172.16.0.1:8080/v1/jobs/job/executions',
+            'http://172.16.0.1:8080/v1/jobs/job/executions?_start=0&_end=1&_sort=started_at&_order=DESC',
             headers=dkron_iface.headers,
             method='GET'
         )
@@ -238,3 +245,505 @@ class DkronJobInfoTest(TestCase):
             method='GET'
         )
         self.assertEqual(result, {})
+
+    # Test concurrent gathering keeps job order and reports failures per job
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_gather_jobs_concurrently(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'max_workers': 4
+        })
+        module = dkron_job_info.init_module()
+
+        def fake_fetch_url(module, url, **kwargs):
+            if url.startswith('http://172.16.0.1:8080/v1/jobs/missing'):
+                return cluster_query_response_http_not_found()
+            if url.endswith('/executions'):
+                return cluster_query_limited_job_history_response_success()
+            return cluster_query_job_config_response_success()
+
+        mock_fetch_url.side_effect = fake_fetch_url
+
+        dkron_iface = DkronClusterInterface(module)
+        result = dkron_iface.gather_jobs(['job', 'missing', 'job'], max_workers=module.params['max_workers'])
+
+        self.assertEqual(mock_fetch_url.call_count, 6)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[0]['job_config']['name'], 'job')
+        self.assertEqual(len(result[0]['history']), 1)
+        self.assertEqual(result[1], {
+            'name': 'missing',
+            'job_config': {},
+            'history': [],
+            'failed': True,
+            'msg': 'job query failed (cluster API query failed with error 404)'
+        })
+        self.assertEqual(result[2]['job_config']['name'], 'job')
+
+    # Test config-only query of all jobs uses a single bulk request
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_all_job_configs_bulk(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'include_history': False
+        })
+        mock_fetch_url.return_value = cluster_query_job_list_response_success()
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_job_info.main()
+
+        mock_fetch_url.assert_called_once_with(
+            ANY,
+            'http://172.16.0.1:8080/v1/jobs',
+            headers={'Content-Type': 'application/json', 'Accept-Encoding': 'gzip, deflate'},
+            method='GET'
+        )
+        jobs = result.exception.args[0]['jobs']
+        self.assertEqual([job['job_config']['name'] for job in jobs], ['job', 'job2', 'job3'])
+        self.assertNotIn('history', jobs[0])
+
+    # Test job configs are projected to the requested fields, keeping the name
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_all_job_configs_fields(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'include_history': False,
+            'fields': ['status', 'next', 'executor_config.command']
+        })
+        mock_fetch_url.return_value = cluster_query_job_list_response_success()
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_job_info.main()
+
+        jobs = result.exception.args[0]['jobs']
+        self.assertEqual(jobs[0]['job_config'], {
+            'name': 'job',
+            'status': 'success',
+            'next': '2021-05-27T05: 30: 24Z',
+            'executor_config': {'command': '/bin/true'}
+        })
+
+    # Test excluded fields are left out of a single job config
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_job_config_exclude_fields(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'exclude_fields': ['executor_config', 'processors', 'name']
+        })
+        module = dkron_job_info.init_module()
+        mock_fetch_url.return_value = cluster_query_job_config_response_success()
+
+        dkron_iface = DkronClusterInterface(module)
+        result = dkron_iface.get_job_config(job_name='job')
+
+        self.assertEqual(result['name'], 'job')
+        self.assertNotIn('executor_config', result)
+        self.assertNotIn('processors', result)
+        self.assertIn('schedule', result)
+
+    # Test projection copies nested dicts instead of changing them
+    def test_project_fields(self):
+        job = {'name': 'job', 'tags': {'server': 'true:1', 'region': 'eu'}, 'owner': 'me'}
+
+        self.assertEqual(project_fields(job, exclude_fields=['tags.region']), {'name': 'job', 'tags': {'server': 'true:1'}, 'owner': 'me'})
+        self.assertEqual(project_fields(job, fields=['tags', 'tags.server', 'missing.field']), {'tags': {'server': 'true:1', 'region': 'eu'}})
+        self.assertEqual(job['tags'], {'server': 'true:1', 'region': 'eu'})
+
+    # Test JSON arrays are decoded element by element through the transform
+    def test_decode_json_list(self):
+        self.assertEqual(decode_json_list(b' [ {"a": 1, "b": [2]} ,{"a": 3} ] ', lambda item: item['a']), [1, 3])
+        self.assertEqual(decode_json_list('[]', len), [])
+        self.assertEqual(decode_json_list('{"a": 1}', len), {'a': 1})
+
+        with self.assertRaises(ValueError):
+            decode_json_list('[1 2]', str)
+
+    # Test limited job history keeps the most recent executions only
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_limit_job_history_selects_latest(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'limit_history': 1
+        })
+        module = dkron_job_info.init_module()
+        mock_fetch_url.return_value = cluster_query_full_job_history_response_success()
+
+        dkron_iface = DkronClusterInterface(module)
+        result = dkron_iface.get_job_history(job_name='job')
+
+        self.assertEqual([execution['id'] for execution in result], ['1622079204013581868-ip-172-16-2-147'])
+
+    # Test paginated execution iterator requests pages lazily and stops on a short page
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_iter_executions_pages(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1'
+        })
+        module = dkron_job_info.init_module()
+        executions = [{'id': str(index), 'started_at': str(index)} for index in range(5)]
+        mock_fetch_url.side_effect = [
+            (MockedReponse(json.dumps(executions[0:2])), {'status': 200}),
+            (MockedReponse(json.dumps(executions[2:4])), {'status': 200}),
+            (MockedReponse(json.dumps(executions[4:5])), {'status': 200})
+        ]
+
+        dkron_iface = DkronClusterInterface(module)
+        pages = dkron_iface.iter_executions('job', page_size=2)
+
+        self.assertEqual(next(pages), executions[0:2])
+        mock_fetch_url.assert_called_once_with(
+            module,
+            'http://172.16.0.1:8080/v1/jobs/job/executions?_start=0&_end=2&_sort=started_at&_order=DESC',
+            headers=dkron_iface.headers,
+            method='GET'
+        )
+        self.assertEqual(list(pages), [executions[2:4], executions[4:5]])
+        self.assertEqual(mock_fetch_url.call_count, 3)
+
+    # Test paginated iterator stops when the server ignores the range parameters
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_iter_executions_unpaginated_server(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1'
+        })
+        module = dkron_job_info.init_module()
+        mock_fetch_url.return_value = cluster_query_full_job_history_response_success()
+
+        dkron_iface = DkronClusterInterface(module)
+        pages = list(dkron_iface.iter_executions('job', page_size=1))
+
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(len(pages[0]), 2)
+        mock_fetch_url.assert_called_once()
+
+    # Test a server ignoring the range parameters with exactly page_size executions is read once
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_iter_executions_unpaginated_full_page(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1'
+        })
+        module = dkron_job_info.init_module()
+        mock_fetch_url.return_value = cluster_query_full_job_history_response_success()
+
+        dkron_iface = DkronClusterInterface(module)
+        pages = list(dkron_iface.iter_executions('job', page_size=2))
+
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(len(pages[0]), 2)
+        self.assertEqual(mock_fetch_url.call_count, 2)
+
+    # Test cached responses are reused within the TTL and revalidated after it
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_job_config_cached(self, mock_fetch_url):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'cache': True,
+            'cache_dir': cache_dir.name
+        })
+        module = dkron_job_info.init_module()
+        response, info = cluster_query_job_config_response_success()
+        mock_fetch_url.return_value = (response, dict(info, etag='"v1"'))
+
+        dkron_iface = DkronClusterInterface(module)
+        first = dkron_iface.get_job_config(job_name='job')
+        second = DkronClusterInterface(module).get_job_config(job_name='job')
+
+        mock_fetch_url.assert_called_once()
+        self.assertEqual(first, second)
+
+        dkron_iface.cache.ttl = 0
+        mock_fetch_url.return_value = (MockedReponse(''), {'status': 304})
+        self.assertEqual(dkron_iface.get_job_config(job_name='job'), first)
+        self.assertEqual(mock_fetch_url.call_args[1]['headers']['If-None-Match'], '"v1"')
+
+    # Test job writes invalidate the cached responses of that job
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_job_cache_invalidation(self, mock_fetch_url):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'cache': True,
+            'cache_dir': cache_dir.name
+        })
+        module = dkron_job_info.init_module()
+        dkron_iface = DkronClusterInterface(module)
+
+        mock_fetch_url.return_value = cluster_query_job_config_response_success()
+        dkron_iface.get_job_config(job_name='job')
+        mock_fetch_url.return_value = cluster_query_full_job_history_response_success()
+        dkron_iface.get_job_history(job_name='job')
+        dkron_iface.get_job_history(job_name='job2')
+        self.assertEqual(len(dkron_iface.cache._entry_paths()), 3)
+
+        dkron_iface.invalidate_job_cache('job')
+
+        self.assertEqual(len(dkron_iface.cache._entry_paths()), 1)
+        self.assertIsNone(dkron_iface.cache.get('http://172.16.0.1:8080/v1/jobs/job', '/jobs/job'))
+
+    # Test the response cache evicts the least recently used entries
+    def test_response_cache_lru_eviction(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache = DkronResponseCache(cache_dir.name, 'http://172.16.0.1:8080/v1', max_entries=2)
+
+        cache.put('/jobs/a', '/jobs/a', '{}')
+        cache.put('/jobs/b', '/jobs/b', '{}')
+        os.utime(cache._entry_path('/jobs/a', '/jobs/a'), (1, 1))
+        os.utime(cache._entry_path('/jobs/b', '/jobs/b'), (2, 2))
+        cache.get('/jobs/a', '/jobs/a')
+        cache.put('/jobs/c', '/jobs/c', '{}')
+
+        self.assertIsNotNone(cache.get('/jobs/a', '/jobs/a'))
+        self.assertIsNone(cache.get('/jobs/b', '/jobs/b'))
+        self.assertIsNotNone(cache.get('/jobs/c', '/jobs/c'))
+
+    # Test invalidation finds entries by path, long paths included, without reading them
+    def test_response_cache_invalidation_by_path(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache = DkronResponseCache(cache_dir.name, 'http://172.16.0.1:8080/v1')
+        long_path = '/jobs/' + 'a' * 200
+
+        cache.put('/jobs/job/executions', '/jobs/job/executions', '{}')
+        cache.put('/jobs/job2', '/jobs/job2', '{}')
+        cache.put(long_path, long_path, '{}')
+        cache.put('/members', '/members', '{}')
+
+        with patch('builtins.open', side_effect=AssertionError('entry read')):
+            cache.invalidate(['/jobs'], parent_paths=['/jobs/job'])
+        self.assertIsNone(cache.get('/jobs/job/executions', '/jobs/job/executions'))
+        self.assertIsNotNone(cache.get('/jobs/job2', '/jobs/job2'))
+        self.assertIsNotNone(cache.get(long_path, long_path))
+
+        cache.invalidate([long_path], parent_paths=[long_path])
+        self.assertIsNone(cache.get(long_path, long_path))
+        self.assertIsNotNone(cache.get('/members', '/members'))
+
+    # Test clusters reached with different credentials do not share cached responses
+    def test_response_cache_namespace_per_identity(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache_dirs = []
+
+        for username in ('alice', 'bob'):
+            set_module_args({
+                'endpoint': '172.16.0.1',
+                'username': username,
+                'password': 'secret',
+                'cache': True,
+                'cache_dir': cache_dir.name
+            })
+            cache_dirs.append(DkronClusterInterface(dkron_job_info.init_module()).cache.cache_dir)
+
+        self.assertNotEqual(cache_dirs[0], cache_dirs[1])
+
+    # Test requests go through a persistent httpapi connection when no endpoint is set
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.Connection')
+    def test_query_cluster_info_httpapi_connection(self, mock_connection):
+        set_module_args({
+            '_ansible_socket': '/tmp/dkron-socket'
+        })
+        module = dkron_job_info.init_module()
+        response, info = cluster_query_job_config_response_success()
+        connection = mock_connection.return_value
+        connection.base_url.return_value = 'https://172.16.0.1:8443'
+        connection.send_request.return_value = (200, {}, response.read())
+
+        dkron_iface = DkronClusterInterface(module)
+        result = dkron_iface.get_job_config(job_name='job')
+
+        mock_connection.assert_called_once_with('/tmp/dkron-socket')
+        connection.send_request.assert_called_once_with(
+            None,
+            method='GET',
+            url='https://172.16.0.1:8443/v1/jobs/job',
+            headers=dkron_iface.headers
+        )
+        self.assertEqual(result['name'], 'job')
+
+    # Test idempotent requests are retried on server errors but not on client errors
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.time.sleep')
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_job_config_retried(self, mock_fetch_url, mock_sleep):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'request_retries': 3,
+            'retry_backoff': 1
+        })
+        module = dkron_job_info.init_module()
+        mock_fetch_url.side_effect = [
+            cluster_query_response_http_server_error(),
+            (MockedReponse(None), {'status': 429, 'retry-after': '2'}),
+            cluster_query_job_config_response_success(),
+            cluster_query_response_http_not_found()
+        ]
+
+        dkron_iface = DkronClusterInterface(module)
+
+        self.assertEqual(dkron_iface.get_job_config('job')['name'], 'job')
+        self.assertEqual(mock_fetch_url.call_count, 3)
+        self.assertLessEqual(mock_sleep.call_args_list[0][0][0], 1)
+        self.assertEqual(mock_sleep.call_args_list[1][0][0], 2)
+
+        with self.assertRaises(AnsibleFailJson):
+            dkron_iface.get_job_config('missing')
+
+        self.assertEqual(mock_fetch_url.call_count, 4)
+
+    # Test the circuit breaker stops querying an unhealthy cluster
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_circuit_breaker_opens(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'include_history': False,
+            'circuit_breaker_threshold': 2
+        })
+        module = dkron_job_info.init_module()
+        mock_fetch_url.return_value = cluster_query_response_http_server_error()
+
+        dkron_iface = DkronClusterInterface(module)
+        result = dkron_iface.gather_jobs(['job1', 'job2', 'job3', 'job4'], include_history=False)
+
+        self.assertEqual(mock_fetch_url.call_count, 2)
+        self.assertEqual(
+            [job['msg'] for job in result[1:3]],
+            [
+                'job query failed (cluster API query failed with error 500)',
+                'job query failed (cluster API requests suspended for 30s after repeated failures)'
+            ]
+        )
+        self.assertTrue(all(job['failed'] for job in result))
+
+    # Test history summary aggregates executions with nanosecond precision
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_job_history_summary(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'history_summary': True
+        })
+        module = dkron_job_info.init_module()
+        mock_fetch_url.return_value = cluster_query_full_job_history_response_success()
+
+        dkron_iface = DkronClusterInterface(module)
+        result = dkron_iface.get_job_history_summary(job_name='job')
+
+        self.assertEqual(result, {
+            'executions': 2,
+            'succeeded': 1,
+            'failed': 1,
+            'running': 0,
+            'retries': 1,
+            'success_rate': 0.5,
+            'duration_ms': {'p50': 5.393, 'p95': 5.393, 'max': 5.393},
+            'last_started_at': '2021-05-27T01:33:24.013581869Z'
+        })
+        mock_fetch_url.assert_called_once_with(
+            module,
+            'http://172.16.0.1:8080/v1/jobs/job/executions?_start=0&_end=1000&_sort=started_at&_order=DESC',
+            headers=dkron_iface.headers,
+            method='GET'
+        )
+
+    # Test limited history summary reads only the latest executions, in one pass
+    def test_query_cluster_info_job_history_summary_limited(self):
+        server = FakeDkronServer(jobs=2, executions=250).start()
+        self.addCleanup(server.stop)
+        set_module_args({
+            'endpoint': '127.0.0.1',
+            'port': server.port,
+            'names': [job_name(1)],
+            'history_summary': True,
+            'limit_history': 15
+        })
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_job_info.main()
+
+        self.assertEqual(result.exception.args[0]['jobs'][0]['history_summary'], {
+            'executions': 15,
+            'succeeded': 13,
+            'failed': 2,
+            'running': 0,
+            'retries': 2,
+            'success_rate': 0.8667,
+            'duration_ms': {'p50': 242.0, 'p95': 501.0, 'max': 501.0},
+            'last_started_at': '2021-05-27T00:00:00.000000000Z'
+        })
+        self.assertNotIn('history', result.exception.args[0]['jobs'][0])
+        self.assertEqual(server.request_count(path='/v1/jobs/job-00001/executions'), 1)
+
+    # Test named jobs switch to one bulk /jobs query only above bulk_query_threshold
+    def test_query_cluster_info_bulk_query_threshold(self):
+        server = FakeDkronServer(jobs=20).start()
+        self.addCleanup(server.stop)
+        names = [job_name(index) for index in range(6)]
+
+        for threshold, bulk_requests, job_requests in [(5, 1, 0), (10, 0, 6)]:
+            server.reset_requests()
+            set_module_args({
+                'endpoint': '127.0.0.1',
+                'port': server.port,
+                'include_history': False,
+                'names': names,
+                'bulk_query_threshold': threshold
+            })
+
+            with self.assertRaises(AnsibleExitJson) as result:
+                dkron_job_info.main()
+
+            self.assertEqual([job['job_config']['name'] for job in result.exception.args[0]['jobs']], names)
+            self.assertEqual(server.request_count(path='/v1/jobs'), bulk_requests)
+            self.assertEqual(server.request_count(path='/v1/jobs/*'), job_requests)
+
+    # Test RFC 3339 timestamps keep nanoseconds and honour offsets
+    def test_parse_timestamp(self):
+        self.assertEqual(parse_timestamp('2021-05-27T01:33:24.013581868Z'), 1622079204013581868)
+        self.assertEqual(parse_timestamp('2021-05-27T03:33:24.5+02:00'), 1622079204500000000)
+        self.assertIsNone(parse_timestamp('0001-01-01T00:00:00Z'))
+        self.assertIsNone(parse_timestamp(None))
+
+    # Test job selectors are sent as /jobs query parameters
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_query_cluster_info_job_selectors_pushed_down(self, mock_fetch_url):
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'include_history': False,
+            'metadata_selector': {'team': 'team-a'},
+            'name_prefix': 'job',
+            'job_status': 'success'
+        })
+        mock_fetch_url.return_value = cluster_query_empty_list_response()
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_job_info.main()
+
+        mock_fetch_url.assert_called_once_with(
+            ANY,
+            'http://172.16.0.1:8080/v1/jobs?metadata%5Bteam%5D=team-a&q=job&status=success',
+            headers={'Content-Type': 'application/json', 'Accept-Encoding': 'gzip, deflate'},
+            method='GET'
+        )
+        self.assertEqual(result.exception.args[0]['jobs'], [])
+
+    # Test selected jobs are checked again, applying the tag selector and the name prefix
+    def test_query_cluster_info_job_selectors(self):
+        server = FakeDkronServer(jobs=100).start()
+        self.addCleanup(server.stop)
+        set_module_args({
+            'endpoint': '127.0.0.1',
+            'port': server.port,
+            'include_history': False,
+            'names': [job_name(13), job_name(14)],
+            'metadata_selector': {'team': 'team-3'},
+            'tag_selector': {'server': 'true'},
+            'name_prefix': 'job-0001'
+        })
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_job_info.main()
+
+        self.assertEqual([job['job_config']['name'] for job in result.exception.args[0]['jobs']], [job_name(13)])
+        self.assertEqual(server.request_count(), 1)
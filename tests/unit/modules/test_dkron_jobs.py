@@ -0,0 +1,251 @@
+# Based on https://github.com/ansible-collections/community.grafana/blob/main/tests/unit/modules/grafana/grafana_user/test_grafana_user.py
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from unittest import TestCase
+from unittest.mock import patch
+from ansible.module_utils import basic
+from ansible.module_utils._text import to_bytes
+from ansible_collections.knightsg.dkron.plugins.modules import dkron_jobs
+from ansible_collections.knightsg.dkron.tests.unit.module_utils.dkron_cluster_responses import MockedReponse
+import json
+
+
+def exit_json(*args, **kwargs):
+    """function to patch over exit_json; package return data into an exception"""
+    if 'changed' not in kwargs:
+        kwargs['changed'] = False
+    raise AnsibleExitJson(kwargs)
+
+
+def fail_json(*args, **kwargs):
+    """function to patch over fail_json; package return data into an exception"""
+    kwargs['failed'] = True
+    raise AnsibleFailJson(kwargs)
+
+
+class AnsibleExitJson(Exception):
+    """Exception class to be raised by module.exit_json and caught by the test case"""
+    pass
+
+
+class AnsibleFailJson(Exception):
+    """Exception class to be raised by module.fail_json and caught by the test case"""
+    pass
+
+
+def set_module_args(args):
+    """prepare arguments so that they will be picked up during module creation"""
+    args = json.dumps({'ANSIBLE_MODULE_ARGS': args})
+    basic._ANSIBLE_ARGS = to_bytes(args)
+
+
+def job_definition(name, **kwargs):
+    definition = {
+        'name': name,
+        'shell_executor': {
+            'command': '/bin/true'
+        }
+    }
+    definition.update(kwargs)
+    return definition
+
+
+def cluster_job(name, **kwargs):
+    job = {
+        'id': name,
+        'name': name,
+        'schedule': '@every 1m',
+        'timezone': 'UTC',
+        'disabled': False,
+        'concurrency': 'allow',
+        'executor': 'shell',
+        'executor_config': {
+            'command': '/bin/true'
+        },
+        'success_count': 10,
+        'next': '2021-05-27T01:29:24Z'
+    }
+    job.update(kwargs)
+    return job
+
+
+class FakeCluster(object):
+    """route mocked fetch_url calls to an in-memory job store"""
+
+    def __init__(self, jobs):
+        self.jobs = dict((job['name'], job) for job in jobs)
+        self.writes = []
+
+    def fetch_url(self, module, url, headers=None, method='GET', data=None):
+        path = url.split('/v1', 1)[1].split('?', 1)[0]
+
+        if method == 'GET' and path == '/jobs':
+            return MockedReponse(json.dumps(list(self.jobs.values()))), {'status': 200}
+
+        if method == 'POST' and path == '/jobs':
+            job = json.loads(data)
+            self.writes.append(('POST', job['name']))
+            self.jobs[job['name']] = job
+            return MockedReponse(json.dumps(job)), {'status': 201}
+
+        if method == 'DELETE':
+            name = path.split('/')[2]
+            self.writes.append(('DELETE', name))
+            return MockedReponse(json.dumps(self.jobs.pop(name))), {'status': 200}
+
+        return MockedReponse(None), {'status': 404}
+
+
+class DkronJobsTest(TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+        self.mock_module_helper = patch.multiple(
+            basic.AnsibleModule,
+            exit_json=exit_json,
+            fail_json=fail_json)
+        self.mock_module_helper.start()
+        self.addCleanup(self.mock_module_helper.stop)
+
+    # Test jobs are created, updated, deleted or left alone as needed
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_reconcile_jobs(self, mock_fetch_url):
+        cluster = FakeCluster([
+            cluster_job('unchanged'),
+            cluster_job('changed', schedule='@every 5m'),
+            cluster_job('removed')
+        ])
+        mock_fetch_url.side_effect = cluster.fetch_url
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'max_workers': 2,
+            'jobs': [
+                job_definition('unchanged'),
+                job_definition('changed'),
+                job_definition('new'),
+                {'name': 'removed', 'state': 'absent'},
+                {'name': 'missing', 'state': 'absent'}
+            ]
+        })
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_jobs.main()
+
+        jobs = result.exception.args[0]['jobs']
+        self.assertTrue(result.exception.args[0]['changed'])
+        self.assertEqual([(job['name'], job['action'], job['changed']) for job in jobs], [
+            ('unchanged', 'none', False),
+            ('changed', 'update', True),
+            ('new', 'create', True),
+            ('removed', 'delete', True),
+            ('missing', 'none', False)
+        ])
+        self.assertEqual(jobs[1]['job_config']['schedule'], '@every 1m')
+        self.assertCountEqual(cluster.writes, [('POST', 'changed'), ('POST', 'new'), ('DELETE', 'removed')])
+        self.assertEqual(sorted(cluster.jobs), ['changed', 'new', 'unchanged'])
+
+    # Test check mode does not write anything
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_reconcile_jobs_check_mode(self, mock_fetch_url):
+        cluster = FakeCluster([cluster_job('removed')])
+        mock_fetch_url.side_effect = cluster.fetch_url
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            '_ansible_check_mode': True,
+            'jobs': [
+                job_definition('new'),
+                {'name': 'removed', 'state': 'absent'}
+            ]
+        })
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_jobs.main()
+
+        self.assertTrue(result.exception.args[0]['changed'])
+        self.assertEqual(cluster.writes, [])
+        self.assertEqual(mock_fetch_url.call_count, 1)
+
+    # Test an invalid job definition is reported per job and fails the module
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_reconcile_jobs_invalid_definition(self, mock_fetch_url):
+        cluster = FakeCluster([])
+        mock_fetch_url.side_effect = cluster.fetch_url
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'jobs': [
+                job_definition('new'),
+                {'name': 'noexecutor'}
+            ]
+        })
+
+        with self.assertRaises(AnsibleFailJson) as result:
+            dkron_jobs.main()
+
+        jobs = result.exception.args[0]['jobs']
+        self.assertEqual(jobs[0]['action'], 'create')
+        self.assertTrue(jobs[0]['changed'])
+        self.assertTrue(jobs[1]['failed'])
+        self.assertEqual(jobs[1]['msg'], 'Module requires shell_executor or http_executor parameter specified.')
+        self.assertEqual(result.exception.args[0]['msg'], '1 job(s) failed: noexecutor')
+
+    # Test exclusive mode deletes jobs in the selector scope that are not defined
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_reconcile_jobs_exclusive(self, mock_fetch_url):
+        cluster = FakeCluster([
+            cluster_job('kept', metadata={'team': 'a'}),
+            cluster_job('orphan', metadata={'team': 'a'}),
+            cluster_job('other_team', metadata={'team': 'b'}),
+            cluster_job('no_metadata')
+        ])
+        mock_fetch_url.side_effect = cluster.fetch_url
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            'exclusive': True,
+            'metadata_selector': {'team': 'a'},
+            'jobs': [
+                job_definition('kept', metadata={'team': 'a'}),
+                job_definition('new', metadata={'team': 'a'})
+            ]
+        })
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_jobs.main()
+
+        self.assertEqual(result.exception.args[0]['plan'], {
+            'create': ['new'],
+            'update': [],
+            'delete': ['orphan'],
+            'unchanged': ['kept']
+        })
+        self.assertEqual(sorted(cluster.jobs), ['kept', 'new', 'no_metadata', 'other_team'])
+
+    # Test exclusive mode only plans in check mode
+    @patch('ansible_collections.knightsg.dkron.plugins.module_utils.classes.fetch_url')
+    def test_reconcile_jobs_exclusive_check_mode(self, mock_fetch_url):
+        cluster = FakeCluster([
+            cluster_job('kept'),
+            cluster_job('orphan')
+        ])
+        mock_fetch_url.side_effect = cluster.fetch_url
+        set_module_args({
+            'endpoint': '172.16.0.1',
+            '_ansible_check_mode': True,
+            'exclusive': True,
+            'jobs': [
+                job_definition('kept', schedule='@every 2m')
+            ]
+        })
+
+        with self.assertRaises(AnsibleExitJson) as result:
+            dkron_jobs.main()
+
+        self.assertEqual(result.exception.args[0]['plan'], {
+            'create': [],
+            'update': ['kept'],
+            'delete': ['orphan'],
+            'unchanged': []
+        })
+        self.assertEqual(cluster.writes, [])
@@ -0,0 +1,74 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+from ansible_collections.knightsg.dkron.plugins.action.dkron_job_info import ActionModule
+from ansible_collections.knightsg.dkron.plugins.module_utils.support import dkron_argument_spec
+from ansible_collections.knightsg.dkron.plugins.plugin_utils import controller
+from ansible_collections.knightsg.dkron.tests.unit.module_utils.fake_dkron_server import FakeDkronServer, job_name
+
+
+def action_plugin(args, transport='local', environment=None):
+    task = MagicMock(args=args, async_val=0, check_mode=False, environment=environment)
+    connection = MagicMock(transport=transport)
+    connection._shell.tmpdir = None
+
+    return ActionModule(task, connection, MagicMock(), MagicMock(), MagicMock(), MagicMock())
+
+
+class DkronActionTest(TestCase):
+
+    def setUp(self):
+        self.server = FakeDkronServer(jobs=1).start()
+        self.addCleanup(self.server.stop)
+        self.addCleanup(controller._connection_pools.clear)
+
+    def test_local_tasks_run_in_controller_and_share_pool(self):
+        args = {
+            'endpoint': '127.0.0.1',
+            'port': self.server.port,
+            'include_history': False,
+            'use_proxy': False
+        }
+
+        for attempt in range(3):
+            result = action_plugin(args).run(task_vars={})
+            self.assertFalse(result.get('failed'), result.get('msg'))
+            self.assertEqual(result['jobs'][0]['job_config']['name'], job_name(0))
+
+        self.assertEqual(result['connection_stats'], {'requests': 3, 'opened': 1, 'reused': 2})
+
+    def test_invalid_args_fail(self):
+        result = action_plugin({'endpoint': '127.0.0.1', 'bogus': True}).run(task_vars={})
+
+        self.assertTrue(result['failed'])
+        self.assertIn('bogus', result['msg'])
+
+    def test_remote_tasks_execute_module(self):
+        plugin = action_plugin({'endpoint': '127.0.0.1'}, transport='ssh')
+        plugin._execute_module = MagicMock(return_value={'changed': False, 'jobs': []})
+        plugin._remove_tmp_path = MagicMock()
+
+        result = plugin.run(task_vars={})
+
+        plugin._execute_module.assert_called_once_with(task_vars={}, wrap_async=0)
+        self.assertEqual(result['jobs'], [])
+
+    def test_tasks_with_environment_execute_module(self):
+        plugin = action_plugin({'endpoint': '127.0.0.1'}, environment=[{'https_proxy': 'http://proxy:3128'}])
+        plugin._execute_module = MagicMock(return_value={'changed': False, 'jobs': []})
+        plugin._remove_tmp_path = MagicMock()
+
+        plugin.run(task_vars={})
+
+        plugin._execute_module.assert_called_once_with(task_vars={}, wrap_async=0)
+
+    def test_no_log_values_masked(self):
+        module = controller.DkronControllerModule({'endpoint': '127.0.0.1', 'username': 'admin', 'password': 's3cret'}, dkron_argument_spec())
+
+        with self.assertRaises(controller.DkronModuleExit) as result:
+            module.fail_json(msg="login with s3cret refused")
+
+        self.assertEqual(result.exception.result['msg'], "login with ******** refused")
@@ -0,0 +1,50 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from unittest import TestCase
+from ansible_collections.knightsg.dkron.plugins.httpapi.dkron import HttpApi
+from ansible_collections.knightsg.dkron.tests.unit.module_utils.fake_dkron_server import FakeDkronServer
+import base64
+
+
+class FakeConnection(object):
+    """stand-in for the httpapi connection plugin options"""
+
+    def __init__(self, **options):
+        self.options = options
+
+    def get_option(self, option):
+        return self.options.get(option)
+
+
+class DkronHttpApiTest(TestCase):
+
+    def setUp(self):
+        self.server = FakeDkronServer(jobs=0).start()
+        self.addCleanup(self.server.stop)
+
+    def test_send_request_reuses_connection(self):
+        httpapi = HttpApi(FakeConnection(
+            host='127.0.0.1',
+            port=self.server.port,
+            use_ssl=False,
+            validate_certs=True,
+            use_proxy=False,
+            remote_user='admin',
+            password='secret',
+            persistent_command_timeout=30
+        ))
+        url = "{base}/v1/jobs".format(base=httpapi.base_url())
+
+        for attempt in range(3):
+            status, headers, body = httpapi.send_request(None, method='GET', url=url, headers={'Authorization': b'ignored'})
+            self.assertEqual(status, 200)
+            self.assertEqual(body, '[]')
+
+        self.assertEqual(url, "http://127.0.0.1:{port}/v1/jobs".format(port=self.server.port))
+        self.assertEqual(httpapi.connection_stats(), {'requests': 3, 'opened': 1, 'reused': 2})
+        self.assertEqual(
+            self.server.request_headers('Authorization'),
+            ['Basic ' + base64.b64encode(b'admin:secret').decode('ascii')] * 3
+        )
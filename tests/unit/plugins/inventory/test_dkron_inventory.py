@@ -0,0 +1,83 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from ansible.errors import AnsibleParserError
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible_collections.knightsg.dkron.plugins.inventory.dkron import InventoryModule
+from ansible_collections.knightsg.dkron.plugins.plugin_utils import controller
+from ansible_collections.knightsg.dkron.tests.unit.module_utils.fake_dkron_server import FakeDkronServer
+
+
+class DkronInventoryTest(TestCase):
+
+    def setUp(self):
+        self.server = FakeDkronServer(members=2).start()
+        self.addCleanup(self.server.stop)
+        self.addCleanup(controller._connection_pools.clear)
+
+        self.options = {
+            'plugin': 'knightsg.dkron.dkron',
+            'endpoint': '127.0.0.1',
+            'port': self.server.port,
+            'use_ssl': False,
+            'validate_certs': True,
+            'use_proxy': False,
+            'username': None,
+            'password': None,
+            'prefix': 'dkron',
+            'cache': False,
+            'strict': False,
+            'compose': {},
+            'groups': {},
+            'keyed_groups': [{'key': 'dkron_tags.dc', 'prefix': 'dkron_dc'}]
+        }
+        self.cache = {}
+
+    def parse(self, cache=True):
+        """run the plugin with self.options in place of a configuration file"""
+        plugin = InventoryModule()
+        plugin._read_config_data = MagicMock()
+        plugin.get_option = self.options.get
+        plugin.get_cache_key = MagicMock(return_value='dkron')
+        plugin._cache = self.cache
+
+        inventory = InventoryData()
+        plugin.parse(inventory, DataLoader(), 'dkron.yml', cache=cache)
+
+        return inventory
+
+    def test_members_become_grouped_hosts(self):
+        inventory = self.parse()
+
+        self.assertEqual(sorted(inventory.hosts), ['node-0', 'node-1'])
+        self.assertEqual(sorted(host.name for host in inventory.groups['dkron_server'].get_hosts()), ['node-0', 'node-1'])
+        self.assertEqual(len(inventory.groups['dkron_status_alive'].get_hosts()), 2)
+        self.assertEqual([host.name for host in inventory.groups['dkron_leader'].get_hosts()], ['node-0'])
+        self.assertEqual(len(inventory.groups['dkron_dc_dc1'].get_hosts()), 2)
+
+        host_vars = inventory.get_host('node-1').vars
+        self.assertEqual(host_vars['ansible_host'], '127.0.0.2')
+        self.assertEqual(host_vars['dkron_tags']['port'], '6868')
+        self.assertFalse(host_vars['dkron_leader'])
+
+    def test_cached_members_skip_cluster_query(self):
+        self.options['cache'] = True
+
+        self.parse(cache=False)
+        self.assertEqual((self.server.request_count(path='/v1/members'), self.server.request_count(path='/v1/leader')), (1, 1))
+
+        inventory = self.parse()
+        self.assertEqual(self.server.request_count(), 2)
+        self.assertEqual(len(inventory.groups['dkron_leader'].get_hosts()), 1)
+
+    @patch('ansible_collections.knightsg.dkron.plugins.inventory.dkron.HAS_ARG_SPEC_VALIDATOR', False)
+    def test_old_ansible_core_fails_clearly(self):
+        with self.assertRaises(AnsibleParserError) as error:
+            self.parse(cache=False)
+
+        self.assertIn('ansible-core 2.11', str(error.exception))
+        self.assertEqual(self.server.request_count(), 0)
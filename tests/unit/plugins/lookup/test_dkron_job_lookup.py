@@ -0,0 +1,74 @@
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+from unittest import TestCase
+from unittest.mock import patch
+from ansible.errors import AnsibleLookupError
+from ansible_collections.knightsg.dkron.plugins.lookup import dkron_job
+from ansible_collections.knightsg.dkron.plugins.plugin_utils import controller
+from ansible_collections.knightsg.dkron.tests.unit.module_utils.fake_dkron_server import FakeDkronServer, job_name
+
+
+class DkronJobLookupTest(TestCase):
+
+    def setUp(self):
+        self.server = FakeDkronServer().start()
+        self.addCleanup(self.server.stop)
+        self.addCleanup(controller._connection_pools.clear)
+        self.addCleanup(dkron_job._job_memo.clear)
+
+        self.options = {
+            'endpoint': '127.0.0.1',
+            'port': self.server.port,
+            'use_ssl': False,
+            'validate_certs': True,
+            'use_proxy': False,
+            'username': None,
+            'password': None,
+            'max_workers': 4,
+            'cache': False,
+            'cache_dir': '~/.ansible/tmp/dkron_cache',
+            'cache_ttl': 60
+        }
+
+    def lookup(self, *terms):
+        """run the lookup with self.options in place of the configured options"""
+        lookup = dkron_job.LookupModule()
+        lookup.set_options = lambda var_options=None, direct=None: None
+        lookup.get_option = self.options.get
+
+        return lookup.run(list(terms))
+
+    def test_few_names_queried_per_job_and_memoized(self):
+        jobs = self.server.jobs
+
+        self.assertEqual(self.lookup(job_name(2), job_name(1)), [jobs[job_name(2)], jobs[job_name(1)]])
+        self.assertEqual(self.lookup(job_name(1)), [jobs[job_name(1)]])
+
+        self.assertEqual(self.server.request_count(), 2)
+        self.assertEqual(self.server.request_count(path='/v1/jobs/job-0000[12]'), 2)
+
+    def test_many_names_resolved_with_one_query(self):
+        names = [job_name(index) for index in range(7)]
+        jobs = self.server.jobs
+
+        self.assertEqual(self.lookup(*names), [jobs[name] for name in names])
+        self.assertEqual(self.lookup(job_name(9)), [jobs[job_name(9)]])
+
+        self.assertEqual(self.server.request_count(), 1)
+        self.assertEqual(self.server.request_count(path='/v1/jobs'), 1)
+
+    def test_missing_job_fails(self):
+        with self.assertRaises(AnsibleLookupError) as error:
+            self.lookup(job_name(1), 'nojob')
+
+        self.assertIn('nojob', str(error.exception))
+
+    @patch('ansible_collections.knightsg.dkron.plugins.lookup.dkron_job.HAS_ARG_SPEC_VALIDATOR', False)
+    def test_old_ansible_core_fails_clearly(self):
+        with self.assertRaises(AnsibleLookupError) as error:
+            self.lookup('job1')
+
+        self.assertIn('ansible-core 2.11', str(error.exception))
+        self.assertEqual(self.server.request_count(), 0)